@@ -0,0 +1,336 @@
+"""Telemetry acquisition in a child process.
+
+Normally the serial port is read, split into lines and classified in a
+reader thread of the GUI process, which shares the GIL with Qt painting
+and OpenGL: a long paint delays the next read, and at high baud rates the
+OS receive buffer overruns meanwhile. ``ProcessReader`` (``main.py
+--acquisition-process``) runs the unchanged SerialReader read loop in a
+child process instead. The child also decodes every line (message kind
+and fields, telemetry.decode) and, with a shared-memory ring, publishes
+its records there (telemetry_ring.py). It sends what it read to the GUI
+as batched frames over a pipe:
+
+    (LINES, [(line, kind, fields), ...], dropped)
+                                      every BATCH_INTERVAL while lines arrive
+    (STATE, state, detail, port)      connection state changes
+    (STATS, snapshot, reader_cpu)     link statistics, every STATS_INTERVAL
+
+and receives
+
+    (ACK,)                            the GUI has handled a LINES frame
+    (WRITE, data)                     command uplink bytes
+    (STOP,)
+
+Backpressure: the child has at most MAX_UNACKED frames unacknowledged,
+and the GUI acknowledges a frame only once its GUI thread has handled the
+lines (the acknowledgement is queued behind them). A stalled GUI thus
+stops the flow instead of piling up events. The child keeps reading
+meanwhile, so the port never overruns, and holds up to MAX_PENDING
+lines; beyond that it drops the oldest telemetry lines - never command
+replies - and reports how many in its next frame.
+
+ProcessReader has the interface of SerialReader (signals, connection
+state, ``write``, link statistics), so VehicleLink, CommandLink and the
+tabs work with either. ``data_received`` is emitted in the receive
+thread, for direct connections; GUI-thread consumers connect to
+``records_received`` instead, which carries a whole frame in one queued
+call rather than one event per line. While a line is handed out, its
+decoding is registered with ``telemetry.handing_out``, so TelemetryBus
+and message_kind() use the child's instead of parsing the line again.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from link_stats import LinkStats
+from serial_reader import SerialReader, CONNECTED, NO_DATA, DISCONNECTED
+from telemetry import parse_fields, fields_kind, handing_out
+from transports import TransportError
+
+BATCH_INTERVAL = 0.01   # seconds of lines per LINES frame
+STATS_INTERVAL = 0.25   # seconds between STATS frames
+MAX_UNACKED = 8         # LINES frames the GUI may have outstanding
+MAX_PENDING = 20000     # lines the child holds while the GUI is behind
+STOP_TIMEOUT = 3.0      # seconds to wait for the child before terminating it
+
+# Frame types
+LINES = "lines"
+STATE = "state"
+STATS = "stats"
+ACK = "ack"
+WRITE = "write"
+STOP = "stop"
+
+REPLY_PREFIXES = ("ACK ", "NACK ")  # command uplink replies (command_link.py)
+
+
+# ───────────── Child Process ─────────────
+class _FrameSender:
+    """Batches the child reader's lines into frames, with backpressure from the GUI."""
+
+    def __init__(self, conn, reader, ring=None, vehicle=0):
+        self.conn = conn
+        self.reader = reader
+        self.ring = ring  # TelemetryRing.attach()ed writer, or None
+        self.vehicle = vehicle
+        self.condition = threading.Condition()
+        self.send_lock = threading.Lock()  # the read loop and the batching thread both send
+        self.telemetry = deque()
+        self.replies = []
+        self.dropped = 0
+        self.unacked = 0
+        self.running = True
+
+    def send(self, frame):
+        with self.send_lock:
+            try:
+                self.conn.send(frame)
+            except OSError:
+                self.reader.request_stop()  # the GUI is gone
+
+    def add_line(self, line):
+        """Read loop: decode a line (and publish it to the ring), then queue it for the next frame."""
+        fields = parse_fields(line)
+        kind = fields_kind(fields)
+        if self.ring:
+            self.ring.publish_fields(kind, fields, self.vehicle)
+        record = (line, kind, fields)
+        with self.condition:
+            if line.startswith(REPLY_PREFIXES):
+                self.replies.append(record)
+                return
+            self.telemetry.append(record)
+            if len(self.telemetry) > MAX_PENDING:
+                self.telemetry.popleft()
+                self.dropped += 1
+
+    def on_state(self, state, detail):
+        self.send((STATE, state, detail, self.reader.port))
+
+    def take_batch(self):
+        records = self.replies + list(self.telemetry)
+        frame = (LINES, records, self.dropped)
+        self.replies = []
+        self.telemetry.clear()
+        self.dropped = 0
+        return frame
+
+    def send_loop(self):
+        next_stats = time.monotonic()
+        while self.running:
+            with self.condition:
+                self.condition.wait(BATCH_INTERVAL)
+                frame = None
+                if self.unacked < MAX_UNACKED and (self.telemetry or self.replies):
+                    frame = self.take_batch()
+                    self.unacked += 1
+            if frame:
+                self.send(frame)
+            if time.monotonic() >= next_stats:
+                next_stats += STATS_INTERVAL
+                self.send_stats()
+
+    def send_stats(self):
+        self.send((STATS, self.reader.link_stats_snapshot(), self.reader.thread_cpu))
+
+    def control_loop(self):
+        """Frames from the GUI."""
+        while True:
+            try:
+                frame = self.conn.recv()
+            except (EOFError, OSError):
+                frame = (STOP,)  # the GUI is gone
+            if frame[0] == ACK:
+                with self.condition:
+                    self.unacked -= 1
+                    self.condition.notify()
+            elif frame[0] == WRITE:
+                try:
+                    self.reader.write(frame[1])
+                except TransportError as e:
+                    print(f"[Acquisition] Command not written: {e}")
+            elif frame[0] == STOP:
+                self.reader.request_stop()
+                return
+
+    def finish(self):
+        """After the read loop: hand over what is left, whatever the backpressure."""
+        with self.condition:
+            self.running = False
+            frame = self.take_batch() if self.telemetry or self.replies else None
+        if frame:
+            self.send(frame)
+        self.send_stats()
+
+
+def _acquire(conn, port, baudrate, quiet, ring_args):
+    """Child process: the SerialReader read loop, run in the main thread.
+
+    ``ring_args``: ``(name, lock, vehicle index)`` of the GCS's telemetry ring, or None.
+    """
+    if quiet:
+        sys.stdout = open(os.devnull, "w")  # SerialReader prints every line
+    reader = SerialReader(port, baudrate)
+    ring, vehicle = None, 0
+    if ring_args:
+        from telemetry_ring import TelemetryRing
+        name, lock, vehicle = ring_args
+        ring = TelemetryRing.attach(name, lock)
+    sender = _FrameSender(conn, reader, ring, vehicle)
+    # No event loop here: the signals call the sender directly, in the read loop
+    reader.data_received.connect(sender.add_line)
+    reader.connection_state_changed.connect(sender.on_state)
+    batcher = threading.Thread(target=sender.send_loop, daemon=True, name="AcquisitionBatcher")
+    batcher.start()
+    threading.Thread(target=sender.control_loop, daemon=True, name="AcquisitionControl").start()
+    reader.running = True
+    reader.read_loop()
+    sender.finish()
+    batcher.join()
+    conn.close()
+    if ring:
+        ring.close()
+
+
+# ───────────── GUI Process ─────────────
+class _Acknowledger(QObject):
+    """Lives in the GUI thread; its slot runs once the lines queued before it are handled."""
+
+    def __init__(self, reader):
+        super().__init__()
+        self.reader = reader
+
+    @pyqtSlot()
+    def acknowledge(self):
+        self.reader.send((ACK,))
+
+
+class ProcessReader(QObject):
+    """SerialReader stand-in whose read loop runs in a child process."""
+    data_received = pyqtSignal(str)
+    records_received = pyqtSignal(list)  # (line, kind, fields) of one frame, for GUI-thread consumers
+    connection_state_changed = pyqtSignal(str, str)  # state, detail (port or error)
+    frame_handled = pyqtSignal()  # receive thread -> GUI thread, queued behind a frame's lines
+
+    def __init__(self, port=None, baudrate=115200, quiet=False, ring=None, vehicle_id=""):
+        """``ring``: the GCS's TelemetryRing; the child publishes this link's records to it."""
+        super().__init__()
+        self.port = port
+        self.baudrate = baudrate
+        self.quiet = quiet
+        self.ring_args = (ring.name, ring.lock, ring.vehicle_index(vehicle_id)) if ring else None
+        self.process = None
+        self.conn = None
+        self.receiver = None
+        self.send_lock = threading.Lock()  # the command writer and the GUI thread both send
+
+        self.state = DISCONNECTED
+        self.state_detail = ""
+        self.snapshot = None       # newest link statistics of the child
+        self.local_stats = LinkStats()  # parse errors the tabs report, counted on this side
+        self.thread_cpu = 0.0      # CPU seconds of the child's read loop
+        self.frames = 0
+        self.lines = 0
+        self.dropped = 0           # lines the child dropped while the GUI was behind
+
+        # Created here, in the GUI thread, and not a child: VehicleLink moves this object to its thread
+        self.acknowledger = _Acknowledger(self)
+        self.frame_handled.connect(self.acknowledger.acknowledge)
+
+    def start_reading(self):
+        if self.process is not None:
+            print("[ProcessReader] Already running. Skipping re-open.")
+            return
+        context = multiprocessing.get_context("spawn")  # no fork of a process running Qt threads
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_acquire, args=(child_conn, self.port, self.baudrate, self.quiet, self.ring_args),
+                                       daemon=True, name="Acquisition")
+        self.process.start()
+        child_conn.close()
+        self.receiver = threading.Thread(target=self.receive_loop, daemon=True, name="AcquisitionReceiver")
+        self.receiver.start()
+        print(f"[ProcessReader] Acquisition process {self.process.pid} started")
+
+    def send(self, frame):
+        with self.send_lock:
+            if self.conn is None:
+                return False
+            try:
+                self.conn.send(frame)
+                return True
+            except OSError:
+                return False
+
+    def receive_loop(self):
+        while True:
+            try:
+                frame = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            if frame[0] == LINES:
+                _, records, dropped = frame
+                self.frames += 1
+                self.lines += len(records)
+                self.dropped += dropped
+                for line, kind, fields in records:
+                    handing_out(line, kind, fields)
+                    self.data_received.emit(line)
+                handing_out(None)
+                self.records_received.emit(records)
+                self.frame_handled.emit()
+            elif frame[0] == STATE:
+                _, state, detail, port = frame
+                if port:
+                    self.port = port  # the port auto-detect found
+                self.state, self.state_detail = state, detail
+                self.connection_state_changed.emit(state, detail)
+            elif frame[0] == STATS:
+                _, self.snapshot, self.thread_cpu = frame
+        if self.state != DISCONNECTED:
+            self.state, self.state_detail = DISCONNECTED, ""
+            self.connection_state_changed.emit(DISCONNECTED, "")
+
+    # ───────────── SerialReader Interface ─────────────
+    @property
+    def bytes_received(self):
+        return self.snapshot["bytes"] if self.snapshot else 0
+
+    @property
+    def framing_errors(self):
+        return self.snapshot["framing_errors"] if self.snapshot else 0
+
+    def link_stats_snapshot(self):
+        snapshot = dict(self.snapshot or dict(LinkStats().snapshot(), reconnects=0))
+        snapshot["parse_errors"] = dict(self.local_stats.parse_errors)
+        snapshot["dropped"] = self.dropped
+        return snapshot
+
+    def report_parse_error(self, source):
+        """Count a line a tab could not use."""
+        self.local_stats.record_parse_error(source)
+
+    def write(self, data):
+        """Send bytes on the link, through the child (the command uplink's writer thread calls this)."""
+        if self.state not in (CONNECTED, NO_DATA) or not self.send((WRITE, data)):
+            raise TransportError("link not connected")
+
+    def stop(self):
+        """Ask the child to stop, wait for it, and terminate it if it does not."""
+        if self.process is None:
+            return
+        print("[ProcessReader] Stopping acquisition process...")
+        self.send((STOP,))
+        self.process.join(STOP_TIMEOUT)
+        if self.process.is_alive():
+            print("[ProcessReader] Acquisition process did not stop; terminating it")
+            self.process.terminate()
+            self.process.join()
+        self.receiver.join(1.0)
+        with self.send_lock:
+            self.conn.close()
+            self.conn = None
+        self.process = None
+        print("[ProcessReader] Acquisition process stopped")
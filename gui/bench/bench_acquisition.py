@@ -0,0 +1,138 @@
+"""Line loss under GUI stalls: reader thread vs acquisition child process.
+
+A feeder process streams SEQ-numbered simulated telemetry into a
+pseudo-terminal at --load of the --baud byte rate; bytes that do not fit
+into the full pty are lost, as in a UART overrun. While the link is
+read, the GUI thread "paints" every --stall-period ms by holding the GIL
+for --stall-ms (one long C call, like a slow paint or a mesh upload).
+
+The link is opened through LinkManager, as the GCS does, once with a
+reader thread in this process and once with an acquisition process
+(acquisition.py). A TelemetryBus subscriber takes every line on the GUI
+thread and, unless --no-ring, a shared-memory ring is published. Reports
+lines handled by the GUI thread, lines lost on the link (SEQ gaps), lines
+the child dropped for backpressure, records in the ring, and how many
+lines the GUI process parsed itself (the child decodes its lines).
+
+    python bench/bench_acquisition.py [--baud 2000000] [--load 0.9] [--seconds 5] [--stall-ms 150] [--stall-period 300] [--no-ring]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+import telemetry
+from sim_vehicle import SimulatedVehicle
+from telemetry_bus import ANY_KIND
+from telemetry_ring import TelemetryRing
+from vehicle_links import LinkManager, ActiveVehicleStream
+
+
+def feed(vehicle, baudrate, load, stop):
+    """Write the vehicle's numbered lines at ``load`` of the byte rate until ``stop`` is set."""
+    os.set_blocking(vehicle.master_fd, False)
+    bytes_per_second = baudrate / 10 * load
+    ticks = vehicle.generate_lines()
+    pending = b""
+    start = time.perf_counter()
+    sent = 0
+    while not stop.is_set():
+        due = int((time.perf_counter() - start) * bytes_per_second) - sent
+        while len(pending) < due:
+            lines = vehicle.number_and_drop(next(ticks))
+            vehicle.lines_sent += len(lines)
+            pending += "".join(line + "\n" for line in lines).encode()
+        if due > 0:
+            try:
+                os.write(vehicle.master_fd, pending[:due])
+            except BlockingIOError:
+                pass  # pty full: lost
+            pending = pending[due:]
+            sent += due
+        time.sleep(0.001)
+
+
+def calibrate_stall(ms):
+    """Size of a sum(range(n)) that holds the GIL for about ``ms``."""
+    n = 1_000_000
+    start = time.perf_counter()
+    sum(range(n))
+    return int(n * ms / 1000 / (time.perf_counter() - start))
+
+
+def run(app, args, separate_process, stall_size):
+    vehicle = SimulatedVehicle(0, seq_numbers=True)  # only its pty and line generator are used
+    stop = multiprocessing.Event()
+    feeder = multiprocessing.get_context("fork").Process(target=feed, args=(vehicle, args.baud, args.load, stop))
+    feeder.start()
+
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")  # SerialReader prints every line
+    manager = LinkManager()
+    ring = None if args.no_ring else TelemetryRing(f"stm_fc_bench_{os.getpid()}", 65536)
+    manager.telemetry_ring = ring
+    stream = ActiveVehicleStream(manager)
+    handled = {"lines": 0}
+    # Stands in for the tabs: every line, on the GUI thread
+    stream.bus.subscribe(ANY_KIND, lambda _line: handled.__setitem__("lines", handled["lines"] + 1))
+    parsed = {"lines": 0}
+    parse_fields = telemetry.parse_fields
+
+    def counting_parse(line):
+        parsed["lines"] += 1
+        return parse_fields(line)
+    telemetry.parse_fields = counting_parse  # what telemetry.decode falls back to in this process
+    link = manager.add_link(vehicle.port, args.baud, separate_process=separate_process)
+    reader = link.reader
+    stall = QTimer()
+    stall.timeout.connect(lambda: sum(range(stall_size)))  # one C call: the GIL is held throughout
+    QTimer.singleShot(1000, lambda: stall.start(args.stall_period))  # after the child is up
+    QTimer.singleShot(int(args.seconds * 1000) + 1000, app.quit)
+    app.exec_()
+    stall.stop()
+    time.sleep(0.3)  # let the last frames arrive
+    app.processEvents()
+    snapshot = reader.link_stats_snapshot()
+    manager.stop_all()
+    telemetry.parse_fields = parse_fields
+    records = 0
+    if ring:
+        records = ring.written
+        ring.close()
+    stop.set()
+    feeder.join()
+    vehicle.stop()
+    sys.stdout = real_stdout
+
+    lost = snapshot["seq_lost"]
+    print(f"    {'child process' if separate_process else 'reader thread':<14s} "
+          f"{handled['lines'] / (args.seconds + 1):7.0f} lines/s to the GUI  "
+          f"lost on the link {lost:6d} ({lost / max(snapshot['seq_received'] + lost, 1) * 100:5.2f}%)  "
+          f"malformed {snapshot['malformed']:4d}  dropped for backpressure {snapshot.get('dropped', 0)}")
+    print(f"    {'':<14s} ring records {records:7d}  lines parsed in the GUI process {parsed['lines']:7d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acquisition process benchmark")
+    parser.add_argument("--baud", type=int, default=2000000)
+    parser.add_argument("--load", type=float, default=0.9)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--stall-ms", type=float, default=150.0)
+    parser.add_argument("--stall-period", type=int, default=300)
+    parser.add_argument("--no-ring", action="store_true", help="no shared-memory ring")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    stall_size = calibrate_stall(args.stall_ms)
+    print(f"[BenchAcquisition] {args.baud} baud at {args.load * 100:.0f}%, "
+          f"GIL held {args.stall_ms:.0f} ms every {args.stall_period} ms")
+    run(app, args, False, stall_size)
+    run(app, args, True, stall_size)
+
+
+if __name__ == "__main__":
+    main()
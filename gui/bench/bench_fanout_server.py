@@ -0,0 +1,233 @@
+"""Hundreds of localhost clients on the telemetry fan-out server.
+
+A publisher thread stands in for the serial reader and publishes
+timestamped attitude lines at --rate; a child process opens --clients TCP
+clients, --slow TCP clients that read only ~20 lines/s through a tiny
+receive buffer, --udp UDP subscribers and --ws WebSocket clients. Reports
+what each group received, end-to-end latency, the lines the server
+dropped for the slow clients, and how long publish() blocked the
+publisher.
+
+    python bench/bench_fanout_server.py [--clients 300] [--slow 10] [--udp 20] [--ws 20] [--rate 500] [--seconds 5]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from telemetry_server import TelemetryServer
+
+
+# ───────────── Clients (child process) ─────────────
+def _line_time(data, fmt):
+    if fmt == "json":
+        return float(json.loads(data)["fields"]["T"])
+    return float(data.rsplit(b"T:", 1)[1])
+
+
+class _Group:
+    def __init__(self):
+        self.received = []   # per client
+        self.latencies = []  # ms, sampled
+
+
+async def _tcp_client(port, fmt, group, index, slow, stop):
+    sock = socket.socket()
+    if slow:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+    # A slow client's own StreamReader must not buffer ahead either (it reads up to 2 * limit)
+    reader, writer = await asyncio.open_connection(sock=sock, limit=4096 if slow else 1 << 20)
+    if fmt == "json":
+        writer.write(b"FORMAT json\n")
+    group.received.append(0)
+    try:
+        while not stop.is_set():
+            if slow:
+                line = await reader.readline()
+                lines = [line] if line else []
+                await asyncio.sleep(0.05)
+            else:
+                # Whole chunks, so the clients (not the server) are not the bottleneck
+                chunk = await reader.read(1 << 16)
+                partial = chunk.rsplit(b"\n", 1)
+                lines = [partial[0].rsplit(b"\n", 1)[-1]] * chunk.count(b"\n") if len(partial) > 1 else []
+            if not lines and reader.at_eof():
+                break
+            for line in lines[:1]:
+                group.latencies.append((time.time() - _line_time(line, fmt)) * 1000)
+            group.received[index] += len(lines)
+    finally:
+        writer.close()
+
+
+class _UdpClient(asyncio.DatagramProtocol):
+    def __init__(self, group, index):
+        self.group = group
+        self.index = index
+        group.received.append(0)
+
+    def datagram_received(self, data, addr):
+        for line in data.splitlines():
+            self.group.received[self.index] += 1
+            if self.group.received[self.index] % 10 == 0:
+                self.group.latencies.append((time.time() - _line_time(line, "raw")) * 1000)
+
+
+async def _ws_client(port, group, index, stop):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    await reader.readuntil(b"\r\n\r\n")
+    group.received.append(0)
+    try:
+        while not stop.is_set():
+            _, second = await reader.readexactly(2)
+            length = second & 0x7F
+            if length == 126:
+                length = int.from_bytes(await reader.readexactly(2), "big")
+            payload = await reader.readexactly(length)
+            group.received[index] += 1
+            if group.received[index] % 10 == 0:
+                group.latencies.append((time.time() - _line_time(payload, "json")) * 1000)
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _run_clients(ports, args, conn):
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    groups = {"tcp": _Group(), "slow": _Group(), "udp": _Group(), "ws": _Group()}
+    tasks = [asyncio.ensure_future(_tcp_client(ports["tcp"], args.format, groups["tcp"], i, False, stop))
+             for i in range(args.clients)]
+    tasks += [asyncio.ensure_future(_tcp_client(ports["tcp"], "raw", groups["slow"], i, True, stop))
+              for i in range(args.slow)]
+    if args.ws:
+        tasks += [asyncio.ensure_future(_ws_client(ports["ws"], groups["ws"], i, stop)) for i in range(args.ws)]
+    udp_transports = []
+    for i in range(args.udp):
+        transport, _ = await loop.create_datagram_endpoint(lambda i=i: _UdpClient(groups["udp"], i),
+                                                           remote_addr=("127.0.0.1", ports["udp"]))
+        transport.sendto(b"SUBSCRIBE")
+        udp_transports.append(transport)
+
+    conn.send("connected")
+    await loop.run_in_executor(None, conn.recv)  # parent says when the measurement window starts
+    start = [list(g.received) for g in groups.values()]
+    for g in groups.values():
+        g.latencies.clear()
+    await loop.run_in_executor(None, conn.recv)  # ... and ends
+    stop.set()
+    result = {}
+    for (name, group), before in zip(groups.items(), start):
+        result[name] = {"received": [b - a for a, b in zip(before, group.received)],
+                        "latencies": group.latencies}
+    conn.send(result)
+    for transport in udp_transports:
+        transport.close()
+    for task in tasks:
+        task.cancel()
+
+
+def _client_process(ports, args, conn):
+    asyncio.run(_run_clients(ports, args, conn))
+
+
+# ───────────── Publisher (this process) ─────────────
+def _publish_loop(server, rate, stop, call_times):
+    interval = 1.0 / rate
+    next_time = time.perf_counter()
+    i = 0
+    while not stop.is_set():
+        line = f"ROLL: {i % 90:.2f} | PITCH: {i % 45:.2f} | YAW: {i % 360:.2f} | T: {time.time():.6f}"
+        t = time.perf_counter()
+        server.publish(line, "vehicle1")
+        call_times.append(time.perf_counter() - t)
+        i += 1
+        next_time += interval
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _summary(name, data, seconds):
+    received = data["received"]
+    if not received:
+        return
+    rates = [r / seconds for r in received]
+    text = f"    {name:5s} x{len(received):<4d} received {statistics.mean(rates):7.0f} lines/s each (min {min(rates):.0f})"
+    latencies = sorted(data["latencies"])
+    if latencies:
+        p95 = latencies[int(len(latencies) * 0.95)]
+        text += f", latency p50 {latencies[len(latencies) // 2]:.1f} ms p95 {p95:.1f} ms max {latencies[-1]:.1f} ms"
+    print(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry fan-out server benchmark")
+    parser.add_argument("--clients", type=int, default=300, help="fast TCP clients")
+    parser.add_argument("--slow", type=int, default=10, help="TCP clients reading ~20 lines/s")
+    parser.add_argument("--udp", type=int, default=20, help="UDP subscribers")
+    parser.add_argument("--ws", type=int, default=20, help="WebSocket clients")
+    parser.add_argument("--rate", type=float, default=500.0, help="published lines per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--format", choices=("raw", "json"), default="raw", help="format of the fast TCP clients")
+    parser.add_argument("--queue-size", type=int, default=256)
+    args = parser.parse_args()
+
+    server = TelemetryServer("127.0.0.1", tcp_port=0, udp_port=0, ws_port=0, queue_size=args.queue_size)
+    sys.stdout = open(os.devnull, "w")  # the server logs every connection
+    server.start()
+
+    parent_conn, child_conn = multiprocessing.Pipe()
+    clients = multiprocessing.Process(target=_client_process, args=(server.ports, args, child_conn))
+    clients.start()
+    parent_conn.recv()
+    time.sleep(0.5)  # let the UDP subscriptions land
+
+    stop = threading.Event()
+    call_times = []
+    publisher = threading.Thread(target=_publish_loop, args=(server, args.rate, stop, call_times))
+    publisher.start()
+    time.sleep(0.5)
+    published_before, call_count = server.published, len(call_times)
+    parent_conn.send("start")
+    start = time.perf_counter()
+    time.sleep(args.seconds)
+    parent_conn.send("stop")
+    seconds = time.perf_counter() - start
+    published = server.published - published_before
+    result = parent_conn.recv()
+    stop.set()
+    publisher.join()
+    stats = server.stats()
+    clients.join(timeout=5)
+    server.stop()
+    sys.stdout = sys.__stdout__
+
+    calls = sorted(call_times[call_count:]) or [0.0]
+    print(f"[FanoutBench] {published / seconds:.0f} lines/s published for {seconds:.1f} s "
+          f"to {stats['stream_clients']} stream + {stats['udp_clients']} UDP clients")
+    for name in ("tcp", "slow", "udp", "ws"):
+        _summary(name, result[name], seconds)
+    print(f"    server dropped {stats['dropped']} lines (slow clients' queues full)")
+    # Includes time the publisher thread was descheduled, so the tail is noisy on few cores
+    print(f"    publish() call: p50 {calls[len(calls) // 2] * 1e6:.1f} us, "
+          f"mean {statistics.mean(calls) * 1e6:.1f} us, max {calls[-1] * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
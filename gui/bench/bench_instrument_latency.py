@@ -0,0 +1,69 @@
+"""Latency and repaint count for the Flight Data horizon and compass.
+
+Shows a FlightDataTab on the offscreen platform, feeds it attitude lines
+at --rate Hz for --seconds, and prints InstrumentDriver.stats(): how many
+samples arrived, how many were applied / skipped below the visible
+threshold / coalesced, and the arrival-to-paint latency.
+
+    python bench/bench_instrument_latency.py [--rate 200] [--seconds 5] [--noise 0.05]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, Qt
+from tabs.flight_data_tab import FlightDataTab
+
+
+class FakeReader(QObject):
+    data_received = pyqtSignal(str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Horizon / compass update latency")
+    parser.add_argument("--rate", type=float, default=200.0, help="attitude lines per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--noise", type=float, default=0.05,
+                        help="sensor noise in degrees (below the threshold it causes no repaint)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    reader = FakeReader()
+    tab = FlightDataTab(reader)
+    tab.resize(1200, 800)
+    tab.show()
+
+    # Silence the per-line debug output of the tab while measuring
+    sys.stdout = open(os.devnull, "w")
+    state = {"n": 0}
+
+    def send():
+        t = state["n"] / args.rate
+        state["n"] += 1
+        roll = 20 * math.sin(t) + random.gauss(0, args.noise)
+        pitch = 10 * math.sin(0.5 * t) + random.gauss(0, args.noise)
+        yaw = (30 * t) % 360
+        reader.data_received.emit(f"ROLL: {roll:.2f} | PITCH: {pitch:.2f} | YAW: {yaw:.2f}")
+
+    feed = QTimer()
+    feed.setTimerType(Qt.PreciseTimer)
+    feed.timeout.connect(send)
+    feed.start(max(1, int(1000 / args.rate)))
+    QTimer.singleShot(int(args.seconds * 1000), app.quit)
+    app.exec_()
+
+    sys.stdout = sys.__stdout__
+    stats = tab.instrument_driver.stats()
+    print(f"[InstrumentBench] {state['n']} lines in {args.seconds:.1f} s")
+    for key, value in stats.items():
+        print(f"    {key:16s} {value:.2f}" if isinstance(value, float) else f"    {key:16s} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Paint-time benchmark for CompassWidget and AttitudeIndicator.
+
+Renders each widget into an offscreen image with a changing heading /
+attitude, once with the cached static layers and once painting everything
+every frame, and reports the mean time per paint.
+
+    QT_QPA_PLATFORM=offscreen python bench/bench_instrument_paint.py [--frames 2000] [--size 300]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtCore import Qt
+from tabs.compass_widget import CompassWidget
+from tabs.attitude_widget import AttitudeIndicator
+
+
+def time_paints(widget, update, frames):
+    image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.black)
+    painter = QPainter(image)
+    widget.render(painter)  # warm-up (builds the cached layer)
+    start = time.perf_counter()
+    for i in range(frames):
+        update(widget, i)
+        widget.render(painter)
+    elapsed = time.perf_counter() - start
+    painter.end()
+    return elapsed / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CompassWidget / AttitudeIndicator paint benchmark")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=300, help="widget edge in pixels")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    cases = (
+        ("CompassWidget", CompassWidget, lambda w, i: w.set_heading(i * 0.7)),
+        ("AttitudeIndicator", AttitudeIndicator, lambda w, i: w.set_attitude((i % 90) - 45, (i % 40) - 20)),
+    )
+    for name, widget_class, update in cases:
+        results = {}
+        for use_cache in (False, True):
+            widget = widget_class(use_cache=use_cache)
+            widget.resize(args.size, args.size)
+            results[use_cache] = time_paints(widget, update, args.frames)
+        speedup = results[False] / results[True] if results[True] else float("inf")
+        print(f"[PaintBench] {name:18s} uncached {results[False]:7.1f} us  "
+              f"cached {results[True]:7.1f} us  ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Load-time and frame-time benchmark: immediate-mode display list vs VBO mesh renderer.
+
+Runs on a Mesa software-rendering context (LIBGL_ALWAYS_SOFTWARE=1) so the
+numbers are comparable between machines. Uses the F450 model if it is present,
+otherwise a generated grid mesh of --grid x --grid quads.
+
+    python bench/bench_mesh_renderer.py [--obj PATH] [--grid 300] [--frames 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("LIBGL_ALWAYS_SOFTWARE", "1")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pywavefront
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QOpenGLContext, QOffscreenSurface, QSurfaceFormat, QOpenGLFramebufferObject
+from PyQt5.QtCore import QSize
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from tabs.mesh_renderer import MeshData, MeshRenderer
+
+DEFAULT_OBJ = os.path.join(os.path.dirname(__file__), "..", "assets",
+                           "F450 Quadcopter Frame with Pixhawk 2.4.8 Flight Controller.obj")
+
+
+def make_grid_obj(path, n):
+    """Write an n x n quad grid (a wavy sheet) as a Wavefront OBJ."""
+    with open(path, "w") as f:
+        for i in range(n + 1):
+            for j in range(n + 1):
+                z = ((i * 7 + j * 13) % 17) * 0.05
+                f.write(f"v {i - n / 2:.3f} {j - n / 2:.3f} {z:.3f}\n")
+        for i in range(n):
+            for j in range(n):
+                a = i * (n + 1) + j + 1
+                b = a + n + 1
+                f.write(f"f {a} {b} {b + 1} {a + 1}\n")
+
+
+def compile_display_list(model):
+    """The old GLViewer path: one Python GL call per vertex into a display list."""
+    display_list = glGenLists(1)
+    glNewList(display_list, GL_COMPILE)
+    for i, mesh in enumerate(model.mesh_list):
+        glColor3f(0.95, 0.95, 0.95) if i % 2 else glColor3f(0.9, 0.1, 0.1)
+        for face in mesh.faces:
+            if len(face) >= 3:
+                glBegin(GL_POLYGON)
+                for vertex_i in face:
+                    if vertex_i < len(model.vertices):
+                        glVertex3f(*model.vertices[vertex_i])
+                glEnd()
+    glEndList()
+    return display_list
+
+
+def setup_scene(size):
+    glViewport(0, 0, size, size)
+    glEnable(GL_DEPTH_TEST)
+    glEnable(GL_LIGHTING)
+    glEnable(GL_LIGHT0)
+    glEnable(GL_COLOR_MATERIAL)
+    glEnable(GL_NORMALIZE)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(45.0, 1.0, 0.1, 1000.0)
+    glMatrixMode(GL_MODELVIEW)
+
+
+def time_frames(draw, frames):
+    """Average milliseconds per frame, including glFinish so the GPU work is counted."""
+    start = time.perf_counter()
+    for k in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glLoadIdentity()
+        gluLookAt(0, 0, 100, 0, 0, 0, 0, 1, 0)
+        glRotatef(k, 0, 1, 0)
+        draw()
+        glFinish()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--obj", default=DEFAULT_OBJ)
+    parser.add_argument("--grid", type=int, default=300)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--size", type=int, default=512)
+    args = parser.parse_args()
+
+    obj_path = args.obj
+    if not os.path.exists(obj_path):
+        obj_path = os.path.join(tempfile.gettempdir(), f"bench_grid_{args.grid}.obj")
+        make_grid_obj(obj_path, args.grid)
+        print(f"[Bench] Model not found, using generated {args.grid}x{args.grid} grid")
+
+    app = QApplication(sys.argv)
+    fmt = QSurfaceFormat()
+    fmt.setProfile(QSurfaceFormat.CompatibilityProfile)
+    context = QOpenGLContext()
+    context.setFormat(fmt)
+    surface = QOffscreenSurface()
+    surface.setFormat(fmt)
+    surface.create()
+    if not context.create() or not context.makeCurrent(surface):
+        print("[Bench] Could not create an OpenGL context (is Mesa installed?)")
+        return 1
+
+    fbo = QOpenGLFramebufferObject(QSize(args.size, args.size),
+                                   QOpenGLFramebufferObject.CombinedDepthStencil)
+    fbo.bind()
+    setup_scene(args.size)
+    print(f"[Bench] GL_RENDERER: {glGetString(GL_RENDERER).decode()}")
+
+    start = time.perf_counter()
+    model = pywavefront.Wavefront(obj_path, collect_faces=True, parse=True)
+    parse_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    display_list = compile_display_list(model)
+    glFinish()
+    legacy_load_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    mesh = MeshData.from_wavefront(model)
+    renderer = MeshRenderer(mesh)
+    renderer.upload()
+    glFinish()
+    vbo_load_ms = (time.perf_counter() - start) * 1000
+
+    legacy_frame_ms = time_frames(lambda: glCallList(display_list), args.frames)
+    vbo_frame_ms = time_frames(renderer.draw, args.frames)
+
+    print(f"[Bench] {mesh.triangle_count} triangles, {len(mesh.groups)} materials")
+    print(f"[Bench] OBJ parse (shared):    {parse_ms:9.1f} ms")
+    print(f"[Bench] Display list compile:  {legacy_load_ms:9.1f} ms")
+    print(f"[Bench] Arrays + VBO upload:   {vbo_load_ms:9.1f} ms")
+    print(f"[Bench] Frame, display list:   {legacy_frame_ms:9.2f} ms")
+    print(f"[Bench] Frame, VBO:            {vbo_frame_ms:9.2f} ms")
+
+    renderer.release()
+    glDeleteLists(display_list, 1)
+    fbo.release()
+    context.doneCurrent()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
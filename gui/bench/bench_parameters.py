@@ -0,0 +1,111 @@
+"""Parameter download and sync against a simulated flight controller.
+
+The simulated vehicle (about 250 parameters) answers every command after
+--link-delay seconds, like a radio link's round trip, and ignores
+--ack-drop of them. Reports full-download time for several in-flight
+window sizes (1 = one request per round trip), the re-download when the
+cache is current (hash check only), and a diff sync of a few edits.
+
+    python bench/bench_parameters.py [--link-delay 0.02] [--ack-drop 0.0] [--windows 1,8,16,32]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtCore import QCoreApplication, Qt
+from command_link import CommandLink
+from parameters import ParameterManager
+from serial_reader import SerialReader
+from sim_vehicle import SimulatedVehicle
+
+
+def wait_for(signal, action, timeout=60.0):
+    """Run ``action`` and wait for ``signal``; returns (seconds, signal arguments)."""
+    done = threading.Event()
+    result = []
+
+    def on_signal(*args):
+        result[:] = args
+        done.set()
+
+    signal.connect(on_signal, Qt.DirectConnection)
+    start = time.perf_counter()
+    action()
+    done.wait(timeout)
+    elapsed = time.perf_counter() - start
+    signal.disconnect(on_signal)
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parameter protocol benchmark")
+    parser.add_argument("--link-delay", type=float, default=0.02, help="seconds before each reply")
+    parser.add_argument("--ack-drop", type=float, default=0.0, help="fraction of commands ignored")
+    parser.add_argument("--windows", default="1,8,16,32", help="in-flight window sizes to compare")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")  # SerialReader prints every line
+    vehicle = SimulatedVehicle(0, rate_hz=100.0, ack_drop=args.ack_drop, link_delay=args.link_delay)
+    vehicle.start()
+    reader = SerialReader(vehicle.port)
+    reader.start_reading()
+    while reader.state != "connected":
+        time.sleep(0.01)
+
+    results = []
+    for window in [int(w) for w in args.windows.split(",")]:
+        commands = CommandLink(reader, max_in_flight=window)
+        params = ParameterManager(commands)
+        commands.start()
+        elapsed, (ok, detail) = wait_for(params.download_finished, params.download)
+        stats = commands.stats()
+        results.append((f"full download, window {window}", elapsed, ok,
+                        f"{params.count} parameters, {stats['sent']} writes, {stats['retries']} retries {detail}"))
+        if window != int(args.windows.split(",")[-1]):
+            commands.stop()
+    cache_hash = params.cache_hash()
+
+    elapsed, (ok, detail) = wait_for(params.download_finished, params.download)
+    results.append(("re-download, cache current", elapsed, ok, detail))
+
+    edits = {"PID_ROLL_RATE_P": 0.15, "PID_PITCH_RATE_P": 0.15, "RANGE_ACC_X_MAX": 4000,
+             "BATT_LOW_VOLT": 10.8, "FS_TIMEOUT": 2.0}
+    for name, value in edits.items():
+        params.set_value(name, value)
+    sent_before = commands.stats()["sent"]
+    elapsed, (ok, detail) = wait_for(params.sync_finished, params.sync)
+    results.append((f"sync {len(edits)} edits", elapsed, ok,
+                    f"{commands.stats()['sent'] - sent_before} writes, dirty left {len(params.dirty())} {detail}"))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".params", delete=False) as f:
+        path = f.name
+    params.save_file(path)
+    params.set_value("PID_YAW_RATE_P", 0.3)
+    wait_for(params.sync_finished, params.sync)
+    changed, unknown = params.load_file(path)  # back to the saved file: only the yaw gain differs
+    elapsed, (ok, detail) = wait_for(params.sync_finished, params.sync)
+    results.append(("sync from file", elapsed, ok, f"{len(changed)} changed ({', '.join(changed)}) {detail}"))
+    os.unlink(path)
+
+    commands.stop()
+    reader.stop()
+    vehicle.stop()
+    sys.stdout = real_stdout
+    matches = all(abs(vehicle.parameters[vehicle.parameter_index[n]][1] - params.values[n]) < 1e-9
+                  for n in params.values)
+    print(f"[ParameterBench] link delay {args.link_delay * 1000:.0f} ms, ack drop {args.ack_drop * 100:.0f}%, "
+          f"{len(vehicle.parameters)} parameters")
+    for name, elapsed, ok, detail in results:
+        print(f"    {name:32s} {elapsed * 1000:8.1f} ms  {'ok' if ok else 'FAILED'}  {detail.strip()}")
+    print(f"    cache matches vehicle: {matches}, hash {cache_hash}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Shared-memory telemetry ring with several reader processes.
+
+The GCS side publishes --rate lines/s (attitude, IMU, baro, RC in turn)
+into a TelemetryRing for --seconds; --readers separate processes attach
+with RingReader and poll read_new() every --poll-ms, the way an analysis
+script or notebook would. Every line carries SEQ and ROLL = SEQ / 10, so
+each reader can check that it saw no torn record and count gaps.
+
+Reports the publish cost per line without readers and with them, and per
+reader: records/s, lost records, torn records (must be 0) and the age of
+the newest record at each poll.
+
+    python bench/bench_shm_ring.py [--readers 4] [--seconds 3] [--rate 2000] [--poll-ms 20] [--capacity 65536]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from telemetry_ring import TelemetryRing, RingReader
+
+NAME = f"stm_fc_bench_{os.getpid()}"
+
+
+def make_line(seq):
+    roll = f"{seq % 65536 / 10:.1f}"
+    return [f"SEQ: {seq % 65536} | ROLL: {roll} | PITCH: {roll} | YAW: {roll}",
+            f"SEQ: {seq % 65536} | ROLL: {roll} | ACC: 12,-40,1000 | GYRO: 3,-2,1",
+            f"SEQ: {seq % 65536} | ROLL: {roll} | TEMP: 27.1C | PRESS: 1013.25hPa | ALT: 1.50m",
+            f"SEQ: {seq % 65536} | ROLL: {roll} | CH1: 1500 | CH2: 1500 | CH3: 1100 | CH4: 1500"][seq % 4]
+
+
+def reader_process(name, seconds, poll_ms, ready, results):
+    ring = RingReader(name)
+    ready.wait()
+    received = torn = polls = 0
+    ages = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        batch, _ = ring.read_new()
+        polls += 1
+        if len(batch):
+            received += len(batch)
+            torn += int(np.count_nonzero(np.abs(batch["seq"] / 10 - batch["roll"]) > 0.05))
+            ages.append(time.time() - batch["time"][-1])
+        time.sleep(poll_ms / 1000)
+    results.put((received, ring.lost, torn, polls, float(np.median(ages) * 1000) if ages else 0.0))
+    ring.close()
+
+
+def publish(ring, rate, seconds):
+    """Publish at ``rate`` lines/s; returns lines published and CPU seconds spent in publish()."""
+    spent = 0.0
+    seq = 0
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        due = int((time.monotonic() - start) * rate)
+        while seq < due:
+            line = make_line(seq)
+            t = time.perf_counter()
+            ring.publish(line, "vehicle1")
+            spent += time.perf_counter() - t
+            seq += 1
+        time.sleep(0.001)
+    return seq, spent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-memory telemetry ring benchmark")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rate", type=float, default=2000.0, help="lines per second")
+    parser.add_argument("--poll-ms", type=float, default=20.0)
+    parser.add_argument("--capacity", type=int, default=65536)
+    args = parser.parse_args()
+
+    ring = TelemetryRing(NAME, args.capacity)
+    try:
+        lines, spent = publish(ring, args.rate, 1.0)
+        print(f"[BenchShmRing] no readers: publish {spent / lines * 1e6:.1f} us per line")
+
+        context = multiprocessing.get_context("spawn")
+        ready = context.Event()
+        results = context.Queue()
+        readers = [context.Process(target=reader_process,
+                                   args=(NAME, args.seconds, args.poll_ms, ready, results))
+                   for _ in range(args.readers)]
+        for process in readers:
+            process.start()
+        time.sleep(1.0)  # let the interpreters start and attach
+        ready.set()
+        lines, spent = publish(ring, args.rate, args.seconds)
+        print(f"[BenchShmRing] {args.readers} readers: publish {spent / lines * 1e6:.1f} us per line, "
+              f"{lines / args.seconds:.0f} lines/s, ring of {args.capacity} records")
+        for index in range(args.readers):
+            received, lost, torn, polls, age_ms = results.get(timeout=30)
+            print(f"    reader {index}: {received / args.seconds:7.0f} records/s  lost {lost:6d}  "
+                  f"torn {torn}  {polls} polls  newest record {age_ms:.1f} ms old")
+        for process in readers:
+            process.join()
+    finally:
+        ring.close()
+
+
+if __name__ == "__main__":
+    main()
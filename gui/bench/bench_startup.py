@@ -0,0 +1,52 @@
+"""Startup timing: runs main.py with eager and with lazy tab construction.
+
+Each run is a fresh interpreter started with --exit-after-startup; the
+"Window shown after N ms" line printed by main.py is collected and the
+median over --runs is reported, together with the per-tab build times.
+
+    python bench/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+MAIN = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'main.py'))
+SHOWN_RE = re.compile(r"Window shown after (\d+) ms")
+BUILT_RE = re.compile(r"\[LazyTab\] (\w+) built in (\d+) ms")
+
+
+def run_once(extra_args):
+    result = subprocess.run([sys.executable, MAIN, "--exit-after-startup"] + extra_args,
+                            capture_output=True, text=True, timeout=120,
+                            cwd=os.path.dirname(MAIN))
+    shown = SHOWN_RE.search(result.stdout)
+    if not shown:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:])
+        raise RuntimeError("main.py exited without reporting startup time")
+    built = {name: int(ms) for name, ms in BUILT_RE.findall(result.stdout)}
+    return int(shown.group(1)), built
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, extra in (("eager", ["--eager-tabs"]), ("lazy", [])):
+        times = []
+        built = {}
+        for _ in range(args.runs):
+            shown_ms, built = run_once(extra)
+            times.append(shown_ms)
+        print(f"[Startup] {label:5s}: window shown after {statistics.median(times):.0f} ms "
+              f"(median of {args.runs}, min {min(times)} ms)")
+        for name, ms in built.items():
+            print(f"           {name:22s} {ms:5d} ms")
+
+
+if __name__ == "__main__":
+    main()
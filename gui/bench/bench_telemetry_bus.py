@@ -0,0 +1,152 @@
+"""Per-consumer deliveries and CPU: every consumer on data_received vs TelemetryBus.
+
+A fake reader emits a flight-controller mix of lines (attitude and IMU at
+--rate Hz, RC at half, baro at a fifth, GPS at 5 Hz, mode at 1 Hz) for
+--seconds, to five consumers:
+
+    3D view       ATTITUDE + IMU, every sample
+    text panel    ATTITUDE + BARO + MODE, 10 Hz, newest line
+    plot          IMU, 20 Hz, min/max
+    map           GPS, 2 Hz, newest line
+    log writer    everything
+
+First each consumer connects to data_received and filters the lines
+itself (the old way, panels redrawn for every line), then the same
+consumers subscribe to a TelemetryBus. GUI consumers (panel, plot, map)
+spin --handler-us per delivery to stand in for a widget update. Before
+that, check_routing() makes sure lines reach the subscribers of their kind.
+
+    python bench/bench_telemetry_bus.py [--seconds 3] [--rate 200] [--handler-us 100]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
+from telemetry import message_kind
+from telemetry_bus import TelemetryBus, ANY_KIND, MINMAX
+
+TICK_MS = 10
+
+
+class FakeReader(QObject):
+    data_received = pyqtSignal(str)
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+        self.ticks = 0
+        self.lines = 0
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.emit_tick)
+
+    def emit_tick(self):
+        for _ in range(int(self.rate * TICK_MS / 1000)):
+            self.ticks += 1
+            t = self.ticks / self.rate
+            lines = [f"ROLL: {10 * math.sin(t):.2f} | PITCH: {5 * math.cos(t):.2f} | YAW: {t * 10 % 360:.2f}",
+                     f"ACC: {int(100 * math.sin(3 * t))},{int(50 * math.cos(t))},1000 | GYRO: 3,-2,1"]
+            if self.ticks % 2 == 0:
+                lines.append("CH1: 1500 | CH2: 1500 | CH3: 1100 | CH4: 1500 | CH5: 1000 | CH6: 1000")
+            if self.ticks % 5 == 0:
+                lines.append(f"TEMP: 27.1C | PRESS: 1013.25hPa | ALT: {t:.2f}m")
+            if self.ticks % int(self.rate / 5) == 0:
+                lines.append(f"LAT: {12.9351 + t * 1e-5:.6f} | LON: 77.536000 | GPS: 3D Fix")
+            if self.ticks % int(self.rate) == 0:
+                lines.append("MODE: STABILIZE")
+            for line in lines:
+                self.lines += 1
+                self.data_received.emit(line)
+
+
+def spin(us):
+    end = time.perf_counter() + us / 1e6
+    while time.perf_counter() < end:
+        pass
+
+
+def make_consumers(handler_us):
+    counts = {}
+
+    def consumer(name, work_us=0):
+        counts[name] = 0
+
+        def handle(line):
+            counts[name] += 1
+            if work_us:
+                spin(work_us)
+        return handle
+    return counts, {
+        "3D view": (("ATTITUDE", "IMU"), consumer("3D view"), {"direct": True}),
+        "text panel": (("ATTITUDE", "BARO", "MODE"), consumer("text panel", handler_us), {"max_rate_hz": 10}),
+        "plot": (("IMU",), consumer("plot", handler_us), {"max_rate_hz": 20, "policy": MINMAX}),
+        "map": (("GPS",), consumer("map", handler_us), {"max_rate_hz": 2}),
+        "log writer": ((ANY_KIND,), consumer("log writer"), {}),
+    }
+
+
+def check_routing():
+    """Lines that carry keys of several kinds reach the right subscriber (exits otherwise)."""
+    cases = [
+        ("GPS", "LAT: 12.9351° N | LON: 77.5360° E | ALT: 900 m"),  # GPS altitude, not baro
+        ("BARO", "TEMP: 27.1C | PRESS: 1013.25hPa | ALT: 1.50m"),
+        ("ATTITUDE", "ROLL: 12.3° | PITCH: -4.5° | YAW: 90.0°"),
+    ]
+    reader = FakeReader(0)
+    bus = TelemetryBus.of(reader)
+    received = {kind: [] for kind, _ in cases}
+    for kind in received:
+        bus.subscribe(kind, received[kind].append, direct=True)
+    for kind, line in cases:
+        reader.data_received.emit(line)
+        if received[kind] != [line]:
+            sys.exit(f"[BenchTelemetryBus] routing: '{line}' did not reach the {kind} subscriber")
+    print(f"[BenchTelemetryBus] routing: {len(cases)} mixed-key lines reached their subscribers")
+
+
+def run(app, args, use_bus):
+    reader = FakeReader(args.rate)
+    counts, consumers = make_consumers(args.handler_us)
+    if use_bus:
+        bus = TelemetryBus.of(reader)
+        for kinds, handle, options in consumers.values():
+            for kind in kinds:
+                bus.subscribe(kind, handle, **options)
+    else:
+        for kinds, handle, _ in consumers.values():
+            def filtered(line, kinds=kinds, handle=handle):
+                if ANY_KIND in kinds or message_kind(line) in kinds:
+                    handle(line)
+            reader.data_received.connect(filtered)
+
+    reader.timer.start(TICK_MS)
+    cpu = time.process_time()
+    QTimer.singleShot(args.seconds * 1000, app.quit)
+    app.exec_()
+    reader.timer.stop()
+    cpu = time.process_time() - cpu
+    print(f"[BenchTelemetryBus] {'TelemetryBus' if use_bus else 'data_received'}: "
+          f"{reader.lines / args.seconds:.0f} lines/s, CPU {cpu / args.seconds * 100:.1f}%")
+    for name, count in counts.items():
+        print(f"    {name:<11s} {count / args.seconds:7.1f} deliveries/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TelemetryBus benchmark")
+    parser.add_argument("--seconds", type=int, default=3)
+    parser.add_argument("--rate", type=float, default=200.0, help="attitude/IMU samples per second")
+    parser.add_argument("--handler-us", type=float, default=100.0, help="cost of one widget update")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    check_routing()
+    run(app, args, use_bus=False)
+    run(app, args, use_bus=True)
+
+
+if __name__ == "__main__":
+    main()
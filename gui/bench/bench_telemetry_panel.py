@@ -0,0 +1,119 @@
+"""Cost of updating every telemetry readout: styled QLabels vs TelemetryPanel.
+
+Builds the 18 Flight Data readouts both ways - one QLabel per value with
+its own stylesheet inside QGroupBoxes (the previous layout), and a single
+TelemetryPanel - shows them on the offscreen platform, then changes every
+value --updates times, processing events (layout + paint) after each
+round. Reports CPU time per round and what that costs at --rate Hz.
+
+    python bench/bench_telemetry_panel.py [--updates 500] [--rate 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QGroupBox, QLabel
+from tabs.telemetry_panel import TelemetryPanel, PanelField
+
+# (section, key, caption, colour, panel style)
+FIELDS = [
+    ("GPS", "gps_status", "Status:", "#FFA726", "fill"),
+    ("GPS", "latitude", "Latitude:", "#42A5F5", "fill"),
+    ("GPS", "longitude", "Longitude:", "#AB47BC", "fill"),
+    ("Barometer", "altitude", "Relative Altitude:", "#66BB6A", "fill"),
+    ("Barometer", "temp", "TEMP:", "#FF7043", "fill"),
+    ("Barometer", "press", "PRESS:", "#26C6DA", "fill"),
+    ("IMU / Sensor Data", "roll", "Roll:", "#EF5350", "left"),
+    ("IMU / Sensor Data", "pitch", "Pitch:", "#5C6BC0", "left"),
+    ("IMU / Sensor Data", "yaw", "Yaw:", "#FFCA28", "left"),
+    ("IMU / Sensor Data", "accel", "ACC:", "#8BC34A", "box"),
+    ("IMU / Sensor Data", "gyro", "GYRO:", "#FF9800", "box"),
+    ("IMU / Sensor Data", "mag", "MAG:", "#E91E63", "box"),
+] + [("PPM Channels (μs)", f"ppm_ch{i}", f"CH{i}:", color, "gradient")
+     for i, color in enumerate(["#ff5722", "#2196f3", "#4caf50", "#ff9800", "#9c27b0", "#00bcd4"], 1)]
+
+
+def label_style(color, style):
+    """Roughly the per-label stylesheets the Flight Data tab used to set."""
+    r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+    css = f"font-size: 14px; font-weight: bold; color: {color}; border-radius: 5px; padding: 6px;"
+    if style == "gradient":
+        css += (f"background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 rgba({r},{g},{b},0.2), "
+                f"stop:1 rgba({r},{g},{b},0.05)); border-left: 3px solid {color};")
+    else:
+        css += f"background-color: rgba({r},{g},{b},0.1);"
+        if style == "left":
+            css += f"border-left: 4px solid {color};"
+        elif style == "box":
+            css += f"border: 1px solid {color};"
+    return css
+
+
+class LabelPanel(QWidget):
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        self.labels = {}
+        groups = {}
+        for section, key, caption, color, style in FIELDS:
+            if section not in groups:
+                groups[section] = QGroupBox(section)
+                groups[section].setLayout(QVBoxLayout())
+                layout.addWidget(groups[section])
+            label = QLabel(f"{caption} --")
+            label.setStyleSheet(label_style(color, style))
+            groups[section].layout().addWidget(label)
+            self.labels[key] = (label, caption)
+
+    def set_values(self, values):
+        for key, text in values.items():
+            label, caption = self.labels[key]
+            label.setText(f"{caption} {text}")
+
+
+def build_telemetry_panel():
+    sections = {}
+    for section, key, caption, color, style in FIELDS:
+        sections.setdefault(section, []).append(PanelField(key, caption, "--", color, style=style))
+    return TelemetryPanel([(title, fields, 1) for title, fields in sections.items()])
+
+
+def run(app, widget, updates):
+    widget.resize(520, 900)
+    widget.show()
+    app.processEvents()
+    start = time.process_time()
+    for i in range(updates):
+        widget.set_values({key: f"{(i * 7 + n) % 2000 - 1000}.{i % 10}"
+                           for n, (_, key, *_) in enumerate(FIELDS)})
+        app.processEvents()
+    elapsed = time.process_time() - start
+    widget.hide()
+    return elapsed / updates * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QLabel readouts vs TelemetryPanel")
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=100.0, help="update rate to express the cost at")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    app.setStyleSheet("QWidget { font-size: 14px; background-color: #121212; color: #e0e0e0; }")
+    results = {
+        "QLabels": run(app, LabelPanel(), args.updates),
+        "TelemetryPanel": run(app, build_telemetry_panel(), args.updates),
+    }
+    for name, ms in results.items():
+        print(f"[PanelBench] {name:15s} {ms:6.2f} ms per update of {len(FIELDS)} fields "
+              f"({ms * args.rate / 10:.1f}% of a core at {args.rate:.0f} Hz)")
+    print(f"[PanelBench] TelemetryPanel costs {results['TelemetryPanel'] / results['QLabels'] * 100:.0f}% "
+          f"of the QLabel version")
+
+
+if __name__ == "__main__":
+    main()
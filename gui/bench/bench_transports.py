@@ -0,0 +1,132 @@
+"""Line rate and CPU of SerialReader over each transport.
+
+For every connection-string kind (serial pty, udp://, tcp://, file://) a
+feeder in another process sends --rate lines/s; SerialReader reads them
+for --seconds and the lines received and the CPU used by this process
+(reader thread + event loop) are reported. "idle" is a UDP link nobody
+sends to: the reader must wait in select, not spin.
+
+    python bench/bench_transports.py [--rate 1000] [--seconds 3]
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+from serial_reader import SerialReader
+
+
+def _line(i):
+    return f"ROLL: {i % 90:.2f} | PITCH: {i % 45:.2f} | YAW: {i % 360:.2f}"
+
+
+def _paced(rate, seconds):
+    """Yield line numbers at ``rate`` per second, in 1 ms batches."""
+    start = time.perf_counter()
+    sent = 0
+    while time.perf_counter() - start < seconds:
+        due = int((time.perf_counter() - start) * rate)
+        while sent < due:
+            yield sent
+            sent += 1
+        time.sleep(0.001)
+
+
+def _feed_udp(port, rate, seconds):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for i in _paced(rate, seconds):
+        sock.sendto(_line(i).encode(), ("127.0.0.1", port))
+
+
+def _feed_tcp(server, rate, seconds):
+    conn, _ = server.accept()
+    try:
+        for i in _paced(rate, seconds):
+            conn.sendall((_line(i) + "\n").encode())
+    except ConnectionError:
+        pass  # the reader stopped first
+    conn.close()
+
+
+def _feed_pty(fd, rate, seconds):
+    for i in _paced(rate, seconds):
+        os.write(fd, (_line(i) + "\n").encode())
+
+
+def run(app, connection, seconds, feeder=None):
+    reader = SerialReader(connection)
+    received = {"lines": 0}
+    reader.data_received.connect(lambda _line: received.__setitem__("lines", received["lines"] + 1))
+    reader.start_reading()
+    if feeder:
+        feeder.start()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec_()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    reader.stop()
+    if feeder:
+        feeder.join()
+    return received["lines"] / wall, cpu / wall * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SerialReader transport benchmark")
+    parser.add_argument("--rate", type=float, default=1000.0, help="lines per second")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")  # SerialReader prints every line
+    results = []
+
+    # Serial: the slave side of a pty behaves like a USB CDC port
+    import tty
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    feeder = multiprocessing.Process(target=_feed_pty, args=(master, args.rate, args.seconds))
+    results.append(("serial (pty)", run(app, os.ttyname(slave), args.seconds, feeder)))
+    os.close(master)
+    os.close(slave)
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        udp_port = probe.getsockname()[1]
+    feeder = multiprocessing.Process(target=_feed_udp, args=(udp_port, args.rate, args.seconds))
+    results.append(("udp://", run(app, f"udp://127.0.0.1:{udp_port}", args.seconds, feeder)))
+
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    feeder = multiprocessing.Process(target=_feed_tcp, args=(server, args.rate, args.seconds))
+    feeder.start()  # must be accepting before the reader connects
+    results.append(("tcp://", run(app, f"tcp://127.0.0.1:{server.getsockname()[1]}", args.seconds)))
+    feeder.join()
+    server.close()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as log:
+        log.write("\n".join(_line(i) for i in range(int(args.rate * args.seconds * 2))) + "\n")
+    results.append(("file://", run(app, f"file://{log.name}?rate={args.rate:g}", args.seconds)))
+    os.unlink(log.name)
+
+    results.append(("idle (udp, no sender)", run(app, "udp://127.0.0.1:0", args.seconds)))
+
+    sys.stdout = real_stdout
+    print(f"[TransportBench] {args.rate:.0f} lines/s for {args.seconds:.0f} s per transport")
+    for name, (rate, cpu) in results:
+        print(f"    {name:24s} received {rate:7.0f} lines/s, process CPU {cpu:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Command uplink against a simulated vehicle that ACKs over its pty.
+
+A setpoint stream (--setpoint-rate commands/s, all with one coalesce key)
+runs the whole time. Every half second a burst of --burst normal-priority
+commands is queued, immediately followed by an URGENT ARM or DISARM. The
+vehicle ignores --ack-drop of the commands it receives, so some commands
+need retries. Reports how many burst commands were still written ahead of
+each urgent one, urgent ACK latency, and what coalescing saved. Before
+that, check_urgent_bypass() makes sure an URGENT command is written at
+once while the in-flight window is full of unacknowledged BULK requests,
+and check_shared_coalesce_key() that different commands sharing a
+coalesce key never merge into one another.
+
+    python bench/command_uplink_demo.py [--seconds 5] [--setpoint-rate 1000] [--burst 30] [--ack-drop 0.1]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, Qt, pyqtSignal
+import command_link
+from command_link import CommandLink, URGENT, NORMAL, SETPOINT, BULK
+from serial_reader import SerialReader
+from sim_vehicle import SimulatedVehicle
+
+
+class SilentLink(QObject):
+    """A link that takes every write and never answers: the window stays full."""
+    data_received = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append((time.perf_counter(), data))
+
+
+def check_urgent_bypass():
+    """An URGENT command goes out at once behind a full window of BULK requests (exits otherwise)."""
+    link = SilentLink()
+    commands = CommandLink(link)
+    commands.start()
+    for i in range(commands.max_in_flight + 10):
+        commands.send("PARAM_GET", f"P{i}", BULK)
+    deadline = time.perf_counter() + 1.0
+    while len(link.writes) < commands.max_in_flight and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    queued_at = time.perf_counter()
+    commands.send("DISARM", priority=URGENT)
+    time.sleep(0.1)  # well below ACK_TIMEOUT: no BULK retry can open a slot meanwhile
+    commands.stop()
+    urgent = [t for t, data in link.writes if b" DISARM" in data]
+    if not urgent:
+        sys.exit("[CommandUplinkDemo] URGENT command held back by a full window of BULK requests")
+    print(f"[CommandUplinkDemo] URGENT written {(urgent[0] - queued_at) * 1000:.1f} ms after queueing, "
+          f"with {commands.max_in_flight} BULK requests unacknowledged")
+
+
+def check_shared_coalesce_key():
+    """ARM then DISARM, SET_MODE then an URGENT RTL, on shared keys: the newer command goes out (exits otherwise)."""
+    link = SilentLink()
+    commands = CommandLink(link)
+    commands.send("ARM", priority=URGENT, coalesce="arming")
+    commands.send("DISARM", priority=URGENT, coalesce="arming")  # writer not started: ARM still queued
+    commands.start()
+    for i in range(commands.max_in_flight):
+        commands.send("PARAM_GET", f"P{i}", BULK)
+    deadline = time.perf_counter() + 1.0
+    while len(link.writes) < commands.max_in_flight and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    commands.send("SET_MODE", "Loiter", NORMAL, coalesce="mode")  # held back by the full window
+    commands.send("RTL", priority=URGENT, coalesce="mode")
+    time.sleep(0.1)
+    commands.stop()
+    names = [data.split()[2].decode() for _, data in link.writes]
+    if "ARM" in names or "DISARM" not in names:
+        sys.exit(f"[CommandUplinkDemo] DISARM merged into a queued ARM: wrote {names[:2]}")
+    if "RTL" not in names:
+        sys.exit("[CommandUplinkDemo] URGENT RTL merged into a queued SET_MODE behind a full window")
+    print("[CommandUplinkDemo] shared coalesce keys: DISARM and RTL replaced ARM and SET_MODE, not merged")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command uplink demo")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--setpoint-rate", type=float, default=1000.0, help="setpoints queued per second")
+    parser.add_argument("--burst", type=int, default=30, help="normal commands queued before each urgent one")
+    parser.add_argument("--ack-drop", type=float, default=0.1, help="fraction of commands the vehicle ignores")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    check_urgent_bypass()
+    check_shared_coalesce_key()
+    vehicle = SimulatedVehicle(0, rate_hz=100.0, ack_drop=args.ack_drop)
+    vehicle.start()
+    reader = SerialReader(vehicle.port)
+    commands = CommandLink(reader)
+
+    written = []  # (time, seq, name) in the order the writer sent them
+    finished = {}  # seq -> (time, status)
+
+    def on_status(seq, name, status, detail):
+        now = time.perf_counter()
+        if status == command_link.SENT:
+            written.append((now, seq, name))
+        else:
+            finished[seq] = (now, status)
+
+    commands.command_status.connect(on_status, Qt.DirectConnection)
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")  # SerialReader prints every line
+    reader.start_reading()
+    commands.start()
+
+    urgent = []  # (queued time, seq)
+    submitted = {"setpoints": 0, "burst": 0}
+    running = threading.Event()
+    running.set()
+
+    def setpoints():
+        interval = 1.0 / args.setpoint_rate
+        next_time = time.perf_counter()
+        i = 0
+        while running.is_set():
+            commands.send("SETPOINT", f"alt={10 + (i % 100) * 0.01:.2f}", SETPOINT, coalesce="alt")
+            submitted["setpoints"] += 1
+            i += 1
+            next_time += interval
+            time.sleep(max(0.0, next_time - time.perf_counter()))
+
+    def bursts():
+        arm = True
+        while running.is_set():
+            time.sleep(0.5)
+            for _ in range(args.burst):
+                commands.send("RC_CAL", "STOP", NORMAL)
+                submitted["burst"] += 1
+            urgent.append((time.perf_counter(), commands.send("ARM" if arm else "DISARM", priority=URGENT)))
+            arm = not arm
+
+    workers = [threading.Thread(target=setpoints, daemon=True), threading.Thread(target=bursts, daemon=True)]
+    for worker in workers:
+        worker.start()
+
+    QTimer.singleShot(int(args.seconds * 1000), app.quit)
+    app.exec_()
+    running.clear()
+    for worker in workers:
+        worker.join()
+    # Let the queue drain before stopping
+    drain_end = time.perf_counter() + 3.0
+    while time.perf_counter() < drain_end and commands.stats()["queued"] + commands.stats()["in_flight"]:
+        time.sleep(0.05)
+    stats = commands.stats()
+    commands.stop()
+    reader.stop()
+    vehicle.stop()
+    sys.stdout = real_stdout
+
+    order = [seq for _, seq, _ in written]
+    first_write = {}
+    for t, seq, _ in written:
+        first_write.setdefault(seq, t)
+    ahead, latencies = [], []
+    for queued_at, seq in urgent:
+        if seq not in first_write:
+            continue
+        position = order.index(seq)
+        # Burst commands that went out after the urgent one was queued but before it
+        ahead.append(sum(1 for t, _, name in written[:position] if name == "RC_CAL" and t >= queued_at))
+        if finished.get(seq, (0, ""))[1] == command_link.ACKED:
+            latencies.append((finished[seq][0] - queued_at) * 1000)
+
+    setpoints_written = sum(1 for _, _, name in written if name == "SETPOINT")
+    print(f"[CommandUplinkDemo] {args.seconds:.0f} s, {args.setpoint_rate:.0f} setpoints/s, "
+          f"bursts of {args.burst}, vehicle ignores {args.ack_drop * 100:.0f}% of commands")
+    print(f"    setpoints: {submitted['setpoints']} queued, {stats['coalesced']} coalesced in the queue, "
+          f"{stats['superseded']} superseded, {setpoints_written} writes")
+    print(f"    burst commands: {submitted['burst']} queued")
+    if latencies:
+        print(f"    urgent commands: {len(urgent)}, burst commands written ahead of them: "
+              f"max {max(ahead)}, mean {statistics.mean(ahead):.1f}")
+        print(f"    urgent ACK latency: p50 {statistics.median(latencies):.1f} ms, max {max(latencies):.1f} ms")
+    print(f"    writes {stats['sent']} (retries {stats['retries']}), acked {stats['acked']}, "
+          f"rejected {stats['rejected']}, failed {stats['failed']}, left queued {stats['queued']}")
+    print(f"    vehicle: armed={vehicle.armed}, received {len(vehicle.commands_received)} commands")
+
+
+if __name__ == "__main__":
+    main()
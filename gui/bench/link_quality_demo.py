@@ -0,0 +1,71 @@
+"""Link statistics against a simulated vehicle that numbers and drops lines.
+
+The vehicle sends --rate ticks/s with a leading SEQ field and leaves out
+--line-drop of its lines. SerialReader's LinkStats is sampled once a
+second, as the status panel does, and the per-second rates, the
+measured loss and the injected loss are printed. Also times
+LinkStats.record_line, the per-line cost in the reader thread.
+
+    python bench/link_quality_demo.py [--seconds 5] [--rate 200] [--line-drop 0.02]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+from link_stats import LinkStats, rates
+from serial_reader import SerialReader
+from sim_vehicle import SimulatedVehicle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Link statistics demo")
+    parser.add_argument("--seconds", type=int, default=5)
+    parser.add_argument("--rate", type=float, default=200.0, help="ticks (attitude lines) per second")
+    parser.add_argument("--line-drop", type=float, default=0.02)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    vehicle = SimulatedVehicle(0, rate_hz=args.rate, seq_numbers=True, line_drop=args.line_drop)
+    reader = SerialReader(vehicle.port)
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")  # SerialReader prints every line
+    reader.start_reading()
+    vehicle.start()
+
+    samples = [reader.link_stats_snapshot()]
+    timer = QTimer()
+    timer.timeout.connect(lambda: samples.append(reader.link_stats_snapshot()))
+    timer.start(1000)
+    QTimer.singleShot(args.seconds * 1000 + 100, app.quit)
+    app.exec_()
+    vehicle.stop()
+    reader.stop()
+    sys.stdout = real_stdout
+
+    print(f"[LinkQualityDemo] {args.rate:.0f} ticks/s, {args.line_drop * 100:.1f}% of lines dropped by the vehicle")
+    for previous, current in zip(samples, samples[1:]):
+        rate = rates(previous, current)
+        kinds = " ".join(f"{kind} {count:.0f}" for kind, count in sorted(rate["kinds_per_s"].items()))
+        loss = "--" if rate["loss"] is None else f"{rate['loss'] * 100:.1f}%"
+        print(f"    {rate['bytes_per_s'] / 1000:6.1f} kB/s {rate['lines_per_s']:5.0f} lines/s  loss {loss:>6s}  {kinds}")
+    final = samples[-1]
+    measured = final["seq_lost"] / (final["seq_received"] + final["seq_lost"])
+    injected = vehicle.lines_dropped / (vehicle.lines_sent + vehicle.lines_dropped)
+    print(f"    total: {final['seq_received']} received, {final['seq_lost']} lost ({measured * 100:.2f}%), "
+          f"vehicle dropped {vehicle.lines_dropped} ({injected * 100:.2f}%), malformed {final['malformed']}")
+
+    stats = LinkStats()
+    line = "SEQ: 1234 | ROLL: 12.34 | PITCH: -5.67 | YAW: 123.45"
+    count = 100000
+    start = time.perf_counter()
+    for _ in range(count):
+        stats.record_line(line)
+    print(f"    record_line: {(time.perf_counter() - start) / count * 1e6:.2f} us per line")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Link drops and comes back: SerialReader reconnects with backoff.
+
+A TCP feeder (another process) streams attitude lines, but only starts
+listening after --late seconds, then cuts the connection mid-line every
+--drop-every seconds and is unreachable for --outage seconds. Prints the
+connection states as the reader reports them, how long each reconnect
+took once the feeder was back, and checks that no line was corrupted by
+joining the fragments from both sides of a drop.
+
+    python bench/reconnect_demo.py [--late 2] [--drops 3] [--drop-every 2] [--outage 1.5]
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import socket
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+from serial_reader import SerialReader
+
+LINE = re.compile(r"^ROLL: \d+\.\d\d \| PITCH: \d+\.\d\d \| YAW: \d+\.\d\d$")
+
+
+def _feeder(port, late, drops, drop_every, outage, back_times):
+    time.sleep(late)
+    i = 0
+    for _ in range(drops + 1):
+        server = socket.socket()
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(("127.0.0.1", port))
+        server.listen(1)
+        back_times.put(time.time())
+        conn, _ = server.accept()
+        server.close()
+        end = time.perf_counter() + drop_every
+        try:
+            while time.perf_counter() < end:
+                conn.sendall(f"ROLL: {i % 90:.2f} | PITCH: {i % 45:.2f} | YAW: {i % 360:.2f}\n".encode())
+                i += 1
+                time.sleep(0.002)
+            conn.sendall(b"ROLL: 12.")  # cut mid-line
+        except ConnectionError:
+            pass
+        conn.close()
+        time.sleep(outage)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconnect with backoff demo")
+    parser.add_argument("--late", type=float, default=2.0, help="seconds before the feeder first listens")
+    parser.add_argument("--drops", type=int, default=3)
+    parser.add_argument("--drop-every", type=float, default=2.0)
+    parser.add_argument("--outage", type=float, default=1.5)
+    args = parser.parse_args()
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    app = QCoreApplication(sys.argv[:1])
+    back_times = multiprocessing.Queue()
+    feeder = multiprocessing.Process(target=_feeder, args=(port, args.late, args.drops, args.drop_every,
+                                                           args.outage, back_times))
+    feeder.start()
+
+    reader = SerialReader(f"tcp://127.0.0.1:{port}")
+    start = time.time()
+    events = []
+    lines = {"good": 0, "bad": []}
+
+    def on_line(line):
+        if LINE.match(line):
+            lines["good"] += 1
+        else:
+            lines["bad"].append(line)
+
+    def on_state(state, detail):
+        events.append((time.time(), state, detail))
+
+    reader.data_received.connect(on_line)
+    reader.connection_state_changed.connect(on_state)
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")  # SerialReader prints every line
+    reader.start_reading()
+
+    total = args.late + (args.drops + 1) * (args.drop_every + args.outage) + 1
+    QTimer.singleShot(int(total * 1000), app.quit)
+    app.exec_()
+    reader.stop()
+    feeder.join()
+    sys.stdout = real_stdout
+
+    print(f"[ReconnectDemo] feeder up after {args.late:.1f} s, dropped {args.drops} times "
+          f"(outage {args.outage:.1f} s)")
+    for t, state, detail in events:
+        print(f"    {t - start:6.2f} s  {state:13s} {detail[:60]}")
+    ups = []
+    while not back_times.empty():
+        ups.append(back_times.get())
+    connects = [t for t, state, _ in events if state == "connected"]
+    for up in ups:
+        after = [t for t in connects if t >= up]
+        if after:
+            print(f"    feeder back at {up - start:6.2f} s -> lines again after {(after[0] - up) * 1000:5.0f} ms")
+    print(f"    {lines['good']} lines, {len(lines['bad'])} corrupted, reconnects {reader.reconnects}, "
+          f"discarded fragments {reader.discarded_fragments}")
+    for line in lines["bad"][:5]:
+        print(f"    corrupted: {line!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Stress test for PoseMailbox: a reader-side thread posts as fast as it can
+while the "render loop" takes at display rate (or flat out with --rate 0).
+
+Checks that every value taken is whole (never torn), strictly newer than the
+previous one, that the final value is the last one posted, and that the
+counters add up. Also reports the cost of a post() on the writer side.
+
+    python bench/stress_pose_mailbox.py [--seconds 5] [--rate 60] [--writers 1]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tabs.pose_mailbox import PoseMailbox
+
+
+def writer(mailbox, writer_id, stop, results, wakes):
+    seq = 0
+    start = time.perf_counter()
+    while not stop.is_set():
+        seq += 1
+        # Redundant fields let the reader detect a torn (half-updated) value
+        if mailbox.post((writer_id, seq, seq * 2, seq * 3, time.perf_counter())):
+            wakes[writer_id] += 1
+    results[writer_id] = (seq, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PoseMailbox stress test")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=60.0, help="reader takes per second (0 = flat out)")
+    parser.add_argument("--writers", type=int, default=1)
+    args = parser.parse_args()
+
+    mailbox = PoseMailbox()
+    stop = threading.Event()
+    results = {}
+    wakes = [0] * args.writers
+    threads = [threading.Thread(target=writer, args=(mailbox, i, stop, results, wakes))
+               for i in range(args.writers)]
+    for t in threads:
+        t.start()
+
+    last_seq = [0] * args.writers
+    takes = errors = 0
+    max_age_ms = 0.0
+    period = 1.0 / args.rate if args.rate > 0 else 0.0
+    deadline = time.perf_counter() + args.seconds
+    while time.perf_counter() < deadline:
+        value = mailbox.take()
+        if value is not None:
+            takes += 1
+            writer_id, seq, double, triple, posted_at = value
+            if double != seq * 2 or triple != seq * 3:
+                errors += 1
+                print(f"[Stress] Torn value: {value}")
+            if seq <= last_seq[writer_id]:
+                errors += 1
+                print(f"[Stress] Went back in time: writer {writer_id} {last_seq[writer_id]} -> {seq}")
+            last_seq[writer_id] = seq
+            max_age_ms = max(max_age_ms, (time.perf_counter() - posted_at) * 1000)
+        if period:
+            time.sleep(period)
+
+    stop.set()
+    for t in threads:
+        t.join()
+
+    final = mailbox.take()
+    if final is not None:
+        takes += 1
+        writer_id, seq = final[0], final[1]
+        if args.writers == 1 and seq != results[0][0]:
+            errors += 1
+            print(f"[Stress] Final value {seq} is not the last posted {results[0][0]}")
+    if mailbox.posted != mailbox.taken + mailbox.overwritten:
+        errors += 1
+        print(f"[Stress] Counters do not add up: {mailbox.posted} posted, "
+              f"{mailbox.taken} taken, {mailbox.overwritten} overwritten")
+
+    total_posts = sum(seq for seq, _ in results.values())
+    busy = sum(elapsed for _, elapsed in results.values())
+    print(f"[Stress] {args.writers} writer(s), {total_posts} posts, {takes} takes, "
+          f"{sum(wakes)} wake-ups, {mailbox.overwritten} overwritten")
+    print(f"[Stress] post() cost: {busy / total_posts * 1e9:.0f} ns, "
+          f"oldest value when taken: {max_age_ms:.2f} ms")
+    print(f"[Stress] {'PASS' if errors == 0 else f'FAIL ({errors} errors)'}")
+    return 0 if errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""Command uplink: GCS -> flight controller.
+
+Commands go out as text lines on the same link the telemetry comes in on:
+
+    CMD <seq> <NAME>[ <args>]       e.g. "CMD 17 SET_MODE Loiter"
+
+and the flight controller answers each one with ``ACK <seq>`` (or
+``ACK <seq> <result>`` for commands that return something, see
+parameters.py) or ``NACK <seq> <reason>`` among its telemetry lines.
+
+``CommandLink.send()`` only queues the command and returns its sequence
+number; a dedicated writer thread does the writing, so a slow or
+reconnecting link never blocks the GUI. The queue is ordered by priority
+(``URGENT`` arming/failsafe commands jump ahead of everything queued),
+at most ``MAX_IN_FLIGHT`` commands wait for their ACK at once (so the
+flight controller's receive buffer is never flooded) - except URGENT
+ones, which go out even when the window is full of parameter requests -
+and a command
+without an ACK after ``ACK_TIMEOUT`` is re-sent, up to ``MAX_ATTEMPTS``
+times in all.
+
+Setpoints sent faster than the link can take them coalesce: a command
+with the ``coalesce`` key of one not yet written replaces its arguments
+in place, and one that has been written is superseded (never re-sent). Only the newest value goes out.
+Merging in place needs the same command name and a priority no more
+urgent than the queued one's; otherwise the queued command is superseded
+as well and the new one is queued at its own priority.
+
+Results are reported with ``command_status(seq, name, status, detail)``;
+the detail of an ACK is its result, if it has one.
+"""
+import heapq
+import itertools
+import threading
+import time
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from transports import TransportError
+
+# Priorities (lower goes first)
+URGENT = 0    # arm/disarm, failsafe, RTL
+NORMAL = 1    # mode changes, calibration
+SETPOINT = 2  # streamed setpoints (usually coalesced)
+BULK = 3      # parameter transfers
+
+ACK_TIMEOUT = 0.3   # seconds to wait for an ACK before re-sending
+MAX_ATTEMPTS = 4    # sends per command before it counts as failed
+MAX_IN_FLIGHT = 16  # commands sent but not yet acknowledged (~500 bytes of the FC's receive buffer)
+SEQ_MODULO = 65536
+
+# command_status statuses
+SENT = "sent"
+ACKED = "acked"
+REJECTED = "rejected"        # NACK from the flight controller
+FAILED = "failed"            # no ACK after MAX_ATTEMPTS, or could not be written
+SUPERSEDED = "superseded"    # replaced by a newer command with the same coalesce key
+
+
+class _Command:
+    __slots__ = ("seq", "name", "args", "priority", "order", "coalesce", "ack",
+                 "attempts", "deadline")
+
+    def __init__(self, seq, name, args, priority, order, coalesce, ack):
+        self.seq = seq
+        self.name = name
+        self.args = args
+        self.priority = priority
+        self.order = order
+        self.coalesce = coalesce
+        self.ack = ack
+        self.attempts = 0
+        self.deadline = None
+
+    def encoded(self):
+        text = f"CMD {self.seq} {self.name} {self.args}" if self.args else f"CMD {self.seq} {self.name}"
+        return text.encode() + b"\n"
+
+
+class CommandLink(QObject):
+    """Queued, acknowledged command writer for one vehicle link."""
+    command_status = pyqtSignal(int, str, str, str)  # seq, command name, status, detail
+
+    def __init__(self, reader, max_in_flight=MAX_IN_FLIGHT, parent=None):
+        super().__init__(parent)
+        self.reader = reader  # SerialReader: writes go to its current transport
+        self.max_in_flight = max_in_flight
+        self.running = False
+        self.thread = None
+        self.condition = threading.Condition()
+        self.heap = []          # (priority, order, seq) of commands waiting to be written
+        self.commands = {}      # seq -> _Command, queued or in flight
+        self.in_flight = {}     # seq -> _Command written and waiting for its ACK
+        self.coalescing = {}    # coalesce key -> seq of its newest command
+        self._order = itertools.count()
+        self._next_seq = 0
+        self.counts = {"sent": 0, "retries": 0, "acked": 0, "rejected": 0,
+                       "failed": 0, "coalesced": 0, "superseded": 0}
+
+        # ACKs are matched in the reader thread, without a trip through the GUI event loop
+        reader.data_received.connect(self.handle_line, Qt.DirectConnection)
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.write_loop, daemon=True, name="CommandLink")
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    # ───────────── Queueing ─────────────
+    def send(self, name, args="", priority=NORMAL, coalesce=None, ack=True):
+        """Queue a command and return its sequence number (thread-safe).
+
+        ``coalesce``: key of a setpoint stream; a newer command with the same
+        key replaces an older one that has not been acknowledged yet (see the
+        module docstring for when it merges into it).
+        ``ack=False`` sends once without waiting for an acknowledgement.
+        """
+        superseded = None
+        with self.condition:
+            if coalesce is not None and coalesce in self.coalescing:
+                older = self.commands.get(self.coalescing[coalesce])
+                if (older is not None and older.attempts == 0 and older.name == name
+                        and priority >= older.priority):
+                    older.args = args  # not sent yet: keep its place, send the new value
+                    self.counts["coalesced"] += 1
+                    return older.seq
+                if older is not None:
+                    # Sent (no point re-sending the stale value), or a different command
+                    self.forget(older)
+                    self.counts["superseded"] += 1
+                    superseded = older
+
+            seq = self._next_seq
+            self._next_seq = (self._next_seq + 1) % SEQ_MODULO
+            command = _Command(seq, name, args, priority, next(self._order), coalesce, ack)
+            self.commands[seq] = command
+            if coalesce is not None:
+                self.coalescing[coalesce] = seq
+            heapq.heappush(self.heap, (priority, command.order, seq))
+            self.condition.notify()
+        if superseded:
+            self.command_status.emit(superseded.seq, superseded.name, SUPERSEDED, f"by {seq}")
+        return seq
+
+    def handle_line(self, line):
+        """Match ``ACK <seq>`` / ``NACK <seq> <reason>`` lines (called in the reader thread)."""
+        if not line.startswith(("ACK ", "NACK ")):
+            return
+        parts = line.split(None, 2)
+        try:
+            seq = int(parts[1])
+        except (IndexError, ValueError):
+            return
+        with self.condition:
+            command = self.commands.get(seq)
+            if command is None or command.attempts == 0:
+                return  # duplicate ACK of a retried command, or one we gave up on or superseded
+            self.forget(command)
+            self.counts["acked" if parts[0] == "ACK" else "rejected"] += 1
+            self.condition.notify()  # a window slot is free
+        if parts[0] == "ACK":
+            result = parts[2] if len(parts) > 2 else f"{command.attempts} attempt(s)"
+            self.command_status.emit(seq, command.name, ACKED, result)
+        else:
+            self.command_status.emit(seq, command.name, REJECTED, parts[2] if len(parts) > 2 else "")
+
+    def forget(self, command):
+        self.commands.pop(command.seq, None)
+        self.in_flight.pop(command.seq, None)
+        if command.coalesce is not None and self.coalescing.get(command.coalesce) == command.seq:
+            del self.coalescing[command.coalesce]
+
+    # ───────────── Writer Thread ─────────────
+    def write_loop(self):
+        while True:
+            with self.condition:
+                command, failed = self.next_command()
+                data = command.encoded() if command else None
+            for expired in failed:
+                self.command_status.emit(expired.seq, expired.name, FAILED, "no ACK")
+            if command is None:
+                if not self.running:
+                    break
+                continue
+
+            try:
+                self.reader.write(data)
+            except TransportError as e:
+                if not command.ack:
+                    with self.condition:
+                        self.counts["failed"] += 1
+                    self.command_status.emit(command.seq, command.name, FAILED, str(e))
+                continue  # acknowledged commands are retried when their ACK times out
+            with self.condition:
+                self.counts["sent"] += 1
+                if command.attempts > 1:
+                    self.counts["retries"] += 1
+            self.command_status.emit(command.seq, command.name, SENT, f"attempt {command.attempts}")
+        print("[CommandLink] Writer stopped")
+
+    def next_command(self):
+        """Wait (holding the condition) for the next command to write.
+
+        Returns ``(command, failed)``; failed lists the commands that ran out
+        of attempts meanwhile, and command is None when stopping or when
+        only failures are to be reported.
+        """
+        failed = []
+        while self.running:
+            now = time.monotonic()
+            next_deadline = None
+            for command in list(self.in_flight.values()):
+                if command.deadline > now:
+                    if next_deadline is None or command.deadline < next_deadline:
+                        next_deadline = command.deadline
+                elif command.attempts >= MAX_ATTEMPTS:
+                    self.forget(command)
+                    self.counts["failed"] += 1
+                    failed.append(command)
+                else:
+                    del self.in_flight[command.seq]  # ACK timed out: back in the queue, at its priority
+                    heapq.heappush(self.heap, (command.priority, command.order, command.seq))
+
+            # URGENT commands are sorted first and bypass the in-flight window
+            while self.heap and (len(self.in_flight) < self.max_in_flight or self.heap[0][0] == URGENT):
+                _, _, seq = heapq.heappop(self.heap)
+                command = self.commands.get(seq)
+                if command is None or seq in self.in_flight:
+                    continue  # superseded while queued
+                command.attempts += 1
+                if command.ack:
+                    self.in_flight[seq] = command
+                    command.deadline = now + ACK_TIMEOUT
+                else:
+                    self.forget(command)
+                return command, failed
+
+            if failed:
+                return None, failed
+            self.condition.wait(None if next_deadline is None else next_deadline - now)
+        return None, failed
+
+    def stats(self):
+        with self.condition:
+            return dict(self.counts, queued=len(self.commands) - len(self.in_flight), in_flight=len(self.in_flight))
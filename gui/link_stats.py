@@ -0,0 +1,114 @@
+"""Link-quality counters, kept by each SerialReader.
+
+Everything is a plain counter bumped in the reader thread for each line
+(no locks, no timestamps per line), so it costs a few microseconds per
+line. A display samples ``snapshot()`` once or twice a second and turns
+two snapshots into rates with ``rates()``:
+
+* bytes/s and lines/s, and lines/s per message kind (telemetry.MESSAGE_KINDS)
+* malformed lines: framing errors (bytes that are not text) and lines
+  without a single ``KEY: value`` field
+* parse errors the tabs report for lines they could not use
+* loss from gaps in a leading ``SEQ: <n> |`` field, when the flight
+  controller numbers its lines (0-65535, wrapping)
+"""
+import time
+from telemetry import message_kind
+
+SEQ_MODULO = 65536
+SEQ_MAX_GAP = 1000  # a bigger jump is a flight-controller restart, not loss
+
+
+class LinkStats:
+    def __init__(self):
+        self.bytes = 0
+        self.lines = 0
+        self.kinds = {}           # message kind -> lines
+        self.malformed = 0
+        self.framing_errors = 0
+        self.parse_errors = {}    # reporting tab -> count
+        self.seq_received = 0
+        self.seq_lost = 0
+        self.seq_resets = 0
+        self.last_seq = None
+
+    def record_line(self, line, framing_error=False):
+        """Count one received line (reader thread)."""
+        self.lines += 1
+        if line.startswith(("ACK ", "NACK ")):
+            kind = "ACK"  # command uplink replies (command_link.py)
+        else:
+            kind = message_kind(line)
+            if framing_error or ":" not in line:
+                self.malformed += 1
+        self.kinds[kind] = self.kinds.get(kind, 0) + 1
+        if framing_error:
+            self.framing_errors += 1
+        if line.startswith("SEQ:"):
+            self.record_seq(line)
+
+    def record_seq(self, line):
+        try:
+            seq = int(line[4:].split("|", 1)[0])
+        except ValueError:
+            self.malformed += 1
+            return
+        self.seq_received += 1
+        if self.last_seq is not None:
+            gap = (seq - self.last_seq - 1) % SEQ_MODULO
+            if gap > SEQ_MAX_GAP:
+                self.seq_resets += 1
+            else:
+                self.seq_lost += gap
+        self.last_seq = seq
+
+    def record_parse_error(self, source):
+        """A tab could not use a line (GUI thread)."""
+        self.parse_errors[source] = self.parse_errors.get(source, 0) + 1
+
+    def snapshot(self):
+        return {
+            "time": time.monotonic(),
+            "bytes": self.bytes,
+            "lines": self.lines,
+            "kinds": dict(self.kinds),
+            "malformed": self.malformed,
+            "framing_errors": self.framing_errors,
+            "parse_errors": dict(self.parse_errors),
+            "seq_received": self.seq_received,
+            "seq_lost": self.seq_lost,
+            "seq_resets": self.seq_resets,
+        }
+
+
+def report_parse_error(reader, source):
+    """Count a line the ``source`` tab could not use, if ``reader`` keeps link statistics."""
+    if hasattr(reader, "report_parse_error"):
+        reader.report_parse_error(source)
+
+
+def combine(snapshots):
+    """Sum the snapshots of several links (aggregated view)."""
+    total = {"time": time.monotonic(), "kinds": {}, "parse_errors": {}}
+    for snapshot in snapshots:
+        for key, value in snapshot.items():
+            if isinstance(value, dict):
+                for name, count in value.items():
+                    total[key][name] = total[key].get(name, 0) + count
+            elif key != "time":
+                total[key] = total.get(key, 0) + value
+    return total
+
+
+def rates(previous, current):
+    """Per-second rates between two snapshots, plus the loss over that interval."""
+    elapsed = max(current["time"] - previous["time"], 1e-6)
+    received = current.get("seq_received", 0) - previous.get("seq_received", 0)
+    lost = current.get("seq_lost", 0) - previous.get("seq_lost", 0)
+    return {
+        "bytes_per_s": (current.get("bytes", 0) - previous.get("bytes", 0)) / elapsed,
+        "lines_per_s": (current.get("lines", 0) - previous.get("lines", 0)) / elapsed,
+        "kinds_per_s": {kind: (count - previous["kinds"].get(kind, 0)) / elapsed
+                        for kind, count in current["kinds"].items()},
+        "loss": lost / (received + lost) if received + lost else None,  # None: no SEQ numbers
+    }
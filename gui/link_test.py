@@ -0,0 +1,159 @@
+"""Throughput test for a telemetry link at one or more baud rates.
+
+For each baud rate the link is read through SerialReader (exactly as the
+GCS reads it) for a few seconds, and the test reports:
+
+* sustained bytes/s and lines/s, and the share of the baud rate used
+* framing errors: lines holding bytes that are not text (counted by
+  SerialReader), and malformed lines - not printable ASCII or without a
+  single ``KEY: value`` field. A wrong baud rate or a marginal cable
+  produces both
+* CPU used by the reader thread
+
+Against a board, the firmware must stream at every tested rate:
+
+    python link_test.py --port /dev/ttyUSB0 --bauds 921600
+
+Without hardware, ``--sim`` streams simulated telemetry through a
+pseudo-terminal at ``--load`` of each baud rate's byte rate (optionally
+corrupting a fraction of the lines to check the error count):
+
+    python link_test.py --sim [--bauds 115200,921600,2000000] [--load 0.9] [--corrupt 0.001]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+from telemetry import parse_fields
+
+DEFAULT_BAUDS = "115200,921600,2000000"
+
+
+def is_well_formed(line):
+    """False for lines a framing error (or a baud mismatch) would produce."""
+    if not all(" " <= ch <= "~" for ch in line):
+        return False
+    return bool(parse_fields(line))
+
+
+# ───────────── Simulated Source ─────────────
+def _feed(vehicle, baudrate, load, stop, corrupt, corrupted_count):
+    """Write the vehicle's telemetry to its pty at ``load`` of the baud rate's byte rate, until ``stop`` is set."""
+    os.set_blocking(vehicle.master_fd, False)  # never hang on a full pty once the reader has stopped
+    rng = random.Random(1)
+    bytes_per_second = baudrate / 10 * load
+    ticks = vehicle.generate_lines()
+    pending = b""
+    start = time.perf_counter()
+    sent = 0
+    corrupted = 0
+    while not stop.is_set():
+        elapsed = time.perf_counter() - start
+        due = int(elapsed * bytes_per_second) - sent
+        while len(pending) < due:
+            for line in next(ticks):
+                data = bytearray(line.encode() + b"\n")
+                if corrupt and rng.random() < corrupt:
+                    data[rng.randrange(len(data) - 1)] = rng.randrange(128, 256)  # flipped high bit
+                    corrupted += 1
+                pending += bytes(data)
+        if due > 0:
+            try:
+                os.write(vehicle.master_fd, pending[:due])
+            except BlockingIOError:
+                pass  # pty full: the bytes are lost, like a UART overrun
+            pending = pending[due:]
+            sent += due
+        time.sleep(0.001)
+    corrupted_count.value = corrupted
+
+
+# ───────────── Test ─────────────
+def measure(app, port, baudrate, seconds):
+    """Read ``port`` at ``baudrate`` for ``seconds`` through SerialReader and return the stats."""
+    from PyQt5.QtCore import QTimer
+    from serial_reader import SerialReader
+
+    reader = SerialReader(port, baudrate)
+    counts = {"lines": 0, "malformed": 0}
+
+    def on_line(line):
+        counts["lines"] += 1
+        if not is_well_formed(line):
+            counts["malformed"] += 1
+
+    reader.data_received.connect(on_line)
+    reader.start_reading()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    wall_start = time.perf_counter()
+    app.exec_()
+    wall = time.perf_counter() - wall_start
+    reader.stop()
+
+    bytes_per_second = reader.bytes_received / wall
+    return {
+        "baudrate": baudrate,
+        "bytes_per_s": bytes_per_second,
+        "utilisation": bytes_per_second * 10 / baudrate,
+        "lines_per_s": counts["lines"] / wall,
+        "lines": counts["lines"],
+        "malformed": counts["malformed"],
+        "framing_errors": reader.framing_errors,
+        "error_rate": (reader.framing_errors + counts["malformed"]) / counts["lines"] if counts["lines"] else 0.0,
+        "reader_cpu": reader.thread_cpu / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry link throughput test")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--port", help="serial port of the board (connection string)")
+    source.add_argument("--sim", action="store_true", help="simulated telemetry through a pty")
+    parser.add_argument("--bauds", default=DEFAULT_BAUDS, help="comma-separated baud rates")
+    parser.add_argument("--seconds", type=float, default=5.0, help="per baud rate")
+    parser.add_argument("--load", type=float, default=0.9, help="--sim: fraction of the baud rate sent")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="--sim: fraction of lines corrupted")
+    args = parser.parse_args()
+
+    from PyQt5.QtCore import QCoreApplication
+    app = QCoreApplication(sys.argv[:1])
+    bauds = [int(b) for b in args.bauds.split(",")]
+    real_stdout = sys.stdout
+    results = []
+    for baudrate in bauds:
+        feeder = vehicle = None
+        corrupted = multiprocessing.Value("i", 0)
+        stop = multiprocessing.Event()
+        port = args.port
+        if args.sim:
+            from sim_vehicle import SimulatedVehicle
+            vehicle = SimulatedVehicle(0)  # only its pty and line generator are used
+            port = vehicle.port
+            feeder = multiprocessing.Process(target=_feed, args=(vehicle, baudrate, args.load, stop,
+                                                                 args.corrupt, corrupted))
+            feeder.start()
+        sys.stdout = open(os.devnull, "w")  # SerialReader prints every line
+        result = measure(app, port, baudrate, args.seconds)
+        sys.stdout = real_stdout
+        if feeder:
+            stop.set()
+            feeder.join()
+            vehicle.stop()
+            result["injected"] = corrupted.value
+        results.append(result)
+
+    print(f"[LinkTest] {'sim pty' if args.sim else args.port}, {args.seconds:.0f} s per rate")
+    print(f"    {'baud':>8s} {'bytes/s':>9s} {'used':>6s} {'lines/s':>8s} {'framing':>8s} {'malformed':>10s} "
+          f"{'error rate':>11s} {'reader CPU':>11s}")
+    for r in results:
+        print(f"    {r['baudrate']:8d} {r['bytes_per_s']:9.0f} {r['utilisation'] * 100:5.0f}% "
+              f"{r['lines_per_s']:8.0f} {r['framing_errors']:8d} {r['malformed']:10d} "
+              f"{r['error_rate'] * 100:10.3f}% {r['reader_cpu'] * 100:10.1f}%")
+        if "injected" in r:
+            print(f"    {'':8s} (sim corrupted {r['injected']} lines)")
+
+
+if __name__ == "__main__":
+    main()
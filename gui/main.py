@@ -1,20 +1,42 @@
+import time
+STARTUP_T0 = time.perf_counter()
+
 import sys
 import os
+import argparse
+from startup_profiler import StartupProfiler, watch_first_paint
+# Set up before the Qt imports so they show up in the import timings
+PROFILER = StartupProfiler.from_argv(sys.argv, t0=STARTUP_T0)
+
 os.environ["QTWEBENGINE_DISABLE_SANDBOX"] = "1"
 os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--disk-cache-dir=C:/Temp/QtCache"
 
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget
-from PyQt5.QtCore import QThread
-from tabs.flight_data_tab import FlightDataTab
-from tabs.flight_modes_tab import FlightModesTab
-from tabs.orientation_3d_tab import Orientation3DTab
-from tabs.radio_calibration_tab import RadioCalibrationTab
-from tabs.gps_map_tab import GPSMapTab
-from tabs.telemetry_tab import TelemetryTab
-from serial_reader import SerialReader
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QComboBox
+from PyQt5.QtCore import QTimer, Qt
+from tabs.lazy_tab import LazyTab
+from serial_reader import CONNECTED, NO_DATA
+from vehicle_links import LinkManager, ActiveVehicleStream, ALL_VEHICLES
+
+# ───────────── Tab Registry ─────────────
+# Tabs are imported and built on first activation (see LazyTab), so folium,
+# QtWebEngine, PyOpenGL and the 3D model stay out of the startup path.
+# (attribute, title, module, class, warm up in the background after startup)
+# Flight Data must exist for the Radio tab to get PPM lines, and the GPS map
+# warms up so the flight track is recorded even if it is never opened.
+TAB_REGISTRY = [
+    ("flight_data_tab", "Flight Data", "tabs.flight_data_tab", "FlightDataTab", True),
+    ("flight_modes_tab", "Flight Modes", "tabs.flight_modes_tab", "FlightModesTab", False),
+    ("radio_tab", "Radio Calibration", "tabs.radio_calibration_tab", "RadioCalibrationTab", False),
+    ("gps_map_tab", "GPS Map", "tabs.gps_map_tab", "GPSMapTab", True),
+    ("orientation_3d_tab", "3D Orientation", "tabs.orientation_3d_tab", "Orientation3DTab", False),
+    ("telemetry_tab", "Telemetry", "tabs.telemetry_tab", "TelemetryTab", False),
+]
+
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, eager_tabs=False, warm_up_delay_ms=3000, links=None, sim_vehicles=0, sim_rate=100.0,
+                 serve_ports=None, serve_host="0.0.0.0", baudrate=115200, shm_ring=None,
+                 acquisition_process=False):
         super().__init__()
         self.setWindowTitle("Custom Ground Control Station")
         self.setGeometry(100, 100, 1200, 800)
@@ -48,47 +70,144 @@ class MainWindow(QMainWindow):
             }
         """)
 
-        # ───────────── Serial Reader Setup ─────────────
-        self.serial_thread = QThread()
-        self.serial_reader = SerialReader()
-        self.serial_reader.moveToThread(self.serial_thread)
-        self.serial_thread.started.connect(self.serial_reader.start_reading)
-        self.serial_thread.start()
+        # ───────────── Vehicle Links ─────────────
+        # One reader thread per link. Tabs get serial_reader, which forwards the
+        # lines of the vehicle picked in the selector (or of all vehicles).
+        self.link_manager = LinkManager(self)
+        self.serial_reader = ActiveVehicleStream(self.link_manager, self)
+        self.vehicle_selector = QComboBox()
+        self.vehicle_selector.addItem("All vehicles", ALL_VEHICLES)
+        self.vehicle_selector.currentIndexChanged.connect(self.select_vehicle)
+        self.tabs.setCornerWidget(self.vehicle_selector, Qt.TopRightCorner)
+        self.link_manager.link_added.connect(self.on_link_added)
+        self.link_manager.link_removed.connect(self.on_link_removed)
+        self.link_manager.link_state_changed.connect(self.on_link_state_changed)
+        self.serial_reader.active_vehicle_changed.connect(self.on_active_vehicle_changed)
+
+        # ───────────── Telemetry Server ─────────────
+        # Re-broadcasts every vehicle's lines to secondary ground stations
+        self.telemetry_server = None
+        if serve_ports and any(port is not None for port in serve_ports.values()):
+            from telemetry_server import TelemetryServer
+            self.telemetry_server = TelemetryServer(serve_host, **serve_ports)
+            try:
+                self.telemetry_server.start()
+            except OSError as e:
+                print(f"[MainWindow] Telemetry server not started: {e}")
+                self.telemetry_server = None
+
+        # ───────────── Shared-Memory Ring ─────────────
+        # Decoded records of every vehicle for analysis processes (telemetry_ring.py)
+        self.telemetry_ring = None
+        if shm_ring:
+            from telemetry_ring import TelemetryRing
+            try:
+                self.telemetry_ring = TelemetryRing(shm_ring)
+            except OSError as e:
+                print(f"[MainWindow] Telemetry ring not created: {e}")
+            # Each link publishes from its reader thread, or from its acquisition process
+            self.link_manager.telemetry_ring = self.telemetry_ring
+
+        self.sim_process = None
+        ports = list(links or [])
+        if sim_vehicles:
+            from sim_vehicle import spawn_vehicles
+            self.sim_process, sim_ports = spawn_vehicles(sim_vehicles, sim_rate)
+            ports += sim_ports
+        # Only construction: the port auto-detect and connect run later, in the reader
+        # threads; report_startup marks when the first port is open
+        with PROFILER.section("link_setup"):
+            for port in ports or [None]:
+                self.link_manager.add_link(port, baudrate, separate_process=acquisition_process)
 
         # ───────────── Create Tabs ─────────────
-        self.flight_data_tab = FlightDataTab(serial_reader=self.serial_reader)
-        self.flight_modes_tab = FlightModesTab(serial_reader=self.serial_reader)
-        self.radio_tab = RadioCalibrationTab(serial_reader=self.serial_reader)
-        self.gps_map_tab = GPSMapTab()
-
-        # 3D Model Assets
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        obj_path = os.path.join(base_dir, "assets", "F450 Quadcopter Frame with Pixhawk 2.4.8 Flight Controller.obj")
-        mtl_path = os.path.join(base_dir, "assets", "F450 Quadcopter Frame with Pixhawk 2.4.8 Flight Controller.mtl")
-
-        if os.path.exists(obj_path):
-            print(f"✅ OBJ file found: {obj_path}")
-        else:
-            print(f"❌ OBJ file NOT found: {obj_path}")
+        self.lazy_tabs = {}
+        for attr, title, module_name, class_name, _ in TAB_REGISTRY:
+            setattr(self, attr, None)  # set once the tab is actually built
+            lazy_tab = LazyTab(module_name, class_name, lambda attr=attr: self.tab_kwargs(attr))
+            lazy_tab.created.connect(lambda widget, attr=attr: setattr(self, attr, widget))
+            lazy_tab.created.connect(lambda _, lazy_tab=lazy_tab:
+                                     PROFILER.record_tab(lazy_tab.class_name, lazy_tab.build_ms))
+            self.lazy_tabs[attr] = lazy_tab
+            self.tabs.addTab(lazy_tab, title)
 
-        if os.path.exists(mtl_path):
-            print(f"✅ MTL file found: {mtl_path}")
+        if eager_tabs:
+            # Old behaviour, kept for startup comparisons (bench/bench_startup.py)
+            for lazy_tab in self.lazy_tabs.values():
+                lazy_tab.ensure_created()
         else:
-            print(f"❌ MTL file NOT found: {mtl_path}")
+            self.warm_up_queue = [self.lazy_tabs[attr] for attr, *_, warm in TAB_REGISTRY if warm]
+            QTimer.singleShot(warm_up_delay_ms, self.warm_up_next_tab)
 
-        self.orientation_3d_tab = Orientation3DTab(obj_path, mtl_path, serial_reader=self.serial_reader)
-        self.telemetry_tab = TelemetryTab(serial_reader=self.serial_reader)
+        # Debugging: print relevant incoming lines
+        for kind in ("ATTITUDE", "RC"):
+            self.serial_reader.bus.subscribe(kind, self.debug_serial_data)
 
-        # ───────────── Add Tabs to QTabWidget ─────────────
-        self.tabs.addTab(self.flight_data_tab, "Flight Data")
-        self.tabs.addTab(self.flight_modes_tab, "Flight Modes")
-        self.tabs.addTab(self.radio_tab, "Radio Calibration")
-        self.tabs.addTab(self.gps_map_tab, "GPS Map")
-        self.tabs.addTab(self.orientation_3d_tab, "3D Orientation")
-        self.tabs.addTab(self.telemetry_tab, "Telemetry")
+    def tab_kwargs(self, attr):
+        """Constructor arguments for a registry tab."""
+        if attr == "orientation_3d_tab":
+            # 3D Model Assets
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            obj_path = os.path.join(base_dir, "assets", "F450 Quadcopter Frame with Pixhawk 2.4.8 Flight Controller.obj")
+            mtl_path = os.path.join(base_dir, "assets", "F450 Quadcopter Frame with Pixhawk 2.4.8 Flight Controller.mtl")
 
-        # Debugging: print relevant incoming lines
-        self.serial_reader.data_received.connect(self.debug_serial_data)
+            if os.path.exists(obj_path):
+                print(f"✅ OBJ file found: {obj_path}")
+            else:
+                print(f"❌ OBJ file NOT found: {obj_path}")
+
+            if os.path.exists(mtl_path):
+                print(f"✅ MTL file found: {mtl_path}")
+            else:
+                print(f"❌ MTL file NOT found: {mtl_path}")
+
+            return {"obj_path": obj_path, "mtl_path": mtl_path, "serial_reader": self.serial_reader}
+        return {"serial_reader": self.serial_reader}
+
+    def warm_up_next_tab(self):
+        """Build one background tab per event-loop turn so the UI stays responsive."""
+        while self.warm_up_queue:
+            lazy_tab = self.warm_up_queue.pop(0)
+            if not lazy_tab.is_created:
+                lazy_tab.ensure_created()
+                break
+        if self.warm_up_queue:
+            QTimer.singleShot(0, self.warm_up_next_tab)
+
+    # ───────────── Vehicle Selection ─────────────
+    def on_link_added(self, vehicle_id):
+        link = self.link_manager.link(vehicle_id)
+        self.vehicle_selector.addItem(self.link_label(link), vehicle_id)
+        if self.telemetry_server:
+            # Direct connection: published from the reader thread, independent of GUI load
+            link.reader.data_received.connect(
+                lambda line, vehicle_id=vehicle_id: self.telemetry_server.publish(line, vehicle_id),
+                Qt.DirectConnection)
+        self.on_active_vehicle_changed(self.serial_reader.active_vehicle)
+
+    def link_label(self, link):
+        return f"{link.name} ({link.port or 'searching...'})"
+
+    def on_link_state_changed(self, vehicle_id, state, detail):
+        index = self.vehicle_selector.findData(vehicle_id)
+        link = self.link_manager.link(vehicle_id)
+        if index >= 0 and link:
+            self.vehicle_selector.setItemText(index, self.link_label(link))
+
+    def on_link_removed(self, vehicle_id):
+        index = self.vehicle_selector.findData(vehicle_id)
+        if index >= 0:
+            self.vehicle_selector.removeItem(index)
+
+    def select_vehicle(self, index):
+        self.serial_reader.set_active_vehicle(self.vehicle_selector.itemData(index))
+
+    def on_active_vehicle_changed(self, vehicle_id):
+        index = self.vehicle_selector.findData(vehicle_id)
+        if index >= 0 and index != self.vehicle_selector.currentIndex():
+            self.vehicle_selector.blockSignals(True)
+            self.vehicle_selector.setCurrentIndex(index)
+            self.vehicle_selector.blockSignals(False)
 
     def debug_serial_data(self, line):
         """Quick filter for debugging data flow to GUI."""
@@ -96,17 +215,80 @@ class MainWindow(QMainWindow):
             print(f"🎯 [MainWindow] Serial Data: {line}")
 
     def closeEvent(self, event):
-        print("[MainWindow] Stopping SerialReader...")
-        if hasattr(self.serial_reader, 'stop'):
-            self.serial_reader.stop()
-        if hasattr(self.serial_thread, 'quit'):
-            self.serial_thread.quit()
-            self.serial_thread.wait()
+        if self.gps_map_tab:
+            self.gps_map_tab.shutdown()
+        print("[MainWindow] Stopping vehicle links...")
+        # Joins the reader threads, or stops and joins the acquisition processes
+        self.link_manager.stop_all()
+        if self.telemetry_server:
+            self.telemetry_server.stop()
+        if self.telemetry_ring:
+            self.telemetry_ring.close()
+        if self.sim_process:
+            self.sim_process.terminate()
+            self.sim_process.wait()
         event.accept()
 
 
+def report_startup(window, exit_after_startup=False):
+    """Print time to first paint, and to the first telemetry line once it arrives."""
+    print(f"[MainWindow] Window shown after {PROFILER.mark('first_paint'):.0f} ms")
+
+    def first_line(_line):
+        window.serial_reader.data_received.disconnect(first_line)
+        print(f"[MainWindow] First telemetry after {PROFILER.mark('first_telemetry'):.0f} ms")
+
+    def connected(state, _detail):
+        if state in (CONNECTED, NO_DATA):  # the port is open (found, if auto-detected)
+            window.serial_reader.connection_state_changed.disconnect(connected)
+            print(f"[MainWindow] Link open after {PROFILER.mark('link_opened'):.0f} ms")
+
+    window.serial_reader.data_received.connect(first_line)
+    window.serial_reader.connection_state_changed.connect(connected)
+    if exit_after_startup:
+        window.close()
+        QApplication.instance().quit()
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Custom Ground Control Station")
+    parser.add_argument("--eager-tabs", action="store_true",
+                        help="build every tab at startup instead of on first activation")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="quit as soon as the window has been painted (startup timing)")
+    parser.add_argument("--link", action="append", metavar="CONNECTION",
+                        help="serial port or udp://:PORT, tcp://HOST:PORT, file://LOG?rate=N of a vehicle; "
+                             "repeat for several vehicles (default: auto-detect one serial port)")
+    parser.add_argument("--baud", type=int, default=115200,
+                        help="serial baud rate, e.g. 921600 or 2000000 for a high-baud link "
+                             "(check it with link_test.py first)")
+    parser.add_argument("--acquisition-process", action="store_true",
+                        help="read and frame each link in a child process, away from the GUI's GIL "
+                             "(for high baud rates)")
+    parser.add_argument("--sim-vehicles", type=int, default=0, metavar="N",
+                        help="also start N simulated vehicles on pseudo-terminals (POSIX)")
+    parser.add_argument("--sim-rate", type=float, default=100.0,
+                        help="attitude lines per second per simulated vehicle")
+    parser.add_argument("--serve-tcp", type=int, metavar="PORT",
+                        help="re-broadcast telemetry to TCP clients (newline-delimited lines)")
+    parser.add_argument("--serve-udp", type=int, metavar="PORT",
+                        help="re-broadcast telemetry to UDP subscribers")
+    parser.add_argument("--serve-ws", type=int, metavar="PORT",
+                        help="re-broadcast telemetry to WebSocket clients (JSON)")
+    parser.add_argument("--serve-host", default="0.0.0.0",
+                        help="address the telemetry server listens on")
+    parser.add_argument("--shm-ring", nargs="?", const="stm_fc_telemetry", metavar="NAME",
+                        help="publish decoded telemetry in shared memory for analysis processes "
+                             "(telemetry_ring.RingReader)")
+    parser.add_argument("--profile-startup", metavar="REPORT_JSON",
+                        help="write a startup timing report (also $GCS_PROFILE_STARTUP)")
+    args, qt_args = parser.parse_known_args()
+
+    # Lets QtWebEngine be imported lazily, after the QApplication exists
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv[:1] + qt_args)
+    PROFILER.mark("qapplication")
+    app.aboutToQuit.connect(PROFILER.write_report)
 
     app.setStyleSheet("""
         QWidget {
@@ -160,6 +342,13 @@ if __name__ == "__main__":
         }
     """)
 
-    window = MainWindow()
+    window = MainWindow(eager_tabs=args.eager_tabs, links=args.link,
+                        sim_vehicles=args.sim_vehicles, sim_rate=args.sim_rate,
+                        serve_ports={"tcp_port": args.serve_tcp, "udp_port": args.serve_udp,
+                                     "ws_port": args.serve_ws},
+                        serve_host=args.serve_host, baudrate=args.baud, shm_ring=args.shm_ring,
+                        acquisition_process=args.acquisition_process)
+    PROFILER.mark("window_constructed")
+    watch_first_paint(window, lambda: report_startup(window, args.exit_after_startup))
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,255 @@
+"""Flight-controller parameters: pipelined download, local cache, diff sync.
+
+Parameters travel as commands on the uplink (command_link.py); the
+flight controller puts the result in its ACK:
+
+    CMD <seq> PARAM_INFO                 ACK <seq> <count> <hash>
+    CMD <seq> PARAM_GET <index>          ACK <seq> <index> <name> <value>
+    CMD <seq> PARAM_SET <name> <value>   ACK <seq> <name> <stored value>
+    CMD <seq> PARAM_SAVE                 ACK <seq>            (write to flash)
+
+``download()`` asks for PARAM_INFO and then queues a PARAM_GET for every
+index at once. CommandLink keeps a window of requests in flight and
+re-sends lost ones, so the transfer takes about count / window round
+trips instead of one round trip per parameter. ``<hash>`` is
+``parameter_hash()`` of the whole table: when it matches the cache the
+download is skipped, and an interrupted download only asks for the
+indices still missing.
+
+Edits go to the local cache (``set_value``) and are marked dirty until
+``sync()`` writes exactly the dirty ones and the flight controller
+confirms the stored value. ``load_file()`` marks what differs from a
+saved parameter file as dirty, so syncing a file only sends the diff.
+"""
+import threading
+import zlib
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from command_link import BULK, ACKED, REJECTED, FAILED
+
+
+def format_value(value):
+    """Wire format of a parameter value (float32 precision, like the firmware)."""
+    return f"{float(value):.7g}"
+
+
+def parameter_hash(items):
+    """CRC32 of ``(name, value)`` pairs in index order, as 8 hex digits."""
+    crc = 0
+    for name, value in items:
+        crc = zlib.crc32(f"{name}={format_value(value)}\n".encode(), crc)
+    return f"{crc:08x}"
+
+
+class ParameterManager(QObject):
+    """Parameter cache and transfers of one vehicle."""
+    progress = pyqtSignal(int, int)               # parameters received, total
+    download_finished = pyqtSignal(bool, str)     # ok, detail
+    sync_finished = pyqtSignal(bool, str)         # ok, detail
+    parameter_changed = pyqtSignal(str, float)    # name, value on the vehicle
+
+    def __init__(self, command_link, parent=None):
+        super().__init__(parent)
+        self.commands = command_link
+        self.lock = threading.RLock()  # results arrive in the reader and writer threads
+        self.names = []               # index -> name (None until received)
+        self.values = {}              # name -> value on the vehicle, as last confirmed
+        self.local = {}               # name -> edited value not yet written (dirty)
+        self.remote_hash = None
+        self.pending = {}             # seq -> ("info" | "get" | "set" | "save", index or name)
+        self.downloading = False
+        self.force_download = False
+        self.syncing = False
+        self.sync_errors = []
+        self.persist = True
+        command_link.command_status.connect(self.on_command_status, Qt.DirectConnection)
+
+    # ───────────── Cache ─────────────
+    @property
+    def count(self):
+        return len(self.names)
+
+    @property
+    def complete(self):
+        return bool(self.names) and None not in self.names
+
+    def value(self, name, default=None):
+        """Value including local edits."""
+        return self.local.get(name, self.values.get(name, default))
+
+    def set_value(self, name, value):
+        """Edit the local copy; written by the next ``sync()``."""
+        if name not in self.values:
+            raise KeyError(f"unknown parameter {name}")
+        value = float(format_value(value))
+        with self.lock:
+            if value == self.values[name]:
+                self.local.pop(name, None)
+            else:
+                self.local[name] = value
+
+    def dirty(self):
+        """Edited parameters and their new values."""
+        with self.lock:
+            return dict(self.local)
+
+    def revert(self, name=None):
+        with self.lock:
+            if name is None:
+                self.local.clear()
+            else:
+                self.local.pop(name, None)
+
+    def cache_hash(self):
+        return parameter_hash((name, self.values[name]) for name in self.names) if self.complete else None
+
+    def save_file(self, path):
+        """Write ``NAME VALUE`` lines (vehicle values, edits included)."""
+        with open(path, "w") as f:
+            f.write(f"# {self.count} parameters\n")
+            for name in self.names:
+                if name is not None:
+                    f.write(f"{name} {format_value(self.value(name))}\n")
+
+    def load_file(self, path):
+        """Mark every parameter in the file that differs from the vehicle as dirty.
+
+        Returns ``(changed, unknown)`` name lists.
+        """
+        changed, unknown = [], []
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2 or parts[0].startswith("#"):
+                    continue
+                name, value = parts
+                if name not in self.values:
+                    unknown.append(name)
+                    continue
+                self.set_value(name, value)
+                if name in self.local:
+                    changed.append(name)
+        return changed, unknown
+
+    # ───────────── Transfers ─────────────
+    def send(self, kind, key, name, args=""):
+        with self.lock:
+            seq = self.commands.send(name, args, BULK)
+            self.pending[seq] = (kind, key)
+        return seq
+
+    def download(self, force=False):
+        """Fetch the parameter table (skipped when the cache is current, unless ``force``)."""
+        if self.downloading:
+            return
+        self.downloading = True
+        self.force_download = force
+        self.send("info", None, "PARAM_INFO")
+
+    def request_missing(self):
+        missing = [index for index, name in enumerate(self.names) if name is None]
+        self.progress.emit(self.count - len(missing), self.count)
+        for index in missing:
+            self.send("get", index, "PARAM_GET", str(index))
+        return missing
+
+    def sync(self, persist=True):
+        """Write the dirty parameters; with ``persist`` the flight controller then saves to flash."""
+        if self.syncing:
+            return
+        dirty = self.dirty()
+        if not dirty:
+            self.sync_finished.emit(True, "nothing to write")
+            return
+        self.syncing = True
+        self.persist = persist
+        self.sync_errors = []
+        for name, value in dirty.items():
+            self.send("set", name, "PARAM_SET", f"{name} {format_value(value)}")
+
+    def on_command_status(self, seq, name, status, detail):
+        """Results of our commands (called in the reader or writer thread)."""
+        if status not in (ACKED, REJECTED, FAILED):
+            return
+        with self.lock:  # held while handling, so the last reply sees every earlier one applied
+            request = self.pending.pop(seq, None)
+            if request is None:
+                return
+            kind, key = request
+            more_pending = any(other == kind for other, _ in self.pending.values())
+            ok = status == ACKED
+            try:
+                if kind == "info":
+                    self.on_info(ok, detail)
+                elif kind == "get":
+                    self.on_get(ok, detail, more_pending)
+                elif kind == "set":
+                    self.on_set(ok, key, detail, more_pending)
+                elif kind == "save":
+                    self.finish_sync(f"{status}: {detail}" if not ok else "")
+            except (ValueError, IndexError) as e:
+                print(f"[ParameterManager] Bad {kind} reply '{detail}': {e}")
+                if kind == "info" or (kind == "get" and not more_pending):
+                    self.finish_download(False, f"bad reply: {detail}")
+
+    def on_info(self, ok, detail):
+        if not ok:
+            self.finish_download(False, f"PARAM_INFO {detail}")
+            return
+        count, remote_hash = detail.split()
+        count = int(count)
+        self.remote_hash = remote_hash
+        if not self.force_download and self.complete and self.count == count and self.cache_hash() == remote_hash:
+            self.finish_download(True, "cache is current")
+            return
+        if count != self.count or self.complete:
+            self.names = [None] * count  # new table (or a changed one): fetch everything
+        if not self.request_missing():
+            self.finish_download(True, "")
+
+    def on_get(self, ok, detail, more_pending):
+        if ok:
+            index, name, value = detail.split()
+            index, value = int(index), float(value)
+            self.names[index] = name
+            changed = self.values.get(name) != value
+            self.values[name] = value
+            if self.local.get(name) == value:
+                del self.local[name]
+            if changed:
+                self.parameter_changed.emit(name, value)
+            received = self.count - self.names.count(None)
+            if received % 32 == 0 or received == self.count:
+                self.progress.emit(received, self.count)
+        if not more_pending:
+            missing = self.names.count(None)
+            if missing:
+                self.finish_download(False, f"{missing} of {self.count} parameters missing - download again")
+            else:
+                self.finish_download(True, "")
+
+    def on_set(self, ok, name, detail, more_pending):
+        if ok:
+            _, stored = detail.split()
+            stored = float(stored)
+            self.values[name] = stored
+            if self.local.get(name) is not None and self.local[name] != stored:
+                self.sync_errors.append(f"{name} stored as {format_value(stored)}")
+            self.local.pop(name, None)
+            self.parameter_changed.emit(name, stored)
+        else:
+            self.sync_errors.append(f"{name}: {detail}")
+        if not more_pending:
+            if self.persist:
+                self.send("save", None, "PARAM_SAVE")
+            else:
+                self.finish_sync("")
+
+    def finish_download(self, ok, detail):
+        self.downloading = False
+        print(f"[ParameterManager] Download {'done' if ok else 'failed'}: {self.count} parameters {detail}")
+        self.download_finished.emit(ok, detail)
+
+    def finish_sync(self, save_error):
+        self.syncing = False
+        errors = self.sync_errors + ([f"PARAM_SAVE {save_error}"] if save_error else [])
+        self.sync_finished.emit(not errors, "; ".join(errors))
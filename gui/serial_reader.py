@@ -1,42 +1,81 @@
-import serial
+import codecs
+import threading
+import time
 import serial.tools.list_ports
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
+from link_stats import LinkStats
+from transports import open_transport, TransportError, EndOfStream
+
+READ_TIMEOUT = 0.05     # seconds the read loop waits for data before checking self.running
+STALE_AFTER = 2.0       # seconds without a line before the link counts as "no data"
+HOTPLUG_INTERVAL = 1.0  # seconds between port scans while no board is plugged in
+BACKOFF_INITIAL = 0.5   # first reconnect delay, doubled after every failed attempt ...
+BACKOFF_MAX = 8.0       # ... up to this
+
+# Connection states (connection_state_changed)
+SEARCHING = "searching"        # auto-detect: waiting for a board to be plugged in
+CONNECTING = "connecting"
+CONNECTED = "connected"        # open and lines arriving
+NO_DATA = "no_data"            # open, but nothing for STALE_AFTER seconds
+RECONNECTING = "reconnecting"  # link lost, waiting to retry
+DISCONNECTED = "disconnected"  # stopped, or a replayed file ended
 
 class SerialReader(QObject):
+    """Reads telemetry lines from any transport (see transports.py).
+
+    ``port`` is a connection string: a serial device (``COM12``,
+    ``/dev/ttyACM0``) or ``udp://``, ``tcp://``, ``file://`` URL. None
+    auto-detects a board, in the reader thread, and keeps scanning until
+    one is plugged in. A lost link is reopened with exponential backoff;
+    the line framing state lives on the reader, so line numbering and the
+    counters carry on across reconnects.
+    """
     data_received = pyqtSignal(str)
+    connection_state_changed = pyqtSignal(str, str)  # state, detail (port or error)
 
     def __init__(self, port=None, baudrate=115200):
         super().__init__()
         self.baudrate = baudrate
-        self.port = port or self.auto_detect_port()
-        self.ser = None
+        self.port = port            # None: auto-detect in the reader thread
+        self.auto_detect = port is None
+        self.transport = None
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()
+
+        self.state = DISCONNECTED
+        self.state_detail = ""
+        self.reconnects = 0
+        self.stats = LinkStats()    # rates, malformed lines, loss (link_stats.py)
+        self.thread_cpu = 0.0       # CPU seconds used by the reader thread so far
+
+        # Framing state, kept across reconnects
+        self.buffer = ""
+        # One decoder across reads: a character split between two reads (the "°"
+        # of attitude and GPS lines) is completed by the next read, not replaced
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.line_count = 0
+        self.skip_partial = False   # drop bytes up to the next newline (joined mid-stream)
+        self.discarded_fragments = 0
 
-    def auto_detect_port(self):
+    def auto_detect_port(self, quiet=False):
         """Auto-detect STM32 or USB serial device."""
         ports = list(serial.tools.list_ports.comports())
         for p in ports:
             if "STM" in p.description or "USB" in p.description:
                 print(f"[SerialReader] Auto-detected port: {p.device}")
                 return p.device
-        print("[SerialReader] No STM32 found. Falling back to COM12")
-        return "COM12"
+        if not quiet:
+            print("[SerialReader] No STM32 found.")
+        return None
 
     def start_reading(self):
-        """Open serial and start reading in a background thread."""
-        if self.ser and self.ser.is_open:
-            print("[SerialReader] Port already open. Skipping re-open.")
-            return
-
-        print(f"[SerialReader] Attempting to open {self.port} at {self.baudrate} baud")
-        try:
-            # Short timeout for low-latency updates
-            self.ser = serial.Serial(self.port, self.baudrate, timeout=0.01)
-            self.running = True
-        except Exception as e:
-            print(f"[SerialReader] Serial error: {e}")
+        """Start the connection manager and read loop in a background thread."""
+        if self.running:
+            print("[SerialReader] Already running. Skipping re-open.")
             return
+        self.running = True
+        self._stop_event.clear()
 
         # Move this object to a dedicated QThread
         self.thread = QThread()
@@ -45,53 +84,184 @@ class SerialReader(QObject):
         self.thread.start()
         print("[SerialReader] Serial reading thread started")
 
+    # ───────────── Connection Management ─────────────
+    def set_state(self, state, detail=""):
+        if (state, detail) != (self.state, self.state_detail):
+            self.state, self.state_detail = state, detail
+            self.connection_state_changed.emit(state, detail)
+
+    def wait(self, seconds):
+        """Sleep unless stop() is called first. Returns False when stopping."""
+        return not self._stop_event.wait(seconds)
+
+    def connect_transport(self):
+        """One attempt to open the link. Returns True when open."""
+        if self.auto_detect:
+            port = self.auto_detect_port(quiet=self.state == SEARCHING)
+            if not port:
+                self.set_state(SEARCHING)
+                return False
+            self.port = port
+
+        self.set_state(CONNECTING, self.port)
+        try:
+            self.transport = open_transport(self.port, self.baudrate)
+            print(f"[SerialReader] Attempting to open {self.transport.description}")
+            self.transport.open()
+        except (TransportError, ValueError) as e:
+            print(f"[SerialReader] Serial error: {e}")
+            self.transport = None
+            self.set_state(RECONNECTING, str(e))
+            return False
+
+        print(f"[SerialReader] ✅ Connected to {self.transport.description}")
+        self.decoder.reset()  # bytes of a half-received character died with the old connection
+        # A byte stream joined mid-line starts with the tail of a line; discard it
+        self.skip_partial = not self.transport.starts_on_line_boundary
+        if self.buffer:
+            self.discarded_fragments += 1
+            self.buffer = ""  # its end was lost with the old connection
+        self.set_state(NO_DATA, self.port)
+        return True
+
     def read_loop(self):
-        """Non-blocking continuous read loop with DEBUG output."""
+        """Connect, read until the link fails, wait with backoff, reconnect."""
         print("[SerialReader] Entering read loop...")
-        buffer = ""
-        line_count = 0
-        while self.running and self.ser and self.ser.is_open:
+        backoff = BACKOFF_INITIAL
+        while self.running:
+            if not self.connect_transport():
+                delay = HOTPLUG_INTERVAL if self.state == SEARCHING else backoff
+                if self.state == RECONNECTING:
+                    backoff = min(backoff * 2, BACKOFF_MAX)
+                if not self.wait(delay):
+                    break
+                continue
+
+            if self.read_until_lost():
+                backoff = BACKOFF_INITIAL  # the link worked; retry quickly
+            self.transport.close()
+            self.transport = None
+            if self.state == DISCONNECTED:  # a replayed file ended
+                break
+            if self.running:
+                self.reconnects += 1
+                print(f"[SerialReader] Link lost, reconnecting in {backoff:.1f} s")
+                if not self.wait(backoff):
+                    break
+                backoff = min(backoff * 2, BACKOFF_MAX)
+        self.running = False
+        if self.state != DISCONNECTED:
+            self.set_state(DISCONNECTED)
+
+    def read_until_lost(self):
+        """Read lines until the transport fails or stop() is called. Returns whether any arrived."""
+        received_data = False
+        last_line = time.monotonic()
+        cpu_start = time.thread_time() - self.thread_cpu
+        while self.running:
+            self.thread_cpu = time.thread_time() - cpu_start
             try:
-                if self.ser.in_waiting:
-                    # Read all available data
-                    raw_data = self.ser.read(self.ser.in_waiting).decode(errors="ignore")
-                    buffer += raw_data
-                    
-                    if "\n" in buffer:
-                        lines = buffer.split("\n")
-                        for line in lines[:-1]:
-                            line = line.strip()
-                            if line:
-                                line_count += 1
-                                
-                                # 🐛 DEBUG: Print every received line
-                                print(f"[DEBUG] Line {line_count}: '{line}'")
-                                
-                                # 🐛 DEBUG: Check if it's RC data
-                                if "RC1:" in line:
-                                    print(f"[DEBUG] ✅ RC Channel data detected: {line}")
-                                elif "RC_STATUS:" in line:
-                                    print(f"[DEBUG] ✅ RC Status data detected: {line}")
-                                elif line.startswith("[RC]"):
-                                    print(f"[DEBUG] ✅ RC Debug message: {line}")
-                                else:
-                                    print(f"[DEBUG] ❓ Unknown data type: {line}")
-                                
-                                # Emit the line to main GUI
-                                self.data_received.emit(line)
-                        buffer = lines[-1]  # keep last incomplete line
-            except Exception as e:
+                # Whatever arrived, after waiting at most READ_TIMEOUT for it
+                raw_data = self.transport.read(READ_TIMEOUT)
+            except EndOfStream as e:
+                print(f"[SerialReader] {e}")
+                self.set_state(DISCONNECTED, str(e))
+                return received_data
+            except TransportError as e:
                 print(f"[SerialReader] Read error: {e}")
-                break
+                if self.auto_detect:
+                    self.port = None  # the board may come back under another name
+                self.set_state(RECONNECTING, str(e))
+                return received_data
+
+            now = time.monotonic()
+            self.stats.bytes += len(raw_data)
+            if raw_data and self.process_data(self.decoder.decode(raw_data)):
+                received_data = True
+                last_line = now
+                self.set_state(CONNECTED, self.port)
+            elif now - last_line > STALE_AFTER:
+                self.set_state(NO_DATA, self.port)
+        return received_data
+
+    # ───────────── Line Framing ─────────────
+    def process_data(self, raw_data):
+        """Split received text into lines and emit them. Returns the number of lines."""
+        self.buffer += raw_data
+        if self.skip_partial:
+            if "\n" not in self.buffer:
+                return 0
+            self.buffer = self.buffer.split("\n", 1)[1]
+            self.skip_partial = False
+            self.discarded_fragments += 1
+
+        emitted = 0
+        if "\n" in self.buffer:
+            lines = self.buffer.split("\n")
+            for line in lines[:-1]:
+                line = line.strip()
+                framing_error = "\ufffd" in line  # bytes that are not text: noise, wrong baud rate
+                if framing_error:
+                    line = line.replace("\ufffd", "").strip()
+                if line:
+                    self.line_count += 1
+                    emitted += 1
+                    self.stats.record_line(line, framing_error)
+
+                    # 🐛 DEBUG: Print every received line
+                    print(f"[DEBUG] Line {self.line_count}: '{line}'")
+
+                    # 🐛 DEBUG: Check if it's RC data
+                    if "RC1:" in line:
+                        print(f"[DEBUG] ✅ RC Channel data detected: {line}")
+                    elif "RC_STATUS:" in line:
+                        print(f"[DEBUG] ✅ RC Status data detected: {line}")
+                    elif line.startswith("[RC]"):
+                        print(f"[DEBUG] ✅ RC Debug message: {line}")
+                    else:
+                        print(f"[DEBUG] ❓ Unknown data type: {line}")
+
+                    # Emit the line to main GUI
+                    self.data_received.emit(line)
+            self.buffer = lines[-1]  # keep last incomplete line
+        return emitted
+
+    @property
+    def bytes_received(self):
+        return self.stats.bytes
+
+    @property
+    def framing_errors(self):
+        return self.stats.framing_errors
+
+    def link_stats_snapshot(self):
+        return dict(self.stats.snapshot(), reconnects=self.reconnects)
+
+    def report_parse_error(self, source):
+        """Count a line a tab could not use."""
+        self.stats.record_parse_error(source)
+
+    def write(self, data):
+        """Send bytes on the open link (the command uplink's writer thread calls this)."""
+        transport = self.transport
+        if transport is None or not transport.is_open:
+            raise TransportError("link not connected")
+        transport.write(data)
+
+    def request_stop(self):
+        """Make the read loop return soon, without waiting for it (any thread)."""
+        self.running = False
+        self._stop_event.set()
 
     def stop(self):
         """Stop the serial reader safely."""
         print("[SerialReader] Stopping serial thread...")
-        self.running = False
-        if self.ser and self.ser.is_open:
-            self.ser.close()
-            print("[SerialReader] Serial port closed")
+        self.request_stop()
         if self.thread:
+            # The read loop notices within READ_TIMEOUT; close only once it has left
             self.thread.quit()
             self.thread.wait()
-            print("[SerialReader] Thread stopped")
\ No newline at end of file
+            print("[SerialReader] Thread stopped")
+        if self.transport and self.transport.is_open:
+            self.transport.close()
+            print("[SerialReader] Serial port closed")
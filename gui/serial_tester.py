@@ -1,7 +1,8 @@
+import sys
 import serial
 
-port = "COM12"   # Your STM32's port 
-baudrate = 9600  # Match this with your STM32 code
+port = sys.argv[1] if len(sys.argv) > 1 else "COM12"            # Your STM32's port
+baudrate = int(sys.argv[2]) if len(sys.argv) > 2 else 115200    # Match this with your STM32 code (921600, 2000000 ...)
 
 try:
     ser = serial.Serial(port, baudrate, timeout=1)
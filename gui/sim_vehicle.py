@@ -0,0 +1,333 @@
+"""Simulated vehicles on pseudo-terminals, for testing the GCS without hardware.
+
+Each vehicle opens a pty and writes the same pipe-separated telemetry
+lines as the STM32 firmware (attitude, IMU, barometer, GPS, mode) at a
+fixed rate, or replays a recorded log file in a loop. Point a link at the
+printed device path, e.g. ``python main.py --link /dev/pts/5``, or let
+main.py start them with ``--sim-vehicles N`` (spawn_vehicles runs them in
+a child process).
+
+Each vehicle also answers the GCS command uplink (command_link.py): every
+``CMD <seq> <NAME> <args>`` line gets ``ACK <seq>`` back (``NACK`` for
+unknown commands), except for the ``--ack-drop`` fraction that is
+ignored to exercise retries, and ``--link-delay`` seconds later (radio
+round trip). SET_MODE changes the reported mode, and the PARAM_*
+commands of parameters.py read and write a table of about 250
+parameters.
+
+With ``--seq`` every line starts with a ``SEQ: <n> |`` field, and
+``--line-drop`` leaves out that fraction of the lines, for checking the
+loss shown by the link statistics (link_stats.py).
+
+    python sim_vehicle.py [--count 3] [--rate 100] [--replay flight.log] [--ack-drop 0.1] [--link-delay 0.02]
+                          [--seq] [--line-drop 0.01]
+
+POSIX only (uses ``os.openpty``).
+"""
+import argparse
+import math
+import os
+import random
+import re
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+import tty
+from collections import deque
+from parameters import format_value, parameter_hash
+
+
+def default_parameters():
+    """The simulated flight controller's parameter table, ``[name, value]`` in index order."""
+    params = []
+    for axis in ("ROLL", "PITCH", "YAW"):
+        for loop, p_gain in (("RATE", 0.135), ("ANGLE", 4.5)):
+            for term, value in (("P", p_gain), ("I", p_gain if loop == "RATE" else 0.0), ("D", 0.0036),
+                                ("FF", 0.0), ("IMAX", 0.5), ("FLTD", 20.0)):
+                params.append([f"PID_{axis}_{loop}_{term}", value])
+    # Sensor ranges used for the PPM mapping in the Flight Data tab
+    for sensor, lo, hi in (("ACC_X", -2000, 2000), ("ACC_Y", -2000, 2000), ("ACC_Z", -2000, 2000),
+                           ("GYRO_X", -1000, 1000), ("GYRO_Y", -1000, 1000), ("GYRO_Z", -1000, 1000),
+                           ("TEMP", -10, 60), ("PRESSURE", 950, 1050)):
+        params += [[f"RANGE_{sensor}_MIN", lo], [f"RANGE_{sensor}_MAX", hi]]
+    for ch in range(1, 17):
+        params += [[f"RC{ch}_MIN", 1000], [f"RC{ch}_MAX", 2000], [f"RC{ch}_TRIM", 1500],
+                   [f"RC{ch}_DZ", 20 if ch <= 4 else 0], [f"RC{ch}_REV", 0]]
+    for ch in range(1, 17):
+        params += [[f"SERVO{ch}_MIN", 1100], [f"SERVO{ch}_MAX", 1900], [f"SERVO{ch}_TRIM", 1500],
+                   [f"SERVO{ch}_REV", 0], [f"SERVO{ch}_FUNCTION", 33 + ch - 1 if ch <= 4 else 0]]
+    params += [[f"FLTMODE{i}", i - 1] for i in range(1, 7)] + [["FLTMODE_CH", 5]]
+    params += [["BATT_CAPACITY", 3300], ["BATT_LOW_VOLT", 10.5], ["BATT_CRT_VOLT", 10.0],
+               ["BATT_ARM_VOLT", 11.1], ["BATT_VOLT_MULT", 10.1], ["BATT_AMP_PERVLT", 17.0]]
+    params += [["FS_THR_ENABLE", 1], ["FS_THR_VALUE", 975], ["FS_GCS_ENABLE", 1],
+               ["FS_BATT_ENABLE", 2], ["FS_TIMEOUT", 1.5]]
+    for sensor in ("INS_ACCOFFS", "INS_ACCSCAL", "INS_GYROFFS", "COMPASS_OFS"):
+        params += [[f"{sensor}_{axis}", 1.0 if sensor == "INS_ACCSCAL" else 0.0] for axis in "XYZ"]
+    params += [["COMPASS_DEC", -0.0236], ["LOG_BITMASK", 176126], ["SYSID_THISMAV", 1],
+               ["TELEM_BAUD", 115200], ["TELEM_RATE", 100]]
+    params += [[f"WPNAV_{name}", value] for name, value in (("SPEED", 500), ("SPEED_UP", 250),
+                                                          ("SPEED_DN", 150), ("ACCEL", 100), ("RADIUS", 200))]
+    return params
+
+
+class SimulatedVehicle(threading.Thread):
+    """Background thread writing telemetry for one vehicle to the master side of a pty."""
+
+    KNOWN_COMMANDS = {"ARM", "DISARM", "SET_MODE", "RTL", "FAILSAFE", "SETPOINT", "RC_CAL",
+                      "PARAM_INFO", "PARAM_GET", "PARAM_SET", "PARAM_SAVE"}
+
+    def __init__(self, vehicle_index=0, rate_hz=100.0, replay_path=None, seed=None, ack_drop=0.0,
+                 link_delay=0.0, seq_numbers=False, line_drop=0.0):
+        super().__init__(daemon=True, name=f"SimVehicle-{vehicle_index}")
+        self.vehicle_index = vehicle_index
+        self.rate_hz = rate_hz
+        self.replay_path = replay_path
+        self.random = random.Random(seed if seed is not None else vehicle_index)
+
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)  # no echo back into the master, no newline translation
+        self.port = os.ttyname(self.slave_fd)
+        self.running = False
+        self.lines_sent = 0
+        self.seq_numbers = seq_numbers
+        self.line_drop = line_drop
+        self.lines_dropped = 0
+
+        # Command uplink
+        self.ack_drop = ack_drop
+        self.ack_random = random.Random(1000 + vehicle_index)
+        self.link_delay = link_delay        # seconds before a reply goes out (radio round trip)
+        self.parameters = default_parameters()
+        self.parameter_index = {name: i for i, (name, _) in enumerate(self.parameters)}
+        self.write_lock = threading.Lock()  # telemetry and ACKs share the pty
+        self.mode = None                    # set by SET_MODE; None cycles through the modes
+        self.armed = False
+        self.commands_received = []         # (seq, name, args) in arrival order
+
+        # Each vehicle starts at a different spot around the field
+        self.home_lat = 12.9351 + 0.002 * vehicle_index
+        self.home_lon = 77.5360 + 0.002 * vehicle_index
+
+    def run(self):
+        self.running = True
+        threading.Thread(target=self.answer_commands, daemon=True,
+                         name=f"SimVehicleCommands-{self.vehicle_index}").start()
+        ticks = self.replay_lines() if self.replay_path else self.generate_lines()
+        interval = 1.0 / self.rate_hz if self.rate_hz > 0 else 0.0
+        next_time = time.perf_counter()
+        try:
+            for lines in ticks:
+                if not self.running:
+                    break
+                if self.seq_numbers or self.line_drop:
+                    lines = self.number_and_drop(lines)
+                data = "".join(line + "\n" for line in lines).encode()
+                with self.write_lock:
+                    os.write(self.master_fd, data)
+                self.lines_sent += len(lines)
+                if interval:
+                    next_time += interval
+                    delay = next_time - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        next_time = time.perf_counter()  # fell behind - do not burst to catch up
+        except OSError as e:
+            if self.running:
+                print(f"[SimVehicle] Vehicle {self.vehicle_index} write error: {e}")
+
+    def stop(self):
+        self.running = False
+        if self.is_alive():
+            self.join(timeout=1.0)
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def number_and_drop(self, lines):
+        kept = []
+        for line in lines:
+            if self.seq_numbers:
+                line = f"SEQ: {(self.lines_sent + self.lines_dropped + len(kept)) % 65536} | {line}"
+            if self.line_drop and self.random.random() < self.line_drop:
+                self.lines_dropped += 1
+            else:
+                kept.append(line)
+        return kept
+
+    # ───────────── Command Uplink ─────────────
+    def answer_commands(self):
+        """Read ``CMD`` lines written by the GCS and acknowledge them."""
+        buffer = b""
+        delayed = deque()  # (due time, reply), in order
+        while self.running:
+            now = time.monotonic()
+            replies = []
+            while delayed and delayed[0][0] <= now:
+                replies.append(delayed.popleft()[1])
+            if replies:
+                with self.write_lock:
+                    os.write(self.master_fd, "".join(reply + "\n" for reply in replies).encode())
+            timeout = min(0.1, delayed[0][0] - now) if delayed else 0.1
+            try:
+                readable, _, _ = select.select([self.master_fd], [], [], max(0.0, timeout))
+                if not readable:
+                    continue
+                buffer += os.read(self.master_fd, 4096)
+            except OSError:
+                return  # pty closed by stop()
+            *lines, buffer = buffer.split(b"\n")
+            due = time.monotonic() + self.link_delay
+            delayed.extend((due, reply) for reply in map(self.handle_command, lines) if reply)
+
+    def handle_command(self, raw):
+        """Apply one command line; returns the reply line, or None when it is (deliberately) dropped."""
+        parts = raw.decode(errors="replace").strip().split(None, 3)
+        if len(parts) < 3 or parts[0] != "CMD":
+            return None
+        seq, name, args = parts[1], parts[2], parts[3] if len(parts) > 3 else ""
+        if self.ack_drop and self.ack_random.random() < self.ack_drop:
+            return None  # lost on the way: the GCS must retry
+        self.commands_received.append((seq, name, args))
+        if name not in self.KNOWN_COMMANDS:
+            return f"NACK {seq} unknown command"
+        if name == "SET_MODE":
+            self.mode = args
+        elif name in ("ARM", "DISARM"):
+            self.armed = name == "ARM"
+        elif name == "RTL":
+            self.mode = "RTL"
+        elif name.startswith("PARAM_"):
+            return self.handle_parameter_command(seq, name, args)
+        return f"ACK {seq}"
+
+    def handle_parameter_command(self, seq, name, args):
+        try:
+            if name == "PARAM_INFO":
+                return f"ACK {seq} {len(self.parameters)} {parameter_hash(self.parameters)}"
+            if name == "PARAM_GET":
+                index = int(args)
+                param, value = self.parameters[index]
+                return f"ACK {seq} {index} {param} {format_value(value)}"
+            if name == "PARAM_SET":
+                param, value = args.split()
+                entry = self.parameters[self.parameter_index[param]]
+                entry[1] = float(format_value(value))
+                return f"ACK {seq} {param} {format_value(entry[1])}"
+        except (ValueError, IndexError, KeyError):
+            return f"NACK {seq} bad parameter {args}"
+        return f"ACK {seq}"  # PARAM_SAVE
+
+    # ───────────── Telemetry Sources ─────────────
+    def generate_lines(self):
+        """Endless synthetic telemetry, one list of lines per tick: attitude every tick,
+        the other messages at lower rates."""
+        tick = 0
+        phase = self.vehicle_index * 0.7
+        while True:
+            t = tick / max(self.rate_hz, 1.0)
+            noise = self.random.gauss
+            roll = 20 * math.sin(0.5 * t + phase) + noise(0, 0.2)
+            pitch = 10 * math.sin(0.3 * t + phase) + noise(0, 0.2)
+            yaw = (15 * t + 40 * self.vehicle_index) % 360
+            lines = [f"ROLL: {roll:.2f} | PITCH: {pitch:.2f} | YAW: {yaw:.2f}"]
+
+            if tick % 2 == 0:
+                acc = [int(1000 * math.sin(math.radians(roll))), int(1000 * math.sin(math.radians(pitch))), 1000]
+                gyro = [int(noise(0, 5)) for _ in range(3)]
+                mag = [int(300 * math.cos(math.radians(yaw))), int(-300 * math.sin(math.radians(yaw))), 120]
+                lines.append("ACC: {},{},{} | GYRO: {},{},{} | MAG: {},{},{}"
+                             .format(*acc, *gyro, *mag))
+            if tick % 10 == 0:
+                alt = 10 + 5 * math.sin(0.1 * t + phase)
+                lines.append(f"TEMP: {27 + noise(0, 0.1):.1f}C | PRESS: {1013.25 - alt * 0.12:.2f}hPa | ALT: {alt:.2f}m")
+            if tick % 20 == 0:
+                radius = 0.0005
+                lat = self.home_lat + radius * math.sin(0.05 * t + phase)
+                lon = self.home_lon + radius * math.cos(0.05 * t + phase)
+                lines.append(f"LAT: {lat:.6f} | LON: {lon:.6f} | GPS: 3D Fix")
+            if tick % 100 == 0:
+                mode = self.mode or ("Stabilize", "AltHold", "Loiter")[(tick // 1000 + self.vehicle_index) % 3]
+                lines.append(f"MODE: {mode}")
+            yield lines
+            tick += 1
+
+    def replay_lines(self):
+        """Lines of a recorded log, one per tick, looped forever (blank lines and # comments are skipped)."""
+        with open(self.replay_path, "r", errors="ignore") as f:
+            recorded = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        if not recorded:
+            raise ValueError(f"{self.replay_path} has no telemetry lines")
+        while True:
+            for line in recorded:
+                yield [line]
+
+
+def start_vehicles(count, rate_hz=100.0, replay_path=None, ack_drop=0.0, link_delay=0.0,
+                   seq_numbers=False, line_drop=0.0):
+    """Start ``count`` simulated vehicles and return them (their ``port`` is the pty to open)."""
+    vehicles = [SimulatedVehicle(i, rate_hz, replay_path, ack_drop=ack_drop, link_delay=link_delay,
+                                 seq_numbers=seq_numbers, line_drop=line_drop)
+                for i in range(count)]
+    for vehicle in vehicles:
+        vehicle.start()
+    return vehicles
+
+
+def spawn_vehicles(count, rate_hz=100.0, replay_path=None):
+    """Run the vehicles in a child process (so they never compete with the GCS for the GIL).
+
+    Returns ``(process, ports)``; terminate the process to stop them.
+    """
+    cmd = [sys.executable, os.path.abspath(__file__), "--count", str(count), "--rate", str(rate_hz)]
+    if replay_path:
+        cmd += ["--replay", replay_path]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, bufsize=1)
+    ports = []
+    for line in process.stdout:
+        match = re.search(r"on (\S+)$", line.strip())
+        if match:
+            ports.append(match.group(1))
+        if "Running" in line or len(ports) == count:
+            break
+    if len(ports) != count:
+        process.terminate()
+        raise RuntimeError("simulated vehicles failed to start")
+    return process, ports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated STM32 vehicles on pseudo-terminals")
+    parser.add_argument("--count", type=int, default=1, help="number of vehicles")
+    parser.add_argument("--rate", type=float, default=100.0, help="ticks (attitude lines) per second per vehicle")
+    parser.add_argument("--replay", metavar="LOG", help="replay a recorded telemetry log instead")
+    parser.add_argument("--ack-drop", type=float, default=0.0, help="fraction of commands left unanswered")
+    parser.add_argument("--link-delay", type=float, default=0.0, help="seconds before each command reply")
+    parser.add_argument("--seq", action="store_true", help="number the lines with a leading SEQ field")
+    parser.add_argument("--line-drop", type=float, default=0.0, help="fraction of telemetry lines left out")
+    args = parser.parse_args()
+
+    vehicles = start_vehicles(args.count, args.rate, args.replay, args.ack_drop, args.link_delay,
+                              args.seq, args.line_drop)
+    for vehicle in vehicles:
+        print(f"[SimVehicle] Vehicle {vehicle.vehicle_index} on {vehicle.port}", flush=True)
+    print("[SimVehicle] Running - Ctrl+C to stop", flush=True)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    parent = os.getppid()
+    try:
+        while os.getppid() == parent:  # also exit if the GCS that spawned us died
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for vehicle in vehicles:
+            vehicle.stop()
+
+
+if __name__ == "__main__":
+    main()
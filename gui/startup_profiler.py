@@ -0,0 +1,290 @@
+"""Startup profiler for the ground station.
+
+Records where launch time goes and writes it as a JSON report:
+
+* import time per module (inclusive and self), via a meta path hook
+* named blocking sections (link setup, ...)
+* construction time of each tab (reported by main.py from LazyTab)
+* milestones: QApplication created, window built, first paint, link
+  opened, first telemetry line
+
+Enable it with ``main.py --profile-startup report.json`` or the
+``GCS_PROFILE_STARTUP=report.json`` environment variable; the report is
+written when the application quits. Reports from two versions can be
+compared with:
+
+    python startup_profiler.py compare old.json new.json [--threshold 10]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+REPORT_VERSION = 1
+ENV_VAR = "GCS_PROFILE_STARTUP"
+ARG_NAME = "--profile-startup"
+
+
+# ───────────── Import Timing ─────────────
+class _TimedLoader:
+    """Wraps a module's loader for the duration of one import to time it."""
+
+    def __init__(self, loader, hook):
+        self._loader = loader
+        self._hook = hook
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # Extension modules (PyQt5, numpy...) do their dlopen here
+        self._hook.enter(spec.name)
+        try:
+            return self._loader.create_module(spec)
+        except BaseException:
+            self._hook.leave(spec.name)
+            raise
+
+    def exec_module(self, module):
+        try:
+            self._loader.exec_module(module)
+        finally:
+            # Hand the real loader back so nothing outlives the import
+            module.__loader__ = self._loader
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+            self._hook.leave(module.__name__)
+
+
+class ImportHook:
+    """Meta path finder that asks the remaining finders for a spec and times its loader."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.records = []               # finished imports, in completion order
+        self._local = threading.local()  # per-thread stack of open imports
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        finders = sys.meta_path[sys.meta_path.index(self) + 1:] if self in sys.meta_path else []
+        for finder in finders:
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self)
+            return spec
+        return None
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enter(self, name):
+        self._stack().append([name, self.clock(), 0.0])
+
+    def leave(self, name):
+        stack = self._stack()
+        if not stack or stack[-1][0] != name:
+            return
+        _, start, children = stack.pop()
+        inclusive = self.clock() - start
+        if stack:
+            stack[-1][2] += inclusive
+        self.records.append({
+            "module": name,
+            "parent": stack[-1][0] if stack else None,
+            "start_ms": round(start, 3),
+            "inclusive_ms": round(inclusive, 3),
+            "self_ms": round(inclusive - children, 3),
+            "thread": threading.current_thread().name,
+        })
+
+
+# ───────────── Profiler ─────────────
+class StartupProfiler:
+    """Collects startup timings relative to ``t0`` (a ``time.perf_counter()`` value)."""
+
+    def __init__(self, t0=None, report_path=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.report_path = report_path
+        self.marks = {}
+        self.sections = []
+        self.tabs = []
+        self.import_hook = None
+        self._written = False
+
+    @classmethod
+    def from_argv(cls, argv, t0=None):
+        """Profiler configured from ``--profile-startup PATH`` / $GCS_PROFILE_STARTUP.
+
+        Called before the heavy imports so that they are timed. Import timing
+        is only switched on when a report was asked for.
+        """
+        report_path = os.environ.get(ENV_VAR) or None
+        for i, arg in enumerate(argv):
+            if arg == ARG_NAME and i + 1 < len(argv):
+                report_path = argv[i + 1]
+            elif arg.startswith(ARG_NAME + "="):
+                report_path = arg.split("=", 1)[1]
+
+        profiler = cls(t0, report_path)
+        if profiler.enabled:
+            profiler.import_hook = ImportHook(profiler.elapsed_ms)
+            profiler.import_hook.install()
+        return profiler
+
+    @property
+    def enabled(self):
+        return bool(self.report_path)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.t0) * 1000
+
+    # ───────────── Recording ─────────────
+    def mark(self, name):
+        """Record a milestone (only the first occurrence counts). Returns its time in ms."""
+        if name not in self.marks:
+            self.marks[name] = round(self.elapsed_ms(), 3)
+        return self.marks[name]
+
+    @contextmanager
+    def section(self, name):
+        """Time a blocking block of startup code."""
+        start = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            self.sections.append({"name": name, "start_ms": round(start, 3),
+                                  "duration_ms": round(self.elapsed_ms() - start, 3)})
+
+    def record_tab(self, name, build_ms):
+        self.tabs.append({"name": name, "at_ms": round(self.elapsed_ms(), 3),
+                          "build_ms": round(build_ms, 3)})
+
+    # ───────────── Report ─────────────
+    def report(self):
+        imports = self.import_hook.records if self.import_hook else []
+        top_level = [r for r in imports if r["parent"] is None]
+        return {
+            "version": REPORT_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "argv": sys.argv[1:],
+            "marks_ms": self.marks,
+            "sections": self.sections,
+            "tabs": self.tabs,
+            "imports": {
+                "count": len(imports),
+                "total_ms": round(sum(r["inclusive_ms"] for r in top_level), 3),
+                "modules": sorted(imports, key=lambda r: r["start_ms"]),
+            },
+        }
+
+    def write_report(self, path=None):
+        path = path or self.report_path
+        if not path or self._written:
+            return None
+        if self.import_hook:
+            self.import_hook.uninstall()
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=1)
+        self._written = True
+        print(f"[StartupProfiler] Report written to {path}")
+        return path
+
+
+# ───────────── Qt Helpers ─────────────
+def watch_first_paint(widget, callback):
+    """Call ``callback()`` once ``widget`` has finished its first paint."""
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+
+    class _FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                obj.removeEventFilter(self)
+                # Children paint in the same pass - report once it has been flushed
+                QTimer.singleShot(0, callback)
+            return False
+
+    event_filter = _FirstPaintFilter(widget)
+    widget.installEventFilter(event_filter)
+    return event_filter
+
+
+# ───────────── Report Comparison ─────────────
+def _flatten(report, top_imports=15):
+    values = {f"mark {k}": v for k, v in report.get("marks_ms", {}).items()}
+    for section in report.get("sections", []):
+        values[f"section {section['name']}"] = section["duration_ms"]
+    for tab in report.get("tabs", []):
+        values[f"tab {tab['name']}"] = tab["build_ms"]
+    imports = report.get("imports", {})
+    if imports.get("modules"):
+        values["imports total"] = imports["total_ms"]
+        heaviest = sorted(imports["modules"], key=lambda r: r["self_ms"], reverse=True)[:top_imports]
+        for record in heaviest:
+            values[f"import {record['module']}"] = record["self_ms"]
+    return values
+
+
+def compare(old, new, threshold_pct=10.0, min_ms=5.0):
+    """Print old vs new timings. Returns the keys that got slower beyond the threshold."""
+    old_values, new_values = _flatten(old), _flatten(new)
+    regressions = []
+    print(f"{'':40s} {'old ms':>10s} {'new ms':>10s} {'change':>8s}")
+    for key in sorted(set(old_values) | set(new_values)):
+        before, after = old_values.get(key), new_values.get(key)
+        if before is None or after is None:
+            shown = "added" if before is None else "removed"
+            print(f"{key[:40]:40s} {before or 0:10.1f} {after or 0:10.1f} {shown:>8s}")
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if after - before > min_ms and change > threshold_pct and not key.startswith("import "):
+            regressions.append(key)
+            flag = "  <-- slower"
+        print(f"{key[:40]:40s} {before:10.1f} {after:10.1f} {change:+7.0f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup profile reports")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmp_parser = sub.add_parser("compare", help="compare two reports")
+    cmp_parser.add_argument("old")
+    cmp_parser.add_argument("new")
+    cmp_parser.add_argument("--threshold", type=float, default=10.0,
+                            help="percent slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions = compare(old, new, args.threshold)
+    if regressions:
+        print(f"[StartupProfiler] {len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
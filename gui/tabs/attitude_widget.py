@@ -1,18 +1,45 @@
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QPainter, QColor, QPen, QTransform
 from PyQt5.QtCore import Qt, QRect
+from .cached_layer import CachedLayer
 
 class AttitudeIndicator(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, use_cache=True):
         super().__init__(parent)
         self.roll = 0
         self.pitch = 0
 
+        # Bezel and aircraft symbol never move - drawn once over the horizon
+        self.use_cache = use_cache
+        self.overlay_layer = CachedLayer(self, self.paint_overlay)
+        self.sky_color = QColor("#87ceeb")
+        self.ground_color = QColor("#d2b48c")
+        self.horizon_pen = QPen(Qt.white, 2)
+
     def set_attitude(self, roll, pitch):
         self.roll = roll
         self.pitch = pitch
         self.update()
 
+    def resizeEvent(self, event):
+        self.overlay_layer.invalidate()
+        super().resizeEvent(event)
+
+    def paint_overlay(self, painter, rect):
+        center_x = rect.width() // 2
+        center_y = rect.height() // 2
+
+        # Draw outer frame
+        pen = QPen(Qt.gray, 3)
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawEllipse(rect.center(), min(center_x, center_y) - 5, min(center_x, center_y) - 5)
+
+        # Draw fixed aircraft symbol
+        painter.setPen(QPen(Qt.red, 2))
+        painter.drawLine(center_x - 20, center_y, center_x + 20, center_y)
+        painter.drawLine(center_x, center_y - 20, center_x, center_y + 20)
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -31,32 +58,25 @@ class AttitudeIndicator(QWidget):
         painter.setTransform(transform)
 
         # Sky
-        painter.setBrush(QColor("#87ceeb"))
+        painter.setBrush(self.sky_color)
         painter.setPen(Qt.NoPen)
         horizon_height = self.pitch * 2
         painter.drawRect(QRect(-rect.width(), -rect.height() + int(horizon_height),
                                rect.width() * 2, rect.height() * 2))
 
         # Ground
-        painter.setBrush(QColor("#d2b48c"))
+        painter.setBrush(self.ground_color)
         painter.drawRect(QRect(-rect.width(), int(horizon_height),
                                rect.width() * 2, rect.height()))
 
         # Horizon line
-        pen = QPen(Qt.white, 2)
-        painter.setPen(pen)
+        painter.setPen(self.horizon_pen)
         painter.drawLine(-rect.width(), int(horizon_height),
                          rect.width(), int(horizon_height))
 
         painter.restore()
 
-        # Draw outer frame
-        pen = QPen(Qt.gray, 3)
-        painter.setPen(pen)
-        painter.setBrush(Qt.NoBrush)
-        painter.drawEllipse(rect.center(), min(center_x, center_y) - 5, min(center_x, center_y) - 5)
-
-        # Draw fixed aircraft symbol
-        painter.setPen(QPen(Qt.red, 2))
-        painter.drawLine(center_x - 20, center_y, center_x + 20, center_y)
-        painter.drawLine(center_x, center_y - 20, center_x, center_y + 20)
+        if self.use_cache:
+            self.overlay_layer.draw(painter)
+        else:
+            self.paint_overlay(painter, rect)
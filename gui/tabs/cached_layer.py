@@ -0,0 +1,42 @@
+from PyQt5.QtGui import QPixmap, QPainter
+from PyQt5.QtCore import Qt
+
+
+class CachedLayer:
+    """Static part of a widget's painting, rendered once into a pixmap.
+
+    ``paint(painter, rect)`` draws the layer in widget coordinates. The
+    pixmap is rebuilt only when the widget's size or device pixel ratio
+    changes (resize, or the window moving to a screen with another DPI),
+    or after ``invalidate()``.
+    """
+
+    def __init__(self, widget, paint):
+        self.widget = widget
+        self.paint = paint
+        self._pixmap = None
+        self._key = None
+        self.builds = 0
+
+    def invalidate(self):
+        self._pixmap = None
+        self._key = None
+
+    def pixmap(self):
+        dpr = self.widget.devicePixelRatioF()
+        key = (self.widget.width(), self.widget.height(), dpr)
+        if self._pixmap is None or key != self._key:
+            pixmap = QPixmap(int(key[0] * dpr), int(key[1] * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.paint(painter, self.widget.rect())
+            painter.end()
+            self._pixmap = pixmap
+            self._key = key
+            self.builds += 1
+        return self._pixmap
+
+    def draw(self, painter):
+        painter.drawPixmap(0, 0, self.pixmap())
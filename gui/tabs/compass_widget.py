@@ -1,25 +1,36 @@
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QRadialGradient, QBrush
 from PyQt5.QtCore import Qt, QPointF
+from .cached_layer import CachedLayer
 import math
 
 class CompassWidget(QWidget):
-    def __init__(self):
+    def __init__(self, use_cache=True):
         super().__init__()
         self.heading = 0  # Degrees
         self.setMinimumSize(160, 160)
 
+        # Dial (background, ring, ticks, letters) is static - only the needle and text move
+        self.use_cache = use_cache
+        self.dial_layer = CachedLayer(self, self.paint_dial)
+        self.letter_font = QFont('Segoe UI', 10, QFont.Bold)
+        self.heading_font = QFont("Consolas", 10, QFont.Bold)
+        self.needle_pen = QPen(QColor(255, 60, 60), 3)
+        self.hub_pen = QPen(Qt.darkGray, 1)
+
     def set_heading(self, heading):
         self.heading = heading % 360
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def dial_geometry(self, rect):
+        return rect.center(), min(rect.width(), rect.height()) / 2 - 12
 
-        rect = self.rect()
-        center = rect.center()
-        radius = min(rect.width(), rect.height()) / 2 - 12
+    def resizeEvent(self, event):
+        self.dial_layer.invalidate()
+        super().resizeEvent(event)
+
+    def paint_dial(self, painter, rect):
+        center, radius = self.dial_geometry(rect)
 
         # --- Gradient Glossy Background ---
         gradient = QRadialGradient(center, radius)
@@ -45,28 +56,40 @@ class CompassWidget(QWidget):
 
         # --- Cardinal Directions ---
         directions = ['N', 'E', 'S', 'W']
+        painter.setFont(self.letter_font)
         for i, d in enumerate(directions):
             angle = i * 90
             rad = math.radians(angle)
             tx = center.x() + (radius - 26) * math.cos(rad)
             ty = center.y() + (radius - 26) * math.sin(rad)
-            painter.setFont(QFont('Segoe UI', 10, QFont.Bold))
             painter.setPen(QColor(255, 255, 255) if d != 'N' else QColor(255, 100, 100))
             painter.drawText(QPointF(tx - 6, ty + 6), d)
 
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        rect = self.rect()
+        center, radius = self.dial_geometry(rect)
+
+        if self.use_cache:
+            self.dial_layer.draw(painter)
+        else:
+            self.paint_dial(painter, rect)
+
         # --- Compass Needle with Glow ---
         rad = math.radians(-self.heading + 90)
         x = center.x() + (radius - 20) * math.cos(rad)
         y = center.y() - (radius - 20) * math.sin(rad)
-        painter.setPen(QPen(QColor(255, 60, 60), 3))
+        painter.setPen(self.needle_pen)
         painter.drawLine(center, QPointF(x, y))
 
         # --- Center Hub ---
         painter.setBrush(QColor(255, 255, 255))
-        painter.setPen(QPen(Qt.darkGray, 1))
+        painter.setPen(self.hub_pen)
         painter.drawEllipse(center, 5, 5)
 
         # --- Heading Text ---
         painter.setPen(Qt.white)
-        painter.setFont(QFont("Consolas", 10, QFont.Bold))
+        painter.setFont(self.heading_font)
         painter.drawText(rect.adjusted(0, 0, 0, -8), Qt.AlignBottom | Qt.AlignHCenter, f"Heading: {int(self.heading)}°")
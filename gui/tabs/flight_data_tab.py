@@ -3,12 +3,18 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from PyQt5.QtWidgets import (
-    QWidget, QLabel, QVBoxLayout, QGridLayout, QGroupBox, QFrame
+    QWidget, QVBoxLayout, QGridLayout, QGroupBox, QFrame
 )
 from PyQt5.QtPositioning import QGeoPositionInfoSource
 from .attitude_widget import AttitudeIndicator
 from .compass_widget import CompassWidget
+from .visibility_gate import VisibilityGate
+from .telemetry_panel import TelemetryPanel, PanelField
+from .instrument_driver import InstrumentDriver, heading_from_mag
+from telemetry import parse_fields, parse_number
+from link_stats import report_parse_error
 import math
+import time
 
 
 class FlightDataTab(QWidget):
@@ -27,6 +33,7 @@ class FlightDataTab(QWidget):
         self.current_gyro = [0, 0, 0]
         self.current_temp = 25.0
         self.current_pressure = 1013.25
+        self.current_ppm = [1500] * 6
 
         # Sensor calibration ranges for proper PPM mapping
         self.sensor_ranges = {
@@ -41,11 +48,6 @@ class FlightDataTab(QWidget):
         }
 
         self.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                padding: 4px 8px;
-                color: #EAEAEA;
-            }
             QGroupBox {
                 font-size: 18px;
                 font-weight: bold;
@@ -74,10 +76,8 @@ class FlightDataTab(QWidget):
 
         # Sensor Panel
         sensor_panel = QVBoxLayout()
-        sensor_panel.addWidget(self.create_gps_group())
-        sensor_panel.addWidget(self.create_baro_group())
-        sensor_panel.addWidget(self.create_imu_group())
-        sensor_panel.addWidget(self.create_ppm_group())  # Added PPM group
+        sensor_panel.addWidget(self.create_telemetry_panel())
+        sensor_panel.addStretch()
         sensor_frame = QFrame()
         sensor_frame.setLayout(sensor_panel)
 
@@ -92,222 +92,51 @@ class FlightDataTab(QWidget):
         grid.addWidget(visual_frame, 0, 1)
         main_layout.addLayout(grid)
 
+        # Horizon and compass repaint at most once per display refresh
+        self.instrument_driver = InstrumentDriver(self.attitude_widget, self.compass_widget, self)
+        self.last_yaw_time = None  # YAW is preferred over the MAG-derived heading
+
         # Connect serial signal
+        self.display_gate = VisibilityGate(self, self.update_display)
         if self.reader:
             self.reader.data_received.connect(self.handle_serial_data)
-
-    def create_gps_group(self):
-        group = QGroupBox("GPS")
-        layout = QVBoxLayout()
-        
-        # GPS Status with icon-like styling
-        self.gps_status = QLabel("Status: Searching...")
-        self.gps_status.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #FFA726;
-            background-color: rgba(255, 167, 38, 0.1);
-            border-radius: 5px;
-            padding: 6px;
-        """)
-        
-        # Latitude with coordinate styling
-        self.latitude = QLabel("Latitude: 12.9351° N")
-        self.latitude.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #42A5F5;
-            background-color: rgba(66, 165, 245, 0.1);
-            border-radius: 5px;
-            padding: 6px;
-        """)
-        
-        # Longitude with coordinate styling
-        self.longitude = QLabel("Longitude: 77.5360° E")
-        self.longitude.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #AB47BC;
-            background-color: rgba(171, 71, 188, 0.1);
-            border-radius: 5px;
-            padding: 6px;
-        """)
-        
-        layout.addWidget(self.gps_status)
-        layout.addWidget(self.latitude)
-        layout.addWidget(self.longitude)
-        group.setLayout(layout)
-        return group
-
-    def create_baro_group(self):
-        group = QGroupBox("Barometer")
-        layout = QVBoxLayout()
-        
-        # Altitude with elevation styling
-        self.altitude = QLabel("Relative Altitude: -- m")
-        self.altitude.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #66BB6A;
-            background-color: rgba(102, 187, 106, 0.1);
-            border-radius: 5px;
-            padding: 6px;
-        """)
-        
-        # Temperature with thermal styling
-        self.temp = QLabel("TEMP: -- °C")
-        self.temp.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #FF7043;
-            background-color: rgba(255, 112, 67, 0.1);
-            border-radius: 5px;
-            padding: 6px;
-        """)
-        
-        # Pressure with atmospheric styling
-        self.press = QLabel("PRESS: -- hPa")
-        self.press.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #26C6DA;
-            background-color: rgba(38, 198, 218, 0.1);
-            border-radius: 5px;
-            padding: 6px;
-        """)
-        
-        layout.addWidget(self.altitude)
-        layout.addWidget(self.temp)
-        layout.addWidget(self.press)
-        group.setLayout(layout)
-        return group
-
-    def create_imu_group(self):
-        group = QGroupBox("IMU / Sensor Data")
-        layout = QVBoxLayout()
-
-        # Roll with rotation styling
-        self.roll = QLabel("Roll: --°")
-        self.roll.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #EF5350;
-            background-color: rgba(239, 83, 80, 0.1);
-            border-left: 4px solid #EF5350;
-            border-radius: 5px;
-            padding: 6px;
-        """)
-        
-        # Pitch with tilt styling
-        self.pitch = QLabel("Pitch: --°")
-        self.pitch.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #5C6BC0;
-            background-color: rgba(92, 107, 192, 0.1);
-            border-left: 4px solid #5C6BC0;
-            border-radius: 5px;
-            padding: 6px;
-        """)
-        
-        # Yaw with compass styling
-        self.yaw = QLabel("Yaw: --°")
-        self.yaw.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold; 
-            color: #FFCA28;
-            background-color: rgba(255, 202, 40, 0.1);
-            border-left: 4px solid #FFCA28;
-            border-radius: 5px;
-            padding: 6px;
-        """)
-
-        # Accelerometer with motion styling
-        self.accel = QLabel("ACC: ---, ---, ---")
-        self.accel.setStyleSheet("""
-            font-size: 13px; 
-            font-weight: bold; 
-            color: #8BC34A;
-            background-color: rgba(139, 195, 74, 0.1);
-            border: 1px solid #8BC34A;
-            border-radius: 5px;
-            padding: 5px;
-        """)
-        
-        # Gyroscope with rotation styling  
-        self.gyro = QLabel("GYRO: ---, ---, ---")
-        self.gyro.setStyleSheet("""
-            font-size: 13px; 
-            font-weight: bold; 
-            color: #FF9800;
-            background-color: rgba(255, 152, 0, 0.1);
-            border: 1px solid #FF9800;
-            border-radius: 5px;
-            padding: 5px;
-        """)
-        
-        # Magnetometer with magnetic styling
-        self.mag = QLabel("MAG: ---, ---, ---")
-        self.mag.setStyleSheet("""
-            font-size: 13px; 
-            font-weight: bold; 
-            color: #E91E63;
-            background-color: rgba(233, 30, 99, 0.1);
-            border: 1px solid #E91E63;
-            border-radius: 5px;
-            padding: 5px;
-        """)
-
-        layout.addWidget(self.roll)
-        layout.addWidget(self.pitch)
-        layout.addWidget(self.yaw)
-        layout.addWidget(self.accel)
-        layout.addWidget(self.gyro)
-        layout.addWidget(self.mag)
-
-        group.setLayout(layout)
-        return group
-
-    def create_ppm_group(self):
-        group = QGroupBox("PPM Channels (μs)")
-        layout = QVBoxLayout()
-        
-        # Create 6 PPM channel labels with descriptions
-        self.ppm_ch1 = QLabel("CH1 (Roll): 1500 μs")
-        self.ppm_ch2 = QLabel("CH2 (Pitch): 1500 μs")
-        self.ppm_ch3 = QLabel("CH3 (Throttle): 1500 μs")
-        self.ppm_ch4 = QLabel("CH4 (Yaw): 1500 μs")
-        self.ppm_ch5 = QLabel("CH5 (Aux1): 1500 μs")
-        self.ppm_ch6 = QLabel("CH6 (Aux2): 1500 μs")
-        
-        # Enhanced styling with gradients and borders
-        ppm_styles = [
-            """font-size: 14px; font-weight: bold; color: #ff5722; 
-               background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 rgba(255,87,34,0.2), stop:1 rgba(255,87,34,0.05));
-               border-left: 3px solid #ff5722; border-radius: 5px; padding: 6px;""",
-            """font-size: 14px; font-weight: bold; color: #2196f3;
-               background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 rgba(33,150,243,0.2), stop:1 rgba(33,150,243,0.05));
-               border-left: 3px solid #2196f3; border-radius: 5px; padding: 6px;""",
-            """font-size: 14px; font-weight: bold; color: #4caf50;
-               background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 rgba(76,175,80,0.2), stop:1 rgba(76,175,80,0.05));
-               border-left: 3px solid #4caf50; border-radius: 5px; padding: 6px;""",
-            """font-size: 14px; font-weight: bold; color: #ff9800;
-               background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 rgba(255,152,0,0.2), stop:1 rgba(255,152,0,0.05));
-               border-left: 3px solid #ff9800; border-radius: 5px; padding: 6px;""",
-            """font-size: 14px; font-weight: bold; color: #9c27b0;
-               background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 rgba(156,39,176,0.2), stop:1 rgba(156,39,176,0.05));
-               border-left: 3px solid #9c27b0; border-radius: 5px; padding: 6px;""",
-            """font-size: 14px; font-weight: bold; color: #00bcd4;
-               background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 rgba(0,188,212,0.2), stop:1 rgba(0,188,212,0.05));
-               border-left: 3px solid #00bcd4; border-radius: 5px; padding: 6px;"""
+        # RANGE_<SENSOR>_MIN/MAX flight-controller parameters override the default ranges
+        if hasattr(self.reader, "parameter_changed"):
+            self.reader.parameter_changed.connect(self.on_parameter_changed)
+            if self.reader.parameters:  # downloaded before this tab was built
+                for name, value in list(self.reader.parameters.values.items()):
+                    self.on_parameter_changed(name, value)
+
+    def create_telemetry_panel(self):
+        """GPS, barometer, IMU and PPM readouts, painted by a single TelemetryPanel."""
+        ppm_colors = ["#ff5722", "#2196f3", "#4caf50", "#ff9800", "#9c27b0", "#00bcd4"]
+        ppm_names = ["Roll", "Pitch", "Throttle", "Yaw", "Aux1", "Aux2"]
+        sections = [
+            ("GPS", [
+                PanelField("gps_status", "Status:", "Searching...", "#FFA726"),
+                PanelField("latitude", "Latitude:", "12.9351° N", "#42A5F5"),
+                PanelField("longitude", "Longitude:", "77.5360° E", "#AB47BC"),
+            ], 1),
+            ("Barometer", [
+                PanelField("altitude", "Relative Altitude:", "-- m", "#66BB6A"),
+                PanelField("temp", "TEMP:", "-- °C", "#FF7043"),
+                PanelField("press", "PRESS:", "-- hPa", "#26C6DA"),
+            ], 1),
+            ("IMU / Sensor Data", [
+                PanelField("roll", "Roll:", "--°", "#EF5350", style="left"),
+                PanelField("pitch", "Pitch:", "--°", "#5C6BC0", style="left"),
+                PanelField("yaw", "Yaw:", "--°", "#FFCA28", style="left"),
+                PanelField("accel", "ACC:", "---, ---, ---", "#8BC34A", style="box", font_size=13),
+                PanelField("gyro", "GYRO:", "---, ---, ---", "#FF9800", style="box", font_size=13),
+                PanelField("mag", "MAG:", "---, ---, ---", "#E91E63", style="box", font_size=13),
+            ], 1),
+            ("PPM Channels (μs)", [
+                PanelField(f"ppm_ch{i + 1}", f"CH{i + 1} ({name}):", "1500 μs", color, style="gradient")
+                for i, (name, color) in enumerate(zip(ppm_names, ppm_colors))
+            ], 1),
         ]
-        
-        for i, label in enumerate([self.ppm_ch1, self.ppm_ch2, self.ppm_ch3, self.ppm_ch4, self.ppm_ch5, self.ppm_ch6]):
-            label.setStyleSheet(ppm_styles[i])
-            layout.addWidget(label)
-        
-        group.setLayout(layout)
-        return group
+        self.telemetry_panel = TelemetryPanel(sections)
+        return self.telemetry_panel
 
     def create_attitude_group(self):
         group = QGroupBox("Artificial Horizon")
@@ -389,11 +218,13 @@ class FlightDataTab(QWidget):
         """Handle position updates from QGeoPositionInfoSource"""
         if pos_info.isValid():
             coord = pos_info.coordinate()
-            self.latitude.setText(f"Latitude: {coord.latitude()}° N")
-            self.longitude.setText(f"Longitude: {coord.longitude()}° E")
-            self.gps_status.setText("Status: Active")
+            self.telemetry_panel.set_values({
+                "latitude": f"{coord.latitude()}° N",
+                "longitude": f"{coord.longitude()}° E",
+                "gps_status": "Active",
+            })
         else:
-            self.gps_status.setText("Status: No Fix")
+            self.telemetry_panel.set_values({"gps_status": "No Fix"})
 
     def get_channel_status(self, ppm_value):
         """Get color-coded status for PPM value"""
@@ -407,96 +238,137 @@ class FlightDataTab(QWidget):
     def handle_serial_data(self, line):
         print(f"[STM32 → GUI]: {line}")
 
+        # The PPM channels feed the Radio tab, so they are computed even while this tab is hidden
         try:
+            self.update_ppm_channels(line)
+        except Exception as e:
+            print(f"[ERROR parsing line]: {line} — {e}")
+            report_parse_error(self.reader, "Flight Data")
+
+        # Labels are only touched while the tab is on screen
+        self.display_gate.feed(line)
+
+    def update_ppm_channels(self, line):
+        """Track the sensor values behind the PPM channels and re-emit the channels for the Radio tab."""
+        if 'ACC' in line and 'GYRO' in line and 'MAG' in line:
+            parts = [p.strip() for p in line.split('|')]
+            for part in parts:
+                if part.startswith("ACC"):
+                    # Parse ACC values for PPM calculation
+                    self.current_acc = [int(x.strip()) for x in part.split(':')[1].split(',')]
+                elif part.startswith("GYRO"):
+                    # Parse GYRO values for PPM calculation
+                    self.current_gyro = [int(x.strip()) for x in part.split(':')[1].split(',')]
+
+            # Calculate PPM channels after parsing ACC/GYRO
+            ppm_channels = self.calculate_ppm_channels(
+                self.current_acc[0], self.current_acc[1], self.current_acc[2],
+                self.current_gyro[0], self.current_gyro[1], self.current_gyro[2],
+                self.current_temp, self.current_pressure
+            )
+            self.current_ppm = ppm_channels
+
+            # Send PPM data to Radio Calibration tab
+            ppm_line = f"CH1: {ppm_channels[0]} | CH2: {ppm_channels[1]} | CH3: {ppm_channels[2]} | CH4: {ppm_channels[3]} | CH5: {ppm_channels[4]} | CH6: {ppm_channels[5]}"
+
+            # Emit the PPM line so Radio tab can receive it
+            if self.reader and hasattr(self.reader, 'data_received'):
+                self.reader.data_received.emit(ppm_line)
+
+            print(f"[DEBUG] PPM Channels: {ppm_channels}")
+            print(f"[DEBUG] Sent to Radio tab: {ppm_line}")
+
+        elif 'TEMP' in line and 'PRESS' in line and 'ALT' in line:
+            parts = [p.strip() for p in line.split('|')]
+            for part in parts:
+                if part.startswith("TEMP"):
+                    self.current_temp = float(part.split(':')[1].replace('C', '').strip())
+                elif part.startswith("PRESS"):
+                    self.current_pressure = float(part.split(':')[1].replace('hPa', '').strip())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        screen = self.screen() if hasattr(self, "screen") else None
+        if screen and screen.refreshRate() > 0:
+            self.instrument_driver.set_max_rate(screen.refreshRate())
+
+    def update_instruments(self, line):
+        """Feed the artificial horizon and compass (repaints are coalesced by InstrumentDriver)."""
+        arrival = time.perf_counter()
+        fields = parse_fields(line)
+        if 'ROLL' in fields and 'PITCH' in fields:
+            roll = parse_number(fields['ROLL'])
+            pitch = parse_number(fields['PITCH'])
+            if roll is not None and pitch is not None:
+                self.instrument_driver.set_attitude(roll, pitch, arrival)
+        if 'YAW' in fields:
+            yaw = parse_number(fields['YAW'])
+            if yaw is not None:
+                self.last_yaw_time = arrival
+                self.instrument_driver.set_heading(yaw, arrival)
+        elif 'MAG' in fields and (self.last_yaw_time is None or arrival - self.last_yaw_time > 1.0):
+            mag = [float(v) for v in fields['MAG'].split(',')[:2]]
+            if len(mag) == 2:
+                self.instrument_driver.set_heading(heading_from_mag(*mag), arrival)
+
+    def update_display(self, line):
+        """Update the labels from a telemetry line (only called while the tab is visible)."""
+        try:
+            self.update_instruments(line)
+
+            values = {}
             if 'ROLL' in line and 'PITCH' in line and 'YAW' in line:
                 parts = [p.strip() for p in line.split('|')]
                 for part in parts:
                     if part.startswith("ROLL"):
-                        self.roll.setText("Roll: " + part.split(':')[1].strip())
+                        values["roll"] = part.split(':')[1].strip()
                     elif part.startswith("PITCH"):
-                        self.pitch.setText("Pitch: " + part.split(':')[1].strip())
+                        values["pitch"] = part.split(':')[1].strip()
                     elif part.startswith("YAW"):
-                        self.yaw.setText("Yaw: " + part.split(':')[1].strip())
+                        values["yaw"] = part.split(':')[1].strip()
 
             elif 'ACC' in line and 'GYRO' in line and 'MAG' in line:
                 parts = [p.strip() for p in line.split('|')]
                 for part in parts:
                     if part.startswith("ACC"):
-                        acc_data = part.split(':')[1].strip()
-                        self.accel.setText("ACC: " + acc_data)
-                        # Parse ACC values for PPM calculation
-                        acc_values = [int(x.strip()) for x in acc_data.split(',')]
-                        self.current_acc = acc_values
-                        
+                        values["accel"] = part.split(':')[1].strip()
                     elif part.startswith("GYRO"):
-                        gyro_data = part.split(':')[1].strip()
-                        self.gyro.setText("GYRO: " + gyro_data)
-                        # Parse GYRO values for PPM calculation
-                        gyro_values = [int(x.strip()) for x in gyro_data.split(',')]
-                        self.current_gyro = gyro_values
-                        
+                        values["gyro"] = part.split(':')[1].strip()
                     elif part.startswith("MAG"):
-                        self.mag.setText("MAG: " + part.split(':')[1].strip())
-
-                # Calculate and update PPM channels after parsing ACC/GYRO
-                ppm_channels = self.calculate_ppm_channels(
-                    self.current_acc[0], self.current_acc[1], self.current_acc[2],
-                    self.current_gyro[0], self.current_gyro[1], self.current_gyro[2],
-                    self.current_temp, self.current_pressure
-                )
-                
-                # Update PPM channel displays with status indicators
-                self.ppm_ch1.setText(f"CH1 (Roll): {ppm_channels[0]} μs")
-                self.ppm_ch2.setText(f"CH2 (Pitch): {ppm_channels[1]} μs")
-                self.ppm_ch3.setText(f"CH3 (Throttle): {ppm_channels[2]} μs")
-                self.ppm_ch4.setText(f"CH4 (Yaw): {ppm_channels[3]} μs")
-                self.ppm_ch5.setText(f"CH5 (Aux1): {ppm_channels[4]} μs")
-                self.ppm_ch6.setText(f"CH6 (Aux2): {ppm_channels[5]} μs")
-                
-                # Send PPM data to Radio Calibration tab
-                ppm_line = f"CH1: {ppm_channels[0]} | CH2: {ppm_channels[1]} | CH3: {ppm_channels[2]} | CH4: {ppm_channels[3]} | CH5: {ppm_channels[4]} | CH6: {ppm_channels[5]}"
-                
-                # Emit the PPM line so Radio tab can receive it
-                if self.reader and hasattr(self.reader, 'data_received'):
-                    self.reader.data_received.emit(ppm_line)
-                
-                print(f"[DEBUG] PPM Channels: {ppm_channels}")
-                print(f"[DEBUG] Sent to Radio tab: {ppm_line}")
+                        values["mag"] = part.split(':')[1].strip()
+
+                # Update PPM channel displays
+                for i, ppm_value in enumerate(self.current_ppm):
+                    values[f"ppm_ch{i + 1}"] = f"{ppm_value} μs"
 
             elif 'TEMP' in line and 'PRESS' in line and 'ALT' in line:
                 parts = [p.strip() for p in line.split('|')]
                 for part in parts:
                     if part.startswith("TEMP"):
-                        temp_str = part.split(':')[1].replace('C', '').strip()
-                        self.current_temp = float(temp_str)
-                        self.temp.setText("TEMP: " + part.split(':')[1].strip())
-                        
+                        values["temp"] = part.split(':')[1].strip()
                     elif part.startswith("PRESS"):
-                        press_str = part.split(':')[1].replace('hPa', '').strip()
-                        self.current_pressure = float(press_str)
-                        self.press.setText("PRESS: " + part.split(':')[1].strip())
-                        
+                        values["press"] = part.split(':')[1].strip()
                     elif part.startswith("ALT"):
-                        self.altitude.setText("Relative Altitude: " + part.split(':')[1].strip())
+                        values["altitude"] = part.split(':')[1].strip()
 
             # Handle GPS data parsing
             elif 'LAT' in line and 'LON' in line:
                 parts = [p.strip() for p in line.split('|')]
                 for part in parts:
                     if part.startswith("LAT"):
-                        lat_data = part.split(':')[1].strip()
-                        self.latitude.setText(f"Latitude: {lat_data}")
-                        
+                        values["latitude"] = part.split(':')[1].strip()
                     elif part.startswith("LON"):
-                        lon_data = part.split(':')[1].strip()
-                        self.longitude.setText(f"Longitude: {lon_data}")
-                        
+                        values["longitude"] = part.split(':')[1].strip()
                     elif part.startswith("GPS"):
-                        status_data = part.split(':')[1].strip()
-                        self.gps_status.setText(f"Status: {status_data}")
+                        values["gps_status"] = part.split(':')[1].strip()
+
+            # One model update per line; only fields whose text changed are repainted
+            if values:
+                self.telemetry_panel.set_values(values)
 
         except Exception as e:
             print(f"[ERROR parsing line]: {line} — {e}")
+            report_parse_error(self.reader, "Flight Data")
 
     def update_sensor_ranges(self, sensor_type, min_val, max_val):
         """
@@ -507,6 +379,12 @@ class FlightDataTab(QWidget):
             self.sensor_ranges[sensor_type]['max'] = max_val
             print(f"[INFO] Updated {sensor_type} range: {min_val} to {max_val}")
 
+    def on_parameter_changed(self, name, value):
+        if name.startswith("RANGE_") and name.endswith(("_MIN", "_MAX")):
+            sensor_type, bound = name[len("RANGE_"):-4].lower(), name[-3:].lower()
+            if sensor_type in self.sensor_ranges:
+                self.sensor_ranges[sensor_type][bound] = value
+
     def get_ppm_statistics(self):
         """
         Get current PPM channel statistics for monitoring
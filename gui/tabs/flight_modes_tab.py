@@ -1,9 +1,12 @@
 import re
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QGroupBox,
-    QGridLayout, QComboBox, QLCDNumber
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox,
+    QGridLayout, QComboBox, QLCDNumber, QPushButton
 )
 from PyQt5.QtCore import Qt
+from command_link import URGENT, NORMAL
+from link_stats import report_parse_error
+from .visibility_gate import VisibilityGate
 
 class FlightModesTab(QWidget):
     def __init__(self, serial_reader=None, mode_channel=4):
@@ -68,6 +71,32 @@ class FlightModesTab(QWidget):
         layout.addSpacing(20)
         layout.addWidget(mode_display_group)
 
+        # ───────────── Vehicle Commands Section ─────────────
+        command_group = QGroupBox("Vehicle Commands")
+        command_layout = QVBoxLayout()
+        command_group.setLayout(command_layout)
+
+        button_row = QHBoxLayout()
+        self.command_mode_selector = QComboBox()
+        self.command_mode_selector.addItems(self.default_modes)
+        self.set_mode_button = QPushButton("Set Mode")
+        self.arm_button = QPushButton("Arm")
+        self.disarm_button = QPushButton("Disarm")
+        self.rtl_button = QPushButton("RTL")
+        button_row.addWidget(self.command_mode_selector)
+        button_row.addWidget(self.set_mode_button)
+        button_row.addStretch()
+        for button in (self.arm_button, self.disarm_button, self.rtl_button):
+            button_row.addWidget(button)
+        command_layout.addLayout(button_row)
+
+        self.command_status_label = QLabel("No commands sent")
+        self.command_status_label.setStyleSheet("color: #9e9e9e;")
+        command_layout.addWidget(self.command_status_label)
+
+        layout.addSpacing(20)
+        layout.addWidget(command_group)
+
         self.setLayout(layout)
 
         # Color map for quick visual identification
@@ -100,8 +129,44 @@ class FlightModesTab(QWidget):
         self.last_pitch = 0
         self.last_alt = 0
 
+        # Mode detection only runs while the tab is on screen; the newest RC and
+        # sensor lines are replayed when it is shown again
+        self.display_gate = VisibilityGate(self, self.handle_serial_data)
         if self.reader:
-            self.reader.data_received.connect(self.handle_serial_data)
+            self.reader.data_received.connect(self.display_gate.feed)
+
+        # Commands go to the selected vehicle; arming and RTL jump the queue. Only
+        # mode selections coalesce: every arm, disarm and RTL press goes out
+        self.sent_commands = set()  # seqs of this tab's commands still awaiting a result
+        self.set_mode_button.clicked.connect(
+            lambda: self.send_command("SET_MODE", self.command_mode_selector.currentText(), NORMAL, "mode"))
+        self.arm_button.clicked.connect(lambda: self.send_command("ARM", priority=URGENT))
+        self.disarm_button.clicked.connect(lambda: self.send_command("DISARM", priority=URGENT))
+        self.rtl_button.clicked.connect(lambda: self.send_command("RTL", priority=URGENT))
+        if hasattr(self.reader, "send_command"):
+            self.reader.command_status.connect(self.on_command_status)
+        else:
+            for button in (self.set_mode_button, self.arm_button, self.disarm_button, self.rtl_button):
+                button.setEnabled(False)
+            self.command_status_label.setText("No command uplink on this link")
+
+    # ───────────── Command Uplink ─────────────
+    def send_command(self, name, args="", priority=NORMAL, coalesce=None):
+        seq = self.reader.send_command(name, args, priority, coalesce)
+        if seq is None:
+            self.command_status_label.setText(f"{name} not sent - select a single vehicle")
+        else:
+            self.sent_commands.add(seq)
+            self.command_status_label.setText(f"{name} {args} queued (#{seq})".replace("  ", " "))
+
+    def on_command_status(self, seq, name, status, detail):
+        if seq not in self.sent_commands:
+            return  # another tab's command (or a setpoint stream)
+        if status != "sent":
+            self.sent_commands.discard(seq)
+        colors = {"acked": "#00e676", "rejected": "#f44336", "failed": "#f44336", "sent": "#FFD54F"}
+        self.command_status_label.setText(f"{name} #{seq}: {status} {detail}".strip())
+        self.command_status_label.setStyleSheet(f"color: {colors.get(status, '#9e9e9e')};")
 
     def handle_serial_data(self, line):
         try:
@@ -128,6 +193,7 @@ class FlightModesTab(QWidget):
 
         except Exception as e:
             print(f"[ERROR] Failed to parse line '{line}': {e}")
+            report_parse_error(self.reader, "Flight Modes")
 
     def try_parse_ppm(self, line_upper):
         """Try to parse PPM data. Returns True if successful."""
@@ -203,6 +269,7 @@ class FlightModesTab(QWidget):
                         
                 except ValueError as e:
                     print(f"[ERROR] Failed to parse channel values: {e}")
+                    report_parse_error(self.reader, "Flight Modes")
                     
         return False  # No PPM data found
 
@@ -0,0 +1,164 @@
+import csv
+import math
+import time
+
+EARTH_RADIUS_M = 6371000.0
+
+
+class FlightTrack:
+    """Vehicle track with a full-resolution log and a bounded, simplified copy for the map.
+
+    Every fix is kept in ``points`` for export. ``display_points()`` returns a
+    polyline that is simplified on the fly: new fixes are merged into the last
+    segment while they stay within ``tolerance_m`` of it (opening-window
+    Douglas–Peucker), and once the committed vertices exceed ``max_vertices``
+    the tolerance is doubled and the committed part is re-simplified.
+    """
+
+    def __init__(self, max_vertices=2000, tolerance_m=1.0, max_window=64):
+        self.max_vertices = max_vertices
+        self.initial_tolerance_m = tolerance_m
+        self.tolerance_m = tolerance_m
+        self.max_window = max_window  # bounds the per-fix cost of the window check
+
+        self.points = []       # (timestamp, lat, lon) - full resolution
+        self._committed = []   # (lat, lon) vertices fixed in the simplified line
+        self._window = []      # (lat, lon) fixes since the last committed vertex
+        self._window_xy = []   # projected window, so each fix is projected once
+        self._start_xy = None  # projected last committed vertex
+        self._ref_lat = None   # reference latitude for the local projection
+
+    def __len__(self):
+        return len(self.points)
+
+    def clear(self):
+        self.points = []
+        self._committed = []
+        self._window = []
+        self._window_xy = []
+        self._start_xy = None
+        self._ref_lat = None
+        self.tolerance_m = self.initial_tolerance_m
+
+    # ───────────── Adding Fixes ─────────────
+    def add_point(self, lat, lon, timestamp=None):
+        """Append a fix to the full track and fold it into the simplified line."""
+        if timestamp is None:
+            timestamp = time.time()
+        self.points.append((timestamp, lat, lon))
+
+        if self._ref_lat is None:
+            self._ref_lat = lat
+            self._committed.append((lat, lon))
+            self._start_xy = self._project((lat, lon))
+            return
+
+        self._window.append((lat, lon))
+        self._window_xy.append(self._project((lat, lon)))
+        if len(self._window) > 1 and (
+            len(self._window) > self.max_window
+            or not self._window_fits()
+        ):
+            # The previous fix is the furthest point the segment could reach
+            self._committed.append(self._window[-2])
+            self._start_xy = self._window_xy[-2]
+            self._window = self._window[-1:]
+            self._window_xy = self._window_xy[-1:]
+
+            if len(self._committed) > self.max_vertices:
+                self._shrink()
+
+    def _window_fits(self):
+        a = self._start_xy
+        b = self._window_xy[-1]
+        for p in self._window_xy[:-1]:
+            if self._xy_segment_distance(p, a, b) > self.tolerance_m:
+                return False
+        return True
+
+    def _shrink(self):
+        """Raise the tolerance until the committed vertices fit well under the budget."""
+        target = int(self.max_vertices * 0.75)
+        while len(self._committed) > target:
+            self.tolerance_m *= 2.0
+            self._committed = self.simplify(self._committed, self.tolerance_m)
+
+    # ───────────── Output ─────────────
+    def display_points(self):
+        """Simplified polyline as a list of [lat, lon] pairs (at most ~max_vertices + 1)."""
+        line = [list(p) for p in self._committed]
+        if self._window:
+            line.append(list(self._window[-1]))
+        return line
+
+    def last_point(self):
+        if not self.points:
+            return None
+        _, lat, lon = self.points[-1]
+        return lat, lon
+
+    def export_csv(self, path):
+        """Write the full-resolution track to a CSV file."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "latitude", "longitude"])
+            for t, lat, lon in self.points:
+                writer.writerow([f"{t:.3f}", f"{lat:.7f}", f"{lon:.7f}"])
+
+    def export_gpx(self, path, name="Flight Track"):
+        """Write the full-resolution track to a GPX 1.1 file."""
+        with open(path, "w") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<gpx version="1.1" creator="STM_FC GCS" xmlns="http://www.topografix.com/GPX/1/1">\n')
+            f.write(f"  <trk><name>{name}</name><trkseg>\n")
+            for t, lat, lon in self.points:
+                stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))
+                f.write(f'    <trkpt lat="{lat:.7f}" lon="{lon:.7f}"><time>{stamp}</time></trkpt>\n')
+            f.write("  </trkseg></trk>\n</gpx>\n")
+
+    # ───────────── Geometry ─────────────
+    def _project(self, p):
+        """Local equirectangular projection of (lat, lon) to metres."""
+        lat, lon = p
+        x = math.radians(lon) * math.cos(math.radians(self._ref_lat)) * EARTH_RADIUS_M
+        y = math.radians(lat) * EARTH_RADIUS_M
+        return x, y
+
+    def _segment_distance_m(self, p, a, b):
+        return self._xy_segment_distance(self._project(p), self._project(a), self._project(b))
+
+    @staticmethod
+    def _xy_segment_distance(p, a, b):
+        px, py = p
+        ax, ay = a
+        bx, by = b
+        dx, dy = bx - ax, by - ay
+        seg_len_sq = dx * dx + dy * dy
+        if seg_len_sq == 0.0:
+            return math.hypot(px - ax, py - ay)
+        t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / seg_len_sq))
+        return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+    def simplify(self, line, tolerance_m):
+        """Douglas–Peucker over a list of (lat, lon) vertices (iterative, keeps endpoints)."""
+        if len(line) < 3:
+            return list(line)
+
+        keep = [False] * len(line)
+        keep[0] = keep[-1] = True
+        stack = [(0, len(line) - 1)]
+        while stack:
+            first, last = stack.pop()
+            max_dist = 0.0
+            index = None
+            for i in range(first + 1, last):
+                d = self._segment_distance_m(line[i], line[first], line[last])
+                if d > max_dist:
+                    max_dist = d
+                    index = i
+            if index is not None and max_dist > tolerance_m:
+                keep[index] = True
+                stack.append((first, index))
+                stack.append((index, last))
+
+        return [p for p, k in zip(line, keep) if k]
@@ -1,18 +1,29 @@
 
 import sys
-import folium
+import json
+import time
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
-                             QPushButton, QLabel, QComboBox, QSpinBox)
+                             QPushButton, QLabel, QComboBox, QSpinBox, QFileDialog)
 from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl
+from PyQt5.QtCore import QUrl, QThread, QTimer, pyqtSignal
 from PyQt5.QtPositioning import QGeoPositionInfoSource 
 import os
 import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from telemetry import decode_gps
+from telemetry_bus import TelemetryBus
+from .gps_map_worker import MapWorker
 
 class GPSMapTab(QWidget):
-    def __init__(self):
+    # Requests handed to the MapWorker thread (queued connections)
+    fixes_ready = pyqtSignal(list)
+    render_requested = pyqtSignal(float, float, int, str)
+    clear_requested = pyqtSignal()
+
+    def __init__(self, serial_reader=None, max_update_hz=2.0):
         super().__init__()
         self.setWindowTitle("GPS Map")
+        self.reader = serial_reader
 
         # Initialize properties
         self.map_file = os.path.join(tempfile.gettempdir(), "gps_map.html")
@@ -20,10 +31,46 @@ class GPSMapTab(QWidget):
         self.current_lon = None
         self.location_source = None
 
+        # Page state - JS variable names of the folium objects we update live
+        self.map_ready = False
+        self.track_js_name = None
+        self.marker_js_name = None
+        self.circle_js_name = None
+        self.vehicle_centered = False
+        self.last_track_json = None
+        self.last_vehicle_pos = None
+        self.track_count = 0
+        self.track_dirty = False  # track changed while the tab was hidden
+
+        # ───────────── Map Worker Thread ─────────────
+        self.worker_thread = QThread()
+        self.worker = MapWorker(self.map_file, max_vertices=2000)
+        self.worker.moveToThread(self.worker_thread)
+        self.fixes_ready.connect(self.worker.add_fixes)
+        self.render_requested.connect(self.worker.render_map)
+        self.clear_requested.connect(self.worker.clear_track)
+        self.worker.track_updated.connect(self.on_track_updated)
+        self.worker.map_rendered.connect(self.on_map_rendered)
+        self.worker.map_failed.connect(self.on_map_failed)
+        self.worker_thread.start()
+
+        # ───────────── Telemetry Coalescing ─────────────
+        # GPS fixes are queued here and handed to the worker at most max_update_hz times a second
+        self.pending_fixes = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush_fixes)
+        self.set_max_update_rate(max_update_hz)
+
         # Setup the UI and location services
         self.init_ui()
         self.setup_location_services()
 
+        if self.reader:
+            # Every GPS line of one vehicle (the stream's focus, also when aggregating):
+            # the track needs each fix, the flush timer limits map updates
+            TelemetryBus.of(getattr(self.reader, "focus", self.reader)).subscribe("GPS", self.handle_serial_data)
+
     def init_ui(self):
         main_layout = QVBoxLayout()
         main_layout.setSpacing(10)
@@ -70,6 +117,14 @@ class GPSMapTab(QWidget):
         self.current_location_button.clicked.connect(self.get_current_location)
         self.current_location_button.setMaximumWidth(120)
 
+        self.export_track_button = QPushButton("\ud83d\udcbe Export Track")
+        self.export_track_button.clicked.connect(self.export_track)
+        self.export_track_button.setMaximumWidth(130)
+
+        self.clear_track_button = QPushButton("Clear Track")
+        self.clear_track_button.clicked.connect(self.clear_track)
+        self.clear_track_button.setMaximumWidth(100)
+
         map_label = QLabel("Map Style:")
         self.map_type = QComboBox()
         self.map_type.addItems([
@@ -87,6 +142,8 @@ class GPSMapTab(QWidget):
 
         controls_layout.addWidget(self.search_button)
         controls_layout.addWidget(self.current_location_button)
+        controls_layout.addWidget(self.export_track_button)
+        controls_layout.addWidget(self.clear_track_button)
         controls_layout.addStretch()
         controls_layout.addWidget(map_label)
         controls_layout.addWidget(self.map_type)
@@ -99,6 +156,7 @@ class GPSMapTab(QWidget):
 
         self.webview = QWebEngineView()
         self.webview.setMinimumHeight(500)
+        self.webview.loadFinished.connect(self.on_map_loaded)
 
         main_layout.addWidget(coord_frame)
         main_layout.addWidget(controls_frame)
@@ -167,37 +225,20 @@ class GPSMapTab(QWidget):
         return tile_map.get(self.map_type.currentText(), "OpenStreetMap")
 
     def generate_map(self, lat, lon, zoom=None):
-        try:
-            # Use provided zoom or the spinbox value
-            map_zoom = zoom if zoom is not None else self.zoom_spinbox.value()
-
-            m = folium.Map(
-                location=[lat, lon],
-                zoom_start=map_zoom,
-                tiles=self.get_map_tiles()
-            )
-
-            popup_text = f"<b>Location</b><br>Latitude: {lat:.6f}<br>Longitude: {lon:.6f}"
-            folium.Marker(
-                [lat, lon],
-                tooltip="Click for details",
-                popup=folium.Popup(popup_text, max_width=200)
-            ).add_to(m)
-
-            folium.Circle(
-                [lat, lon],
-                radius=500,
-                popup="500m radius",
-                color="blue",
-                fill=True,
-                fillOpacity=0.2
-            ).add_to(m)
-
-            m.save(self.map_file)
-            self.webview.setUrl(QUrl.fromLocalFile(self.map_file))
+        """Ask the worker to rebuild the page around (lat, lon); it is loaded in on_map_rendered."""
+        # Use provided zoom or the spinbox value
+        map_zoom = zoom if zoom is not None else self.zoom_spinbox.value()
+        self.render_requested.emit(float(lat), float(lon), int(map_zoom), self.get_map_tiles())
 
-        except Exception as e:
-            self.status_label.setText(f"Error generating map: {e}")
+    def on_map_rendered(self, map_file, track_name, marker_name, circle_name):
+        self.track_js_name = track_name
+        self.marker_js_name = marker_name
+        self.circle_js_name = circle_name
+        self.map_ready = False
+        self.webview.setUrl(QUrl.fromLocalFile(map_file))
+
+    def on_map_failed(self, message):
+        self.status_label.setText(f"Error generating map: {message}")
 
     def update_map_to_coords(self):
         try:
@@ -229,6 +270,106 @@ class GPSMapTab(QWidget):
         except Exception as e:
             self.status_label.setText(f"Error: {e}")
 
+    def on_map_loaded(self, ok):
+        self.map_ready = ok
+        if ok:
+            self.push_track()
+
+    # ───────────── Vehicle Telemetry ─────────────
+    def set_max_update_rate(self, hz):
+        """Limit how often queued GPS fixes are handed to the map (fixes are never dropped)."""
+        self.max_update_hz = max(0.1, float(hz))
+        self.flush_timer.setInterval(int(1000 / self.max_update_hz))
+
+    def handle_serial_data(self, line):
+        """Queue GPS fixes from the drone; the map itself is updated from flush_fixes."""
+        if "LAT" not in line:
+            return
+        fix = decode_gps(line)
+        if fix is None:
+            return
+        lat, lon, _ = fix
+        self.pending_fixes.append((time.time(), lat, lon))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_fixes(self):
+        if not self.pending_fixes:
+            return
+        fixes, self.pending_fixes = self.pending_fixes, []
+        self.fixes_ready.emit(fixes)
+
+    # ───────────── Flight Track ─────────────
+    def add_track_point(self, lat, lon, timestamp=None):
+        """Append a vehicle fix to the track (handed to the worker with the next batch)."""
+        self.pending_fixes.append((timestamp or time.time(), lat, lon))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def on_track_updated(self, points_json, lat, lon, count):
+        self.last_track_json = points_json
+        self.track_count = count
+        if count == 0:
+            self.last_vehicle_pos = None
+            self.push_track()
+            return
+
+        self.last_vehicle_pos = (lat, lon)
+        self.current_lat = lat
+        self.current_lon = lon
+
+        if not self.vehicle_centered:
+            # First fix from the drone - re-center the map on it once
+            self.vehicle_centered = True
+            self.generate_map(lat, lon)
+        elif not self.isVisible():
+            # The worker keeps recording; the page catches up in showEvent
+            self.track_dirty = True
+            return
+        else:
+            self.push_track()
+        self.status_label.setText(f"Vehicle: {lat:.6f}, {lon:.6f} ({count} fixes)")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.track_dirty and self.last_vehicle_pos:
+            lat, lon = self.last_vehicle_pos
+            self.status_label.setText(f"Vehicle: {lat:.6f}, {lon:.6f} ({self.track_count} fixes)")
+            self.push_track()
+
+    def push_track(self):
+        """Send the simplified track and vehicle position to the loaded page without regenerating it."""
+        if not self.map_ready or not self.track_js_name or self.last_track_json is None:
+            return
+        self.track_dirty = False
+        script = f"{self.track_js_name}.setLatLngs({self.last_track_json});"
+        if self.last_vehicle_pos and self.marker_js_name:
+            pos = json.dumps(list(self.last_vehicle_pos))
+            script += f"{self.marker_js_name}.setLatLng({pos});{self.circle_js_name}.setLatLng({pos});"
+        self.webview.page().runJavaScript(script)
+
+    def clear_track(self):
+        self.pending_fixes = []
+        self.vehicle_centered = False
+        self.clear_requested.emit()
+        self.status_label.setText("Track cleared.")
+
+    def export_track(self):
+        if not len(self.worker.track):
+            self.status_label.setText("No track to export yet.")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Flight Track", "flight_track.gpx", "GPX (*.gpx);;CSV (*.csv)"
+        )
+        if not path:
+            return
+        try:
+            count = self.worker.export_track(path)
+            self.status_label.setText(f"Exported {count} fixes to {path}")
+        except OSError as e:
+            self.status_label.setText(f"Error exporting track: {e}")
+
     def update_map_style(self):
         if self.current_lat is not None and self.current_lon is not None:
             self.generate_map(self.current_lat, self.current_lon)
@@ -237,7 +378,14 @@ class GPSMapTab(QWidget):
         if self.current_lat is not None and self.current_lon is not None:
             self.generate_map(self.current_lat, self.current_lon)
 
+    def shutdown(self):
+        """Stop the map worker thread (called from MainWindow.closeEvent)."""
+        self.flush_timer.stop()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+
     def closeEvent(self, event):
+        self.shutdown()
         if os.path.exists(self.map_file):
             try:
                 os.remove(self.map_file)
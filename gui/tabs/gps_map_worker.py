@@ -0,0 +1,89 @@
+import json
+import threading
+import folium
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from .flight_track import FlightTrack
+
+
+class MapWorker(QObject):
+    """Heavy GPS map work (track simplification, folium rendering) for a background QThread.
+
+    The GPS tab only batches fixes and hands them over; everything here runs
+    on the worker thread and reports back through signals, so a burst of GPS
+    lines never blocks the GUI.
+    """
+    # Simplified polyline as JSON, latest lat, latest lon, total number of fixes
+    track_updated = pyqtSignal(str, float, float, int)
+    # Map file, polyline JS name, marker JS name, circle JS name
+    map_rendered = pyqtSignal(str, str, str, str)
+    map_failed = pyqtSignal(str)
+
+    def __init__(self, map_file, max_vertices=2000):
+        super().__init__()
+        self.map_file = map_file
+        self.track = FlightTrack(max_vertices=max_vertices)
+        self.lock = threading.Lock()  # guards track for exports from the GUI thread
+
+    @pyqtSlot(list)
+    def add_fixes(self, fixes):
+        """Fold a batch of ``(timestamp, lat, lon)`` fixes into the track."""
+        if not fixes:
+            return
+        with self.lock:
+            for timestamp, lat, lon in fixes:
+                self.track.add_point(lat, lon, timestamp)
+            points = json.dumps(self.track.display_points())
+            count = len(self.track)
+        _, lat, lon = fixes[-1]
+        self.track_updated.emit(points, lat, lon, count)
+
+    @pyqtSlot()
+    def clear_track(self):
+        with self.lock:
+            self.track.clear()
+        self.track_updated.emit("[]", 0.0, 0.0, 0)
+
+    @pyqtSlot(float, float, int, str)
+    def render_map(self, lat, lon, zoom, tiles):
+        """Build the folium page around (lat, lon) and save it to ``map_file``."""
+        try:
+            m = folium.Map(location=[lat, lon], zoom_start=zoom, tiles=tiles)
+
+            popup_text = f"<b>Location</b><br>Latitude: {lat:.6f}<br>Longitude: {lon:.6f}"
+            marker = folium.Marker(
+                [lat, lon],
+                tooltip="Click for details",
+                popup=folium.Popup(popup_text, max_width=200)
+            )
+            marker.add_to(m)
+
+            circle = folium.Circle(
+                [lat, lon],
+                radius=500,
+                popup="500m radius",
+                color="blue",
+                fill=True,
+                fillOpacity=0.2
+            )
+            circle.add_to(m)
+
+            # Flight track polyline - later fixes are pushed with setLatLngs()
+            with self.lock:
+                track_points = self.track.display_points() or [[lat, lon]]
+            track_line = folium.PolyLine(track_points, color="#ff5722", weight=3, opacity=0.9)
+            track_line.add_to(m)
+
+            m.save(self.map_file)
+            self.map_rendered.emit(self.map_file, track_line.get_name(),
+                                   marker.get_name(), circle.get_name())
+        except Exception as e:
+            self.map_failed.emit(str(e))
+
+    def export_track(self, path):
+        """Write the full-resolution track (GPX, or CSV for ``.csv`` paths). Returns the fix count."""
+        with self.lock:
+            if path.lower().endswith(".csv"):
+                self.track.export_csv(path)
+            else:
+                self.track.export_gpx(path)
+            return len(self.track)
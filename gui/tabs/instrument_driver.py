@@ -0,0 +1,124 @@
+import math
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer, QEvent, Qt
+
+
+class InstrumentDriver(QObject):
+    """Feeds AttitudeIndicator and CompassWidget from telemetry at display rate.
+
+    ``set_attitude`` / ``set_heading`` only store the newest sample; a
+    single-shot timer applies it at most once per display refresh, and a
+    widget is only repainted when its value moved by at least the visible
+    threshold. Latency from sample arrival to the paint that shows it is
+    measured on the widgets' paint events (see ``stats()``).
+    """
+
+    def __init__(self, attitude_widget, compass_widget, parent=None, max_hz=60.0,
+                 min_attitude_change=0.2, min_heading_change=0.5, latency_window=300):
+        super().__init__(parent)
+        self.attitude_widget = attitude_widget
+        self.compass_widget = compass_widget
+        self.min_attitude_change = min_attitude_change  # degrees (~1 px of horizon at 2 px/deg pitch)
+        self.min_heading_change = min_heading_change    # degrees of needle
+
+        # Newest samples not yet applied: (value, arrival time)
+        self.pending_attitude = None
+        self.pending_heading = None
+
+        # Arrival time of the value each widget is about to paint
+        self.awaiting_paint = {}
+        self.latencies = deque(maxlen=latency_window)  # ms, arrival -> paint
+
+        # Diagnostics
+        self.samples = 0
+        self.applied = 0
+        self.skipped = 0     # below the visible threshold
+        self.coalesced = 0   # replaced by a newer sample before the next flush
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setTimerType(Qt.PreciseTimer)
+        self.flush_timer.timeout.connect(self.flush)
+        self.set_max_rate(max_hz)
+
+        for widget in (attitude_widget, compass_widget):
+            widget.installEventFilter(self)
+
+    def set_max_rate(self, hz):
+        self.flush_timer.setInterval(max(1, int(1000 / max(1.0, hz))))
+
+    # ───────────── Samples ─────────────
+    def set_attitude(self, roll, pitch, arrival=None):
+        if self.pending_attitude is not None:
+            self.coalesced += 1
+        self.pending_attitude = ((roll, pitch), arrival or time.perf_counter())
+        self._sample_added()
+
+    def set_heading(self, heading, arrival=None):
+        if self.pending_heading is not None:
+            self.coalesced += 1
+        self.pending_heading = (heading % 360, arrival or time.perf_counter())
+        self._sample_added()
+
+    def _sample_added(self):
+        self.samples += 1
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    # ───────────── Display-Rate Flush ─────────────
+    def flush(self):
+        if self.pending_attitude is not None:
+            (roll, pitch), arrival = self.pending_attitude
+            self.pending_attitude = None
+            widget = self.attitude_widget
+            if (abs(roll - widget.roll) >= self.min_attitude_change
+                    or abs(pitch - widget.pitch) >= self.min_attitude_change):
+                self._apply(widget, arrival)
+                widget.set_attitude(roll, pitch)
+            else:
+                self.skipped += 1
+
+        if self.pending_heading is not None:
+            heading, arrival = self.pending_heading
+            self.pending_heading = None
+            widget = self.compass_widget
+            delta = abs((heading - widget.heading + 180) % 360 - 180)
+            # The heading text shows whole degrees, so a new integer always counts as visible
+            if delta >= self.min_heading_change or int(heading) != int(widget.heading):
+                self._apply(widget, arrival)
+                widget.set_heading(heading)
+            else:
+                self.skipped += 1
+
+    def _apply(self, widget, arrival):
+        self.applied += 1
+        # Keep the oldest unpainted arrival: that is the latency the user sees
+        self.awaiting_paint.setdefault(widget, arrival)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and obj in self.awaiting_paint:
+            arrival = self.awaiting_paint.pop(obj)
+            self.latencies.append((time.perf_counter() - arrival) * 1000)
+        return False
+
+    def stats(self):
+        """Sample counts and arrival-to-paint latency (ms) over the recent window."""
+        latencies = sorted(self.latencies)
+        result = {
+            "samples": self.samples,
+            "applied": self.applied,
+            "skipped": self.skipped,
+            "coalesced": self.coalesced,
+            "painted": len(latencies),
+        }
+        if latencies:
+            result["latency_mean_ms"] = sum(latencies) / len(latencies)
+            result["latency_p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            result["latency_max_ms"] = latencies[-1]
+        return result
+
+
+def heading_from_mag(mx, my):
+    """Compass heading in degrees (0 = magnetic north, clockwise) from a level magnetometer."""
+    return math.degrees(math.atan2(-my, mx)) % 360
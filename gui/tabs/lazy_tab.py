@@ -0,0 +1,45 @@
+import importlib
+import time
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from PyQt5.QtCore import pyqtSignal
+
+
+class LazyTab(QWidget):
+    """QTabWidget page that imports and builds the real tab the first time it is shown.
+
+    The tab's module (and whatever heavy packages it pulls in - folium,
+    QtWebEngine, PyOpenGL...) is only imported at that point. ``ensure_created()``
+    can also be called directly to build it ahead of time.
+    """
+    created = pyqtSignal(object)
+
+    def __init__(self, module_name, class_name, kwargs_factory=None, parent=None):
+        super().__init__(parent)
+        self.module_name = module_name
+        self.class_name = class_name
+        self.kwargs_factory = kwargs_factory or dict
+        self.widget = None
+        self.build_ms = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def is_created(self):
+        return self.widget is not None
+
+    def ensure_created(self):
+        if self.widget is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.module_name)
+            tab_class = getattr(module, self.class_name)
+            self.widget = tab_class(**self.kwargs_factory())
+            self.layout().addWidget(self.widget)
+            self.build_ms = (time.perf_counter() - start) * 1000
+            print(f"[LazyTab] {self.class_name} built in {self.build_ms:.0f} ms")
+            self.created.emit(self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        self.ensure_created()
+        super().showEvent(event)
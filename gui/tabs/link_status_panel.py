@@ -0,0 +1,72 @@
+from PyQt5.QtCore import Qt, QTimer
+from link_stats import rates
+from telemetry import MESSAGE_KINDS
+from .telemetry_panel import TelemetryPanel, PanelField
+
+
+class LinkStatusPanel(TelemetryPanel):
+    """Compact link-quality readout: throughput, loss, errors and per-message rates.
+
+    Samples ``reader.link_stats_snapshot()`` every ``REFRESH_MS`` while
+    visible and shows the rates since the previous sample; the counters
+    themselves live in the reader (link_stats.py).
+    """
+    REFRESH_MS = 1000
+    KINDS = [kind for kind, _ in MESSAGE_KINDS] + ["ACK", "OTHER"]
+
+    def __init__(self, reader, parent=None):
+        def field(key, caption, color="#B0BEC5"):
+            return PanelField(key, caption, "--", color, style="none", font_size=12, align=Qt.AlignCenter)
+
+        super().__init__([
+            ("Link Quality", [
+                field("rx", "Rx: ", "#26C6DA"),
+                field("lines", "Lines: ", "#26C6DA"),
+                field("loss", "Loss: ", "#FFCA28"),
+                field("malformed", "Malformed: ", "#FF7043"),
+                field("parse", "Parse errors: ", "#FF7043"),
+                field("reconnects", "Reconnects: "),
+            ], 3),
+            ("Message Rates", [field(kind, f"{kind}: ") for kind in self.KINDS], 4),
+        ], parent=parent)
+        self.reader = reader
+        self.previous = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if hasattr(self.reader, "link_stats_snapshot"):
+            self.previous = None
+            self.refresh()
+            self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()  # nothing to sample while nobody looks
+        super().hideEvent(event)
+
+    def refresh(self):
+        current = self.reader.link_stats_snapshot()
+        if current is None:
+            self.set_values({key: "--" for key in ["rx", "lines", "loss"] + self.KINDS})
+            return
+        previous, self.previous = self.previous, current
+        lines = current["lines"]
+        malformed = current["malformed"]
+        values = {
+            "malformed": f"{malformed} ({malformed / lines * 100:.2f}%)" if lines else "0",
+            "parse": str(sum(current["parse_errors"].values())),
+            "reconnects": str(current.get("reconnects", 0)),
+        }
+        if previous is None or previous.get("source") != current.get("source"):
+            self.set_values(values)  # first sample of this vehicle: rates from the next one on
+            return
+
+        rate = rates(previous, current)
+        values["rx"] = f"{rate['bytes_per_s'] / 1000:.1f} kB/s"
+        values["lines"] = f"{rate['lines_per_s']:.0f}/s"
+        values["loss"] = "no SEQ" if rate["loss"] is None else f"{rate['loss'] * 100:.1f}%"
+        for kind in self.KINDS:
+            values[kind] = f"{rate['kinds_per_s'].get(kind, 0.0):.0f}/s"
+        self.set_values(values)
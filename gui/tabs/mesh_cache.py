@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import numpy as np
+from .mesh_renderer import MeshData
+from .mesh_lod import LOD_RATIOS, decimate_to_ratio
+
+CACHE_VERSION = 1
+ARRAYS = ("vertices", "normals", "indices")
+
+
+def default_cache_dir(obj_path):
+    return os.path.join(os.path.dirname(os.path.abspath(obj_path)), ".mesh_cache")
+
+
+def file_signature(path, with_hash=True):
+    """mtime, size and (optionally) SHA-1 of a source file, or None if it does not exist."""
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    signature = {"mtime": stat.st_mtime, "size": stat.st_size}
+    if with_hash:
+        sha1 = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha1.update(chunk)
+        signature["sha1"] = sha1.hexdigest()
+    return signature
+
+
+def parse_mtl_colors(mtl_path):
+    """Map material name -> (r, g, b, a) from the ``Kd`` / ``d`` / ``Tr`` entries of an .mtl file."""
+    colors = {}
+    if not mtl_path or not os.path.exists(mtl_path):
+        return colors
+
+    name = None
+    with open(mtl_path, "r", errors="ignore") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == "newmtl" and len(parts) > 1:
+                name = " ".join(parts[1:])
+                colors[name] = [0.8, 0.8, 0.8, 1.0]
+            elif name is None:
+                continue
+            elif parts[0] == "Kd" and len(parts) >= 4:
+                colors[name][:3] = [float(v) for v in parts[1:4]]
+            elif parts[0] == "d" and len(parts) >= 2:
+                colors[name][3] = float(parts[1])
+            elif parts[0] == "Tr" and len(parts) >= 2:
+                colors[name][3] = 1.0 - float(parts[1])
+    return {k: tuple(v) for k, v in colors.items()}
+
+
+class MeshCache:
+    """Preprocessed binary copy of an OBJ model so startup can skip pywavefront.
+
+    Each model gets a directory holding ``vertices.npy``, ``normals.npy``,
+    ``indices.npy`` and ``meta.json`` (material groups and colours, plus the
+    size, mtime and SHA-1 of the OBJ and MTL it was built from). Arrays are
+    loaded with ``mmap_mode="r"``. When a source mtime changes the file is
+    re-hashed; the cache is rebuilt only if the content actually changed.
+
+    ``lod`` > 0 selects a decimated level (see mesh_lod.LOD_RATIOS), built
+    from level 0 and cached in its own directory.
+    """
+
+    def __init__(self, obj_path, mtl_path=None, cache_dir=None, lod=0):
+        self.obj_path = obj_path
+        self.mtl_path = mtl_path
+        self.cache_dir = cache_dir or default_cache_dir(obj_path)
+        self.lod = lod
+        stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.splitext(os.path.basename(obj_path))[0])
+        if lod:
+            stem = f"{stem}.lod{lod}"
+        self.entry_dir = os.path.join(self.cache_dir, stem)
+        self.meta_path = os.path.join(self.entry_dir, "meta.json")
+
+    # ───────────── Public API ─────────────
+    def load(self):
+        """Return MeshData from the cache, rebuilding it from the OBJ when stale. Returns (mesh, from_cache)."""
+        meta = self._read_meta()
+        if meta is not None and self._is_fresh(meta):
+            try:
+                return self._load_arrays(meta), True
+            except (OSError, ValueError) as e:
+                print(f"[MeshCache] Cache unreadable, rebuilding: {e}")
+
+        mesh = self.build()
+        self.save(mesh)
+        return mesh, False
+
+    def build(self):
+        """Parse the OBJ with pywavefront and pack it (the slow path), or decimate level 0."""
+        if self.lod:
+            base, _ = MeshCache(self.obj_path, self.mtl_path, self.cache_dir).load()
+            start = time.perf_counter()
+            mesh = decimate_to_ratio(base, LOD_RATIOS[self.lod])
+            print(f"[MeshCache] Built LOD {self.lod} ({mesh.triangle_count} triangles) in "
+                  f"{(time.perf_counter() - start) * 1000:.0f} ms")
+            return mesh
+
+        import pywavefront
+
+        start = time.perf_counter()
+        model = pywavefront.Wavefront(self.obj_path, collect_faces=True, parse=True)
+        mesh = MeshData.from_wavefront(model, parse_mtl_colors(self.mtl_path))
+        print(f"[MeshCache] Parsed {os.path.basename(self.obj_path)} in "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+        return mesh
+
+    def save(self, mesh):
+        """Write the arrays and metadata atomically (build in a temp dir, then swap it in)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = f"{self.entry_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        for name in ARRAYS:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(getattr(mesh, name)))
+
+        meta = {
+            "version": CACHE_VERSION,
+            "obj": file_signature(self.obj_path),
+            "mtl": file_signature(self.mtl_path),
+            "groups": [[name, list(color), first, count] for name, color, first, count in mesh.groups],
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+
+        shutil.rmtree(self.entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, self.entry_dir)
+
+    def clear(self):
+        shutil.rmtree(self.entry_dir, ignore_errors=True)
+
+    # ───────────── Internals ─────────────
+    def _read_meta(self):
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("version") == CACHE_VERSION else None
+
+    def _is_fresh(self, meta):
+        touched = False
+        for key, path in (("obj", self.obj_path), ("mtl", self.mtl_path)):
+            cached = meta.get(key)
+            current = file_signature(path, with_hash=False)
+            if cached is None or current is None:
+                if cached != current:
+                    return False
+                continue
+            if cached["mtime"] == current["mtime"] and cached["size"] == current["size"]:
+                continue
+            # mtime moved (copy, checkout, touch) - only the content hash decides
+            if file_signature(path)["sha1"] != cached["sha1"]:
+                return False
+            cached["mtime"] = current["mtime"]
+            touched = True
+
+        if touched:
+            self._write_meta(meta)
+        return True
+
+    def _write_meta(self, meta):
+        try:
+            with open(self.meta_path, "w") as f:
+                json.dump(meta, f, indent=1)
+        except OSError:
+            pass
+
+    def _load_arrays(self, meta):
+        arrays = {name: np.load(os.path.join(self.entry_dir, f"{name}.npy"), mmap_mode="r")
+                  for name in ARRAYS}
+        groups = [(name, tuple(color), first, count) for name, color, first, count in meta["groups"]]
+        return MeshData(arrays["vertices"], arrays["normals"], arrays["indices"], groups)
+
+
+def load_mesh(obj_path, mtl_path=None, cache_dir=None):
+    """Load an OBJ as MeshData through the binary cache."""
+    start = time.perf_counter()
+    mesh, from_cache = MeshCache(obj_path, mtl_path, cache_dir).load()
+    source = "cache" if from_cache else "OBJ"
+    print(f"[MeshCache] Mesh ready from {source} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return mesh
+
+
+def load_lods(obj_path, mtl_path=None, cache_dir=None):
+    """Load every level in mesh_lod.LOD_RATIOS through the cache, finest first."""
+    start = time.perf_counter()
+    lods = [MeshCache(obj_path, mtl_path, cache_dir, lod=level).load()[0]
+            for level in range(len(LOD_RATIOS))]
+    print(f"[MeshCache] {len(lods)} LOD levels ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return lods
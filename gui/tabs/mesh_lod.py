@@ -0,0 +1,178 @@
+"""Mesh decimation and level-of-detail selection for the 3D orientation view.
+
+Decimation uses vertex clustering: vertices are snapped to a uniform grid,
+every cell collapses to the average of its vertices, and triangles that
+become degenerate or duplicated are dropped. It is fast enough to run on
+load (results are kept in the mesh cache) and can also be run offline:
+
+    python -m tabs.mesh_lod "assets/<model>.obj" --mtl "assets/<model>.mtl" [--write-obj]
+"""
+import argparse
+import os
+import numpy as np
+from .mesh_renderer import MeshData, compute_vertex_normals
+
+# Fraction of the full-resolution triangle count kept at each level (level 0 = original)
+LOD_RATIOS = (1.0, 0.5, 0.25, 0.1)
+
+
+def cluster_vertices(vertices, cell_size):
+    """Snap vertices to a grid of ``cell_size``. Returns (new vertices, old -> new index map)."""
+    vmin = vertices.min(axis=0)
+    cells = np.floor((vertices - vmin) / cell_size).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    _, remap, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    remap = remap.reshape(-1)
+
+    clustered = np.empty((len(counts), 3), dtype=np.float32)
+    for axis in range(3):
+        clustered[:, axis] = np.bincount(remap, weights=vertices[:, axis]) / counts
+    return clustered, remap
+
+
+def decimate(mesh, cell_size):
+    """Vertex-clustering decimation of MeshData, keeping one index range per material."""
+    vertices = np.asarray(mesh.vertices, dtype=np.float32)
+    clustered, remap = cluster_vertices(vertices, cell_size)
+
+    chunks = []
+    groups = []
+    first = 0
+    for name, color, group_first, count in mesh.groups:
+        tris = remap[np.asarray(mesh.indices[group_first:group_first + count])].reshape(-1, 3)
+        keep = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])
+        tris = tris[keep]
+        if not len(tris):
+            continue
+
+        # Collapsed cells often produce the same triangle several times
+        ordered = np.sort(tris, axis=1).astype(np.int64)
+        n = len(clustered)
+        _, unique_rows = np.unique((ordered[:, 0] * n + ordered[:, 1]) * n + ordered[:, 2],
+                                   return_index=True)
+        tris = tris[np.sort(unique_rows)]
+
+        chunks.append(tris.reshape(-1))
+        groups.append((name, color, first, tris.size))
+        first += tris.size
+
+    if not chunks:
+        return MeshData(np.zeros((0, 3), np.float32), np.zeros((0, 3), np.float32),
+                        np.zeros(0, np.uint32), [])
+
+    # Drop clustered vertices no triangle uses any more
+    indices = np.concatenate(chunks)
+    used, compact = np.unique(indices, return_inverse=True)
+    new_vertices = clustered[used]
+    new_indices = compact.reshape(-1).astype(np.uint32)
+    normals = compute_vertex_normals(new_vertices, new_indices)
+    return MeshData(new_vertices, normals, new_indices, groups)
+
+
+def decimate_to_ratio(mesh, ratio, iterations=10):
+    """Largest vertex-clustering decimation with at most ``ratio`` of the triangles of ``mesh``."""
+    if ratio >= 1.0 or mesh.triangle_count == 0:
+        return mesh
+
+    target = max(1, int(mesh.triangle_count * ratio))
+    vertices = np.asarray(mesh.vertices)
+    diagonal = float(np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0))) or 1.0
+
+    # Bisect the cell size in log space: small cells keep detail, large cells collapse it
+    low, high = np.log(diagonal / 4096), np.log(diagonal / 4)
+    best = None
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        candidate = decimate(mesh, float(np.exp(mid)))
+        if candidate.triangle_count <= target:
+            best = candidate
+            high = mid
+        else:
+            low = mid
+    return best if best is not None else decimate(mesh, float(np.exp(high)))
+
+
+def export_obj(mesh, path):
+    """Write MeshData as a Wavefront OBJ (one ``usemtl`` block per group)."""
+    with open(path, "w") as f:
+        f.write(f"# {mesh.triangle_count} triangles\n")
+        np.savetxt(f, mesh.vertices, fmt="v %.6f %.6f %.6f")
+        for name, _, first, count in mesh.groups:
+            f.write(f"usemtl {name}\n")
+            tris = np.asarray(mesh.indices[first:first + count]).reshape(-1, 3) + 1
+            np.savetxt(f, tris, fmt="f %d %d %d")
+
+
+class LodSelector:
+    """Picks the mesh level for the next frame from viewport size and measured frame time.
+
+    The viewport sets the finest useful level (no point drawing more triangles
+    than there are pixels to put them in). Measured frame time can push the
+    level coarser when it exceeds ``frame_budget_ms`` and lets it come back
+    once frames are comfortably under budget again.
+    """
+
+    def __init__(self, triangle_counts, frame_budget_ms=12.0, pixels_per_triangle=1.0,
+                 settle_frames=6):
+        self.triangle_counts = list(triangle_counts)
+        self.frame_budget_ms = frame_budget_ms
+        self.pixels_per_triangle = pixels_per_triangle
+        self.settle_frames = settle_frames  # reported frames to wait between level changes
+
+        self.budget_level = 0
+        self.frame_ms = None  # exponential moving average
+        self._frames_since_change = 0
+
+    @property
+    def max_level(self):
+        return len(self.triangle_counts) - 1
+
+    def size_level(self, width, height):
+        pixel_budget = max(1, width * height) / self.pixels_per_triangle
+        for level, count in enumerate(self.triangle_counts):
+            if count <= pixel_budget:
+                return level
+        return self.max_level
+
+    def select(self, width, height):
+        return max(self.size_level(width, height), self.budget_level)
+
+    def report_frame(self, frame_ms):
+        """Feed the measured time of the last frame."""
+        self.frame_ms = frame_ms if self.frame_ms is None else 0.9 * self.frame_ms + 0.1 * frame_ms
+        self._frames_since_change += 1
+        if self._frames_since_change < self.settle_frames:
+            return
+
+        if self.frame_ms > self.frame_budget_ms and self.budget_level < self.max_level:
+            self._change_budget_level(+1)
+        elif self.frame_ms < self.frame_budget_ms * 0.4 and self.budget_level > 0:
+            self._change_budget_level(-1)
+
+    def _change_budget_level(self, step):
+        self.budget_level += step
+        self.frame_ms = None
+        self._frames_since_change = 0
+
+
+def main():
+    from .mesh_cache import load_lods
+
+    parser = argparse.ArgumentParser(description="Pre-generate the LOD levels of an OBJ model")
+    parser.add_argument("obj")
+    parser.add_argument("--mtl", default=None)
+    parser.add_argument("--write-obj", action="store_true",
+                        help="also write <model>.lod<N>.obj files next to the source")
+    args = parser.parse_args()
+
+    lods = load_lods(args.obj, args.mtl)
+    base = os.path.splitext(args.obj)[0]
+    for level, mesh in enumerate(lods):
+        print(f"[MeshLOD] Level {level}: {mesh.triangle_count} triangles")
+        if args.write_obj and level > 0:
+            export_obj(mesh, f"{base}.lod{level}.obj")
+
+
+if __name__ == "__main__":
+    main()
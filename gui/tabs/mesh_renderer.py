@@ -0,0 +1,160 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+# Used when a mesh has no material (matches the old alternating red / light gray look)
+FALLBACK_COLORS = [(0.9, 0.1, 0.1, 1.0), (0.95, 0.95, 0.95, 1.0)]
+
+
+class MeshData:
+    """Triangulated mesh packed into contiguous arrays, one index range per material.
+
+    vertices: (V, 3) float32 positions
+    normals:  (V, 3) float32 area-weighted vertex normals
+    indices:  (I,) uint32 triangle list, grouped by material
+    groups:   list of (material name, (r, g, b, a), first index, index count), one per colour
+    """
+
+    def __init__(self, vertices, normals, indices, groups):
+        self.vertices = vertices
+        self.normals = normals
+        self.indices = indices
+        self.groups = groups
+
+    @property
+    def triangle_count(self):
+        return len(self.indices) // 3
+
+    @classmethod
+    def from_wavefront(cls, model, material_colors=None):
+        """Build MeshData from a ``pywavefront.Wavefront`` loaded with ``collect_faces=True``.
+
+        material_colors optionally maps material name -> (r, g, b, a) and takes
+        precedence over the colours pywavefront read.
+        """
+        material_colors = material_colors or {}
+        vertices = np.asarray(model.vertices, dtype=np.float32).reshape(-1, 3)
+        vertex_count = len(vertices)
+
+        # Meshes that share a colour are packed into one index range -> one draw call each
+        chunks_by_color = {}
+        for i, mesh in enumerate(model.mesh_list):
+            triangles = triangulate_faces(mesh.faces)
+            if len(triangles):
+                # Drop faces that reference vertices the file never defined
+                triangles = triangles[(triangles < vertex_count).all(axis=1)]
+            if not len(triangles):
+                continue
+
+            color = FALLBACK_COLORS[i % 2]
+            name = mesh.name or f"mesh{i}"
+            if mesh.materials:
+                material = mesh.materials[0]
+                name = material.name
+                color = material_colors.get(name, tuple(material.diffuse[:3]) + (1.0,))
+
+            chunks_by_color.setdefault(color, (name, []))[1].append(triangles.reshape(-1))
+
+        index_chunks = []
+        groups = []
+        first = 0
+        for color, (name, chunks) in chunks_by_color.items():
+            flat = np.concatenate(chunks)
+            index_chunks.append(flat)
+            groups.append((name, color, first, len(flat)))
+            first += len(flat)
+
+        indices = (np.concatenate(index_chunks) if index_chunks
+                   else np.zeros(0, dtype=np.uint32)).astype(np.uint32)
+        normals = compute_vertex_normals(vertices, indices)
+        return cls(vertices, normals, indices, groups)
+
+
+def triangulate_faces(faces):
+    """Convert a list of vertex-index faces into an (F, 3) uint32 triangle array (fan triangulation)."""
+    if not faces:
+        return np.zeros((0, 3), dtype=np.uint32)
+
+    # Fast path: pywavefront already triangulates, so faces are usually all triangles
+    if all(len(face) == 3 for face in faces):
+        return np.asarray(faces, dtype=np.uint32)
+
+    triangles = []
+    for face in faces:
+        for k in range(1, len(face) - 1):
+            triangles.append((face[0], face[k], face[k + 1]))
+    return np.asarray(triangles, dtype=np.uint32).reshape(-1, 3)
+
+
+def compute_vertex_normals(vertices, indices):
+    """Area-weighted smooth normals for an indexed triangle list."""
+    normals = np.zeros_like(vertices, dtype=np.float32)
+    if not len(indices):
+        return normals
+
+    tris = indices.reshape(-1, 3)
+    v0 = vertices[tris[:, 0]]
+    face_normals = np.cross(vertices[tris[:, 1]] - v0, vertices[tris[:, 2]] - v0)
+    for k in range(3):
+        np.add.at(normals, tris[:, k], face_normals)
+
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    lengths[lengths == 0] = 1.0
+    return (normals / lengths).astype(np.float32)
+
+
+class MeshRenderer:
+    """Uploads MeshData to vertex buffer objects and draws it with one call per material.
+
+    All methods must be called with the owning GL context current.
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.vertex_buffer = None
+        self.normal_buffer = None
+        self.index_buffer = None
+
+    @property
+    def uploaded(self):
+        return self.index_buffer is not None
+
+    def upload(self):
+        self.vertex_buffer, self.normal_buffer, self.index_buffer = glGenBuffers(3)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.mesh.vertices.nbytes, self.mesh.vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, self.normal_buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.mesh.normals.nbytes, self.mesh.normals, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.mesh.indices.nbytes, self.mesh.indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        if not self.uploaded:
+            return
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, self.normal_buffer)
+        glNormalPointer(GL_FLOAT, 0, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+
+        for _, color, first, count in self.mesh.groups:
+            glColor4f(*color)
+            glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(first * 4))
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def release(self):
+        if self.uploaded:
+            glDeleteBuffers(3, [self.vertex_buffer, self.normal_buffer, self.index_buffer])
+        self.vertex_buffer = self.normal_buffer = self.index_buffer = None
@@ -1,64 +1,90 @@
 # tabs/orientation_3d_tab.py - OPTIMIZED FOR REAL-TIME RESPONSE
 import os
+import sys
+import time
 import numpy as np
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
-from PyQt5.QtOpenGL import QGLWidget
+from PyQt5.QtOpenGL import QGLWidget, QGLFormat
 from PyQt5.QtCore import QTimer, pyqtSignal, Qt
 from OpenGL.GL import *
 from OpenGL.GLU import *
-import pywavefront
 import threading
 from collections import deque
+from .mesh_renderer import MeshRenderer
+from .mesh_cache import load_lods
+from .mesh_lod import LodSelector
+from .orientation_math import PoseBuffer, quat_from_euler, quat_to_matrix
+from .pose_mailbox import PoseMailbox
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from telemetry import parse_fields, parse_number
+from telemetry_bus import TelemetryBus
 
 class Orientation3DTab(QWidget):
-    def __init__(self, obj_path, mtl_path, serial_reader=None):
+    def __init__(self, obj_path, mtl_path, serial_reader=None, extrapolate=False, gyro_scale=1.0):
         super().__init__()
         self.serial_reader = serial_reader  
+        self.gyro_scale = gyro_scale  # deg/s per GYRO count
         self.layout = QVBoxLayout(self)
-        self.viewer = GLViewer(obj_path)
+        self.viewer = GLViewer(obj_path, mtl_path, extrapolate=extrapolate)
         self.layout.addWidget(self.viewer)
 
-        # Direct connection for immediate updates
+        # Direct subscriptions: every attitude and IMU sample of one vehicle (the
+        # stream's focus, also when aggregating), parsed in the link's reader thread
+        # as soon as it arrives. update_orientation only touches the viewer's
+        # mailboxes, never the widget itself, so this is safe.
         if self.serial_reader:
-            try:
-                # Try direct connection for maximum speed
-                self.serial_reader.data_received.connect(self.update_orientation, Qt.DirectConnection)
-            except:
-                # Fallback to normal connection if direct fails
-                self.serial_reader.data_received.connect(self.update_orientation)
+            bus = TelemetryBus.of(getattr(self.serial_reader, "focus", self.serial_reader))
+            bus.subscribe("ATTITUDE", self.update_orientation, direct=True)
+            bus.subscribe("IMU", self.update_orientation, direct=True)
 
     def update_orientation(self, data):
-        """Ultra-fast orientation parsing - optimized for minimal latency"""
-        if 'ROLL:' not in data:
+        """Parse attitude (and gyro rates for extrapolation), stamped with the arrival time.
+
+        Runs on the link's reader thread (the GUI thread for catch-up lines on a
+        vehicle switch) - results go through GLViewer.post_*().
+        """
+        arrival = time.perf_counter()
+        if 'ROLL' not in data and 'GYRO' not in data:
             return
-            
+
         try:
-            # Pre-compile common operations
-            parts = data.split('|')
+            fields = parse_fields(data)
+            # Optional device timestamp in milliseconds, e.g. "TS: 123456"
+            device_time = parse_number(fields['TS']) / 1000.0 if 'TS' in fields else None
+
             orientation = {}
-            
-            # Batch process all parts at once
-            for part in parts:
-                part_upper = part.strip().upper()
-                if 'ROLL:' in part_upper:
-                    orientation['roll'] = float(part_upper.split('ROLL:')[1].strip().replace('°', ''))
-                elif 'PITCH:' in part_upper:
-                    orientation['pitch'] = float(part_upper.split('PITCH:')[1].strip().replace('°', ''))
-                elif 'YAW:' in part_upper:
-                    orientation['yaw'] = float(part_upper.split('YAW:')[1].strip().replace('°', ''))
-            
-            # Immediate update - no smoothing, no delays
+            for key, name in (('ROLL', 'roll'), ('PITCH', 'pitch'), ('YAW', 'yaw')):
+                if key in fields:
+                    value = parse_number(fields[key])
+                    if value is not None:
+                        orientation[name] = value
             if orientation:
-                self.viewer.set_orientation_immediate(orientation)
-                    
+                orientation['timestamp'] = arrival
+                orientation['device_time'] = device_time
+                self.viewer.post_orientation(orientation)
+
+            if 'GYRO' in fields and self.viewer.pose_buffer.extrapolate:
+                rates = [float(v) * self.gyro_scale for v in fields['GYRO'].split(',')[:3]]
+                if len(rates) == 3:
+                    self.viewer.post_rates(rates, arrival)
+
         except Exception as e:
             print(f"[Orientation3DTab] Parse error: {e}")
 
 class GLViewer(QGLWidget):
-    def __init__(self, obj_path, parent=None):
-        super(GLViewer, self).__init__(parent)
+    # Achieved frames per second and average paintGL time in ms, about once a second
+    frame_stats_updated = pyqtSignal(float, float)
+    # Emitted (from any thread) when a mailbox goes from empty to full
+    mailbox_posted = pyqtSignal()
+
+    def __init__(self, obj_path, mtl_path=None, parent=None, extrapolate=False):
+        # Swap on vertical sync so presented frames never outrun the display
+        fmt = QGLFormat()
+        fmt.setSwapInterval(1)
+        super(GLViewer, self).__init__(fmt, parent)
         self.obj_path = obj_path
-        self.model = None
+        self.mtl_path = mtl_path
+        self.lods = []  # MeshData per level of detail, finest first
         
         # Current orientation - allow FULL 360° range
         self.rotation_x = 0.0  # Pitch (-180 to +180)
@@ -69,20 +95,40 @@ class GLViewer(QGLWidget):
         self.cumulative_x = 0.0
         self.cumulative_y = 0.0  
         self.cumulative_z = 0.0
+        self.last_pose = None
+
+        # Timestamped quaternion samples; paintGL slerps them to the display time
+        self.pose_buffer = PoseBuffer(extrapolate=extrapolate)
+
+        # Latest-value mailboxes written by the serial thread, drained on the GUI thread
+        self.pose_mailbox = PoseMailbox()
+        self.rate_mailbox = PoseMailbox()
+        self.mailbox_posted.connect(self.drain_mailboxes, Qt.QueuedConnection)
         
         # Performance optimizations
-        self.display_list = None  # Pre-compiled geometry
+        self.renderers = []  # VBO-backed mesh per LOD level, one draw call per material
+        self.lod_selector = None
+        self.lod_level = 0
+        self.lod_probe_interval = 5  # every Nth frame is timed with glFinish for LOD selection
         self.model_loaded = False
         
-        # Maximum refresh rate timer
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update)
-        self.update_timer.start(16)  # 60 FPS (can go to 8ms for 120 FPS if needed)
-        
-        # Track last update time for performance monitoring
-        import time
-        self.last_update = time.time()
+        # ───────────── Demand-Driven Render Loop ─────────────
+        # Frames are only scheduled when the pose changed, at most once per
+        # display refresh, and never while the widget is hidden.
+        self.needs_frame = True
+        self.frame_interval_ms = 1000.0 / 60.0
+        self.last_frame_time = 0.0
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.timeout.connect(self.render_frame)
+
+        # Frame statistics (exposed through frame_stats() / frame_stats_updated)
         self.frame_count = 0
+        self.stats_window_start = time.perf_counter()
+        self.stats_window_frames = 0
+        self.fps = 0.0
+        self.frame_ms = 0.0
 
     def initializeGL(self):
         """Initialize OpenGL with performance optimizations"""
@@ -95,6 +141,7 @@ class GLViewer(QGLWidget):
         glEnable(GL_LIGHTING)
         glEnable(GL_LIGHT0)
         glEnable(GL_COLOR_MATERIAL)
+        glEnable(GL_NORMALIZE)  # model is scaled down, keep the normals unit length
         glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
         
         # Background
@@ -105,40 +152,23 @@ class GLViewer(QGLWidget):
         glLightfv(GL_LIGHT0, GL_DIFFUSE, [0.8, 0.8, 0.8, 1.0])
         glLightfv(GL_LIGHT0, GL_AMBIENT, [0.2, 0.2, 0.2, 1.0])
 
-        # Load model and create display list for maximum performance
+        # Load model and upload it to vertex buffers
         self.load_model_optimized()
 
     def load_model_optimized(self):
-        """Load model once and compile to display list for maximum performance"""
+        """Load the packed mesh levels (binary cache, OBJ only when it changed) and upload them to VBOs"""
         try:
             print(f"[GLViewer] Loading model: {self.obj_path}")
-            self.model = pywavefront.Wavefront(self.obj_path, collect_faces=True, parse=True)
-            
-            # Create display list for ultra-fast rendering
-            self.display_list = glGenLists(1)
-            glNewList(self.display_list, GL_COMPILE)
-            
-            # Pre-compile all geometry
-            for i, mesh in enumerate(self.model.mesh_list):
-                # Alternate colors for visual appeal
-                if i % 2:
-                    glColor3f(0.95, 0.95, 0.95)  # Light gray
-                else:
-                    glColor3f(0.9, 0.1, 0.1)     # Red
-                
-                # Render faces
-                for face in mesh.faces:
-                    if len(face) >= 3:
-                        glBegin(GL_POLYGON)
-                        for vertex_i in face:
-                            if vertex_i < len(self.model.vertices):
-                                glVertex3f(*self.model.vertices[vertex_i])
-                        glEnd()
-            
-            glEndList()
+            self.lods = load_lods(self.obj_path, self.mtl_path)
+
+            self.renderers = [MeshRenderer(mesh) for mesh in self.lods]
+            for renderer in self.renderers:
+                renderer.upload()
+            self.lod_selector = LodSelector([mesh.triangle_count for mesh in self.lods])
             self.model_loaded = True
-            print("[GLViewer] Model compiled to display list - maximum performance achieved")
-            
+            print(f"[GLViewer] Model uploaded: {self.lods[0].triangle_count} triangles, "
+                  f"{len(self.lods)} LOD levels, {len(self.lods[0].groups)} draw calls")
+
         except Exception as e:
             print(f"[GLViewer] Model load error: {e}")
             self.model_loaded = False
@@ -152,7 +182,8 @@ class GLViewer(QGLWidget):
         glMatrixMode(GL_MODELVIEW)
 
     def paintGL(self):
-        """Ultra-fast rendering - called 60+ times per second"""
+        """Render one frame - only scheduled when the pose changed"""
+        paint_start = time.perf_counter()
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glLoadIdentity()
 
@@ -165,30 +196,91 @@ class GLViewer(QGLWidget):
         # Position drone lower so full frame is always visible
         glTranslatef(0, 8.0, 0)  # Moved down from 18.0 to 8.0 for better visibility
         
-        # FULL 360° 3D ROTATIONS - Apply STM32 movements directly
-        # Apply in proper order for aircraft-like movement
-        
-        glRotatef(self.rotation_y, 0, 1, 0)  # YAW - spin around vertical axis (full 360°)
-        glRotatef(self.rotation_x, 1, 0, 0)  # PITCH - nose up/down (full 360°)
-        glRotatef(self.rotation_z, 0, 0, 1)  # ROLL - bank left/right (full 360°)
+        # Orientation as a quaternion resampled at display time - no gimbal lock,
+        # and telemetry jitter is smoothed by interpolating between timestamped samples
+        now = time.perf_counter()
+        glMultMatrixf(quat_to_matrix(self.pose_buffer.sample(now)))
         
         # Back to original tiny size
         glScalef(0.07, 0.07, 0.07)
 
-        # Render using pre-compiled display list (ultra-fast)
-        if self.model_loaded and self.display_list:
-            glCallList(self.display_list)
+        # Render from vertex buffers - one draw call per material, at the selected LOD
+        if self.model_loaded and self.renderers:
+            self.draw_model()
         
         glPopMatrix()
         
-        # Performance monitoring
+        self.record_frame((time.perf_counter() - paint_start) * 1000)
+
+        # Keep drawing while the interpolated / extrapolated pose is still moving
+        if self.pose_buffer.is_animating(now):
+            self.request_frame()
+
+    def draw_model(self):
+        """Draw the LOD picked from viewport size and measured frame time"""
+        self.lod_level = self.lod_selector.select(self.width(), self.height())
+        probe = self.frame_count % self.lod_probe_interval == 0
+
+        start = time.perf_counter()
+        self.renderers[self.lod_level].draw()
+        if probe:
+            glFinish()  # include the GPU work so software GL is measured honestly
+            self.lod_selector.report_frame((time.perf_counter() - start) * 1000)
+
+    # ───────────── Render Scheduling ─────────────
+    def request_frame(self):
+        """Mark the view dirty and schedule a repaint, capped at the display refresh rate"""
+        self.needs_frame = True
+        if not self.isVisible() or self.frame_timer.isActive():
+            return
+        elapsed_ms = (time.perf_counter() - self.last_frame_time) * 1000
+        self.frame_timer.start(max(0, int(self.frame_interval_ms - elapsed_ms)))
+
+    def render_frame(self):
+        # Pick up whatever the serial thread posted since the wake-up
+        self.drain_mailboxes()
+        self.frame_timer.stop()
+        if self.needs_frame and self.isVisible():
+            self.needs_frame = False
+            self.last_frame_time = time.perf_counter()
+            self.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        screen = self.screen() if hasattr(self, "screen") else None
+        if screen and screen.refreshRate() > 0:
+            self.frame_interval_ms = 1000.0 / screen.refreshRate()
+        self.drain_mailboxes()
+        self.request_frame()
+
+    def hideEvent(self, event):
+        # Hidden behind another tab: stop rendering entirely until shown again
+        self.frame_timer.stop()
+        super().hideEvent(event)
+
+    def record_frame(self, frame_ms):
         self.frame_count += 1
-        if self.frame_count % 60 == 0:  # Every 60 frames
-            import time
-            current_time = time.time()
-            fps = 60 / (current_time - self.last_update)
-            print(f"[GLViewer] FPS: {fps:.1f}")
-            self.last_update = current_time
+        self.stats_window_frames += 1
+        self.frame_ms = frame_ms if self.frame_ms == 0.0 else 0.9 * self.frame_ms + 0.1 * frame_ms
+
+        now = time.perf_counter()
+        window = now - self.stats_window_start
+        if window >= 1.0:
+            self.fps = self.stats_window_frames / window
+            self.stats_window_start = now
+            self.stats_window_frames = 0
+            self.frame_stats_updated.emit(self.fps, self.frame_ms)
+
+    def frame_stats(self):
+        """Achieved frame rate, smoothed paintGL time (ms), total frames and current LOD level"""
+        if time.perf_counter() - self.stats_window_start > 2.0:
+            self.fps = 0.0  # idle - nothing has been drawn recently
+        return {
+            "fps": self.fps,
+            "frame_ms": self.frame_ms,
+            "frames": self.frame_count,
+            "lod_level": self.lod_level,
+        }
 
     def test_movements(self):
         """Test function to verify correct axis mapping"""
@@ -200,7 +292,11 @@ class GLViewer(QGLWidget):
         # self.orientation_3d_tab.viewer.test_movements()
     
     def set_orientation_immediate(self, orientation):
-        """Set orientation with ZERO delay and FULL 360° movement capability"""
+        """Add an attitude sample (degrees) to the pose buffer. GUI thread only.
+
+        Optional keys: 'timestamp' (host time.perf_counter() of arrival, defaults
+        to now) and 'device_time' (seconds on the flight controller clock).
+        """
         
         # FULL 360° AXIS MAPPING - Direct values for complete rotation
         if 'pitch' in orientation:
@@ -215,19 +311,60 @@ class GLViewer(QGLWidget):
             # Yaw: STM32 left/right turn → drone yaw (full 360°)
             self.rotation_y = orientation['yaw']
         
-        # DON'T normalize angles - let them go beyond 360° for continuous rotation
-        # This allows for true continuous spinning without limits
-        
-        # Debug output showing exact values (no normalization)
-        print(f"STM32 → 3D: P={self.rotation_x:.1f}° R={self.rotation_z:.1f}° Y={self.rotation_y:.1f}°")
-        
-        # Force immediate redraw
-        self.update()
+        # Every sample is kept (even an unchanged one pins the pose in time),
+        # converted to a quaternion so large pitch angles cannot gimbal-lock
+        self.pose_buffer.add(
+            quat_from_euler(self.rotation_z, self.rotation_x, self.rotation_y),
+            orientation.get('timestamp'),
+            orientation.get('device_time'),
+        )
+
+        # Only repaint when the pose actually changed
+        pose = (self.rotation_x, self.rotation_y, self.rotation_z)
+        if pose != self.last_pose:
+            self.last_pose = pose
+            self.request_frame()
+
+    # ───────────── Cross-Thread Input ─────────────
+    def post_orientation(self, orientation):
+        """Thread-safe: hand an attitude sample to the render loop (latest one wins)"""
+        if self.pose_mailbox.post(orientation):
+            self.mailbox_posted.emit()
+
+    def post_rates(self, rates_dps, timestamp=None):
+        """Thread-safe: hand the latest gyro rates to the render loop"""
+        if self.rate_mailbox.post((rates_dps, timestamp)):
+            self.mailbox_posted.emit()
+
+    def drain_mailboxes(self):
+        """GUI thread: move posted samples into the pose buffer (requests a frame if the pose changed)"""
+        if not self.isVisible():
+            # Leave the newest sample in the (full) mailbox: further posts just overwrite
+            # it without waking this thread, and showEvent picks it up
+            return
+        rates = self.rate_mailbox.take()
+        if rates is not None:
+            self.set_rates(*rates)
+        orientation = self.pose_mailbox.take()
+        if orientation is not None:
+            self.set_orientation_immediate(orientation)
+
+    def set_rates(self, rates_dps, timestamp=None):
+        """Latest gyro rates (deg/s, X/Y/Z) used to extrapolate past the newest sample"""
+        self.pose_buffer.set_rates(rates_dps, timestamp)
+
+    def set_extrapolation(self, enabled):
+        """Render at 'now' by extrapolating with gyro rates instead of interpolating behind"""
+        self.pose_buffer.extrapolate = enabled
+        self.request_frame()
 
     def closeEvent(self, event):
         """Cleanup"""
-        if self.display_list:
-            glDeleteLists(self.display_list, 1)
+        if self.renderers:
+            self.makeCurrent()
+            for renderer in self.renderers:
+                renderer.release()
+            self.doneCurrent()
         super().closeEvent(event)
 
 
@@ -285,17 +422,17 @@ class OptimizedSerialReader:
 
 # KEY OPTIMIZATIONS SUMMARY:
 """
-1. **Display Lists**: Pre-compile 3D geometry for 10x faster rendering
-2. **Direct Connection**: Bypass Qt's event queue for immediate updates  
-3. **No Smoothing**: Direct value assignment, zero interpolation delay
-4. **High Refresh Rate**: 60 FPS rendering for smooth visuals
+1. **Vertex Buffers**: Mesh triangulated once into NumPy arrays and drawn from VBOs
+2. **Direct Connection + Mailbox**: Parse on the serial thread, hand the latest pose to the GUI lock-light
+3. **Quaternion Pose Buffer**: Timestamped samples slerped to display time (optional gyro extrapolation)
+4. **Demand-Driven Rendering**: Repaint only on pose change, capped at vsync, paused while hidden
 5. **Optimized Parsing**: Faster string processing
 6. **Thread Safety**: Proper threading for serial communication
-7. **Performance Monitoring**: FPS tracking to verify performance
+7. **Performance Monitoring**: GLViewer.frame_stats() / frame_stats_updated report FPS and frame time
 
 USAGE TIPS:
 - Set serial timeout to 0.001 for minimal latency  
-- Use Qt.DirectConnection for immediate signal processing
-- Monitor FPS output to verify 60+ FPS performance
+- Use Qt.DirectConnection only with slots that never touch widgets (see GLViewer.post_orientation)
+- Read viewer.frame_stats() to check achieved FPS and frame time
 - Adjust axis mappings in set_orientation_immediate() if movements are wrong
 """
\ No newline at end of file
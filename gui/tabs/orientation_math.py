@@ -0,0 +1,191 @@
+"""Quaternion helpers and a timestamped pose buffer for the 3D orientation view.
+
+Quaternions are ``(w, x, y, z)`` tuples in the OpenGL model frame used by
+GLViewer: yaw turns about +Y, pitch about +X and roll about +Z.
+"""
+import math
+import time
+from collections import deque
+
+IDENTITY = (1.0, 0.0, 0.0, 0.0)
+
+# Body rate axes (gyro X/Y/Z = roll/pitch/yaw rate) expressed in the GL model frame
+GYRO_AXES = ((0.0, 0.0, 1.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0))
+
+
+def quat_from_axis_angle(axis, degrees):
+    half = math.radians(degrees) / 2
+    s = math.sin(half)
+    return (math.cos(half), axis[0] * s, axis[1] * s, axis[2] * s)
+
+
+def quat_multiply(a, b):
+    aw, ax, ay, az = a
+    bw, bx, by, bz = b
+    return (
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    )
+
+
+def quat_normalize(q):
+    n = math.sqrt(sum(c * c for c in q))
+    if n == 0.0:
+        return IDENTITY
+    return tuple(c / n for c in q)
+
+
+def quat_from_euler(roll, pitch, yaw):
+    """Same rotation as glRotatef(yaw, 0,1,0); glRotatef(pitch, 1,0,0); glRotatef(roll, 0,0,1)."""
+    q_yaw = quat_from_axis_angle((0.0, 1.0, 0.0), yaw)
+    q_pitch = quat_from_axis_angle((1.0, 0.0, 0.0), pitch)
+    q_roll = quat_from_axis_angle((0.0, 0.0, 1.0), roll)
+    return quat_multiply(quat_multiply(q_yaw, q_pitch), q_roll)
+
+
+def quat_slerp(a, b, t):
+    """Spherical linear interpolation from a (t=0) to b (t=1) along the shortest arc."""
+    dot = sum(x * y for x, y in zip(a, b))
+    if dot < 0.0:
+        b = tuple(-c for c in b)
+        dot = -dot
+    if dot > 0.9995:
+        # Nearly parallel - lerp is accurate and avoids dividing by sin(~0)
+        return quat_normalize(tuple(x + (y - x) * t for x, y in zip(a, b)))
+
+    theta = math.acos(dot)
+    sin_theta = math.sin(theta)
+    wa = math.sin((1.0 - t) * theta) / sin_theta
+    wb = math.sin(t * theta) / sin_theta
+    return tuple(wa * x + wb * y for x, y in zip(a, b))
+
+
+def quat_integrate(q, rates_dps, dt):
+    """Rotate q by body rates (deg/s, gyro X/Y/Z) for dt seconds."""
+    wx = wy = wz = 0.0
+    for rate, axis in zip(rates_dps, GYRO_AXES):
+        wx += rate * axis[0]
+        wy += rate * axis[1]
+        wz += rate * axis[2]
+    speed = math.sqrt(wx * wx + wy * wy + wz * wz)
+    if speed == 0.0 or dt <= 0.0:
+        return q
+    axis = (wx / speed, wy / speed, wz / speed)
+    return quat_normalize(quat_multiply(q, quat_from_axis_angle(axis, speed * dt)))
+
+
+def quat_to_matrix(q):
+    """Column-major 4x4 rotation matrix for glMultMatrixf."""
+    w, x, y, z = q
+    return [
+        1 - 2 * (y * y + z * z), 2 * (x * y + w * z), 2 * (x * z - w * y), 0.0,
+        2 * (x * y - w * z), 1 - 2 * (x * x + z * z), 2 * (y * z + w * x), 0.0,
+        2 * (x * z + w * y), 2 * (y * z - w * x), 1 - 2 * (x * x + y * y), 0.0,
+        0.0, 0.0, 0.0, 1.0,
+    ]
+
+
+class PoseBuffer:
+    """Recent timestamped orientation samples, resampled at display time.
+
+    Samples carry host timestamps (``time.perf_counter()``), or device
+    timestamps that are mapped onto the host clock with a running minimum of
+    the arrival offset, so link jitter does not move them. ``sample()``
+    renders ``delay`` seconds in the past and slerps between the two samples
+    around that instant, which decouples the telemetry rate from the frame
+    rate. With ``extrapolate`` enabled the delay is zero and the newest
+    sample is carried forward with the latest gyro rates for up to
+    ``max_extrapolation`` seconds to hide link latency.
+    """
+
+    def __init__(self, size=64, extrapolate=False, max_extrapolation=0.1, max_delay=0.1):
+        self.samples = deque(maxlen=size)  # (host time, quaternion)
+        self.extrapolate = extrapolate
+        self.max_extrapolation = max_extrapolation
+        self.max_delay = max_delay
+
+        self.rates = (0.0, 0.0, 0.0)
+        self.rates_time = None
+        self.interval = None        # smoothed time between samples
+        self.device_offset = None   # host clock - device clock (running minimum)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def clear(self):
+        self.samples.clear()
+        self.interval = None
+        self.device_offset = None
+
+    def host_time(self, device_time=None, arrival=None):
+        """Map a device timestamp (seconds) onto the host clock."""
+        arrival = time.perf_counter() if arrival is None else arrival
+        if device_time is None:
+            return arrival
+        offset = arrival - device_time
+        if self.device_offset is None or offset < self.device_offset:
+            self.device_offset = offset
+        return device_time + self.device_offset
+
+    def add(self, quaternion, timestamp=None, device_time=None):
+        """Append a sample. ``timestamp`` is host time of arrival (defaults to now)."""
+        t = self.host_time(device_time, timestamp)
+        if self.samples:
+            last_t = self.samples[-1][0]
+            if t <= last_t:
+                # Out-of-order or duplicate stamp - replace rather than go back in time
+                self.samples[-1] = (last_t, quaternion)
+                return
+            dt = t - last_t
+            self.interval = dt if self.interval is None else 0.9 * self.interval + 0.1 * dt
+        self.samples.append((t, quaternion))
+
+    def set_rates(self, rates_dps, timestamp=None):
+        self.rates = tuple(rates_dps)
+        self.rates_time = time.perf_counter() if timestamp is None else timestamp
+
+    @property
+    def delay(self):
+        """How far behind real time the view is rendered."""
+        if self.extrapolate or self.interval is None:
+            return 0.0
+        return min(self.max_delay, 1.5 * self.interval)
+
+    def latest(self):
+        return self.samples[-1][1] if self.samples else IDENTITY
+
+    def sample(self, now=None):
+        """Orientation to show at ``now`` (host time)."""
+        if not self.samples:
+            return IDENTITY
+        now = time.perf_counter() if now is None else now
+        t = now - self.delay
+
+        newest_t, newest_q = self.samples[-1]
+        if t >= newest_t:
+            if self.extrapolate:
+                dt = min(t - newest_t, self.max_extrapolation)
+                return quat_integrate(newest_q, self.rates, dt)
+            return newest_q
+
+        # Walk back to the pair of samples around t
+        later_t, later_q = newest_t, newest_q
+        for earlier_t, earlier_q in reversed(self.samples):
+            if earlier_t <= t:
+                span = later_t - earlier_t
+                return quat_slerp(earlier_q, later_q, (t - earlier_t) / span if span else 1.0)
+            later_t, later_q = earlier_t, earlier_q
+        return self.samples[0][1]
+
+    def is_animating(self, now=None):
+        """True while sample() will still return different values as time passes."""
+        if not self.samples:
+            return False
+        now = time.perf_counter() if now is None else now
+        newest_t = self.samples[-1][0]
+        if now - self.delay < newest_t:
+            return True
+        return (self.extrapolate and any(self.rates)
+                and now - newest_t < self.max_extrapolation)
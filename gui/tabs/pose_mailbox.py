@@ -0,0 +1,50 @@
+import threading
+
+
+class PoseMailbox:
+    """Single-slot, latest-value mailbox between the serial thread and the render loop.
+
+    The reader thread ``post()``s every decoded sample; a newer sample simply
+    replaces one that has not been read yet. The GUI thread ``take()``s the
+    slot when it is about to render. Only the slot swap happens under the
+    lock, so neither side ever waits on the other's parsing or painting.
+
+    ``post()`` returns True when the slot goes from empty to full: that is
+    the only time the reader needs to wake the GUI thread, so wake-ups are
+    coalesced to at most one per frame.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self._full = False
+
+        # Diagnostics
+        self.posted = 0
+        self.taken = 0
+        self.overwritten = 0
+
+    def post(self, value):
+        with self._lock:
+            was_full = self._full
+            self._value = value
+            self._full = True
+            self.posted += 1
+            if was_full:
+                self.overwritten += 1
+        return not was_full
+
+    def take(self):
+        """Return the newest unread value, or None if nothing arrived since the last take."""
+        with self._lock:
+            if not self._full:
+                return None
+            value = self._value
+            self._value = None
+            self._full = False
+            self.taken += 1
+        return value
+
+    def peek(self):
+        with self._lock:
+            return self._value if self._full else None
@@ -2,6 +2,10 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QProgressBar, QPushButton, QGroupBox, QGridLayout
 )
+from command_link import NORMAL
+from link_stats import report_parse_error
+from telemetry import parse_fields, parse_number
+from .visibility_gate import VisibilityGate
 
 class RadioCalibrationTab(QWidget):
     def __init__(self, serial_reader=None):
@@ -12,6 +16,8 @@ class RadioCalibrationTab(QWidget):
         self.channel_count = 6
         self.channel_bars = []
         self.channel_labels = []
+        self.calibrating = False
+        self.channel_ranges = {}  # channel index -> [min, max] seen while calibrating
 
         layout = QVBoxLayout()
 
@@ -44,11 +50,79 @@ class RadioCalibrationTab(QWidget):
         button_layout.addWidget(self.reset_button)
         layout.addLayout(button_layout)
 
+        self.command_status_label = QLabel("")
+        self.command_status_label.setStyleSheet("color: #9e9e9e;")
+        layout.addWidget(self.command_status_label)
+
         self.setLayout(layout)
 
-        # Connect shared serial reader
+        # Connect shared serial reader (bars are only updated while the tab is visible;
+        # calibration extremes are recorded from every line, hidden or not)
+        self.display_gate = VisibilityGate(self, self.handle_serial_data)
         if self.reader:
-            self.reader.data_received.connect(self.handle_serial_data)
+            self.reader.data_received.connect(self.display_gate.feed)
+            self.reader.data_received.connect(self.record_extremes)
+
+        # Calibration commands go to the flight controller over the command uplink
+        self.calibrate_button.clicked.connect(self.toggle_calibration)
+        self.save_button.clicked.connect(self.save_calibration)
+        self.reset_button.clicked.connect(self.reset_calibration)
+        if hasattr(self.reader, "send_command"):
+            self.reader.command_status.connect(self.on_command_status)
+        else:
+            for button in (self.calibrate_button, self.save_button, self.reset_button):
+                button.setEnabled(False)
+
+    # ───────────── Calibration Commands ─────────────
+    def send_command(self, args):
+        seq = self.reader.send_command("RC_CAL", args, NORMAL)
+        if seq is None:
+            self.command_status_label.setText("RC_CAL not sent - select a single vehicle")
+        else:
+            self.command_status_label.setText(f"RC_CAL {args.split()[0]} queued (#{seq})")
+        return seq
+
+    def toggle_calibration(self):
+        """Start recording stick extremes, or stop and keep what was recorded."""
+        self.calibrating = not self.calibrating
+        if self.calibrating:
+            self.channel_ranges = {}
+            self.send_command("START")
+            self.calibrate_button.setText("Stop")
+        else:
+            self.send_command("STOP")
+            self.calibrate_button.setText("Calibrate")
+
+    def save_calibration(self):
+        if not self.channel_ranges:
+            self.command_status_label.setText("Nothing to save - calibrate first")
+            return
+        ranges = ",".join(f"CH{i + 1}={lo}-{hi}" for i, (lo, hi) in sorted(self.channel_ranges.items()))
+        self.send_command(f"SAVE {ranges}")
+
+    def reset_calibration(self):
+        self.calibrating = False
+        self.channel_ranges = {}
+        self.calibrate_button.setText("Calibrate")
+        self.send_command("RESET")
+
+    def on_command_status(self, seq, name, status, detail):
+        if name == "RC_CAL":
+            self.command_status_label.setText(f"RC_CAL #{seq}: {status} {detail}".strip())
+
+    def record_extremes(self, line):
+        """Widen the calibration range of each channel (ungated: no sample is lost while hidden)."""
+        if not self.calibrating or "CH1:" not in line:
+            return
+        for key, text in parse_fields(line).items():
+            if not (key.startswith("CH") and key[2:].isdigit()):
+                continue
+            ch_index = int(key[2:]) - 1
+            value = parse_number(text)
+            if 0 <= ch_index < self.channel_count and value is not None and 1000 <= value <= 2000:
+                value = int(value)
+                seen = self.channel_ranges.setdefault(ch_index, [value, value])
+                seen[0], seen[1] = min(seen[0], value), max(seen[1], value)
 
     def handle_serial_data(self, line):
         try:
@@ -83,6 +157,8 @@ class RadioCalibrationTab(QWidget):
                                     
                             except (ValueError, IndexError) as e:
                                 print(f"[Radio Tab] Error parsing '{part}': {e}")
+                                report_parse_error(self.reader, "Radio Calibration")
                                 
         except Exception as e:
-            print(f"[Radio Tab] Failed to parse line: {line} — {e}")
\ No newline at end of file
+            print(f"[Radio Tab] Failed to parse line: {line} — {e}")
+            report_parse_error(self.reader, "Radio Calibration")
\ No newline at end of file
@@ -0,0 +1,275 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtGui import (QPainter, QColor, QPen, QFont, QFontMetrics, QStaticText,
+                         QLinearGradient, QBrush, QTransform)
+from PyQt5.QtCore import Qt, QObject, QRect, QRectF, QPointF, QSize, pyqtSignal
+from .cached_layer import CachedLayer
+
+
+class TelemetryModel(QObject):
+    """Latest display text of each telemetry field, keyed by field name.
+
+    ``update()`` takes a dict of new values and emits ``fields_changed`` once
+    with the keys whose text actually changed.
+    """
+    fields_changed = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values = {}
+
+    def value(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set_value(self, key, text):
+        self.update({key: text})
+
+    def update(self, values):
+        changed = [key for key, text in values.items() if self.values.get(key) != text]
+        if changed:
+            for key in changed:
+                self.values[key] = values[key]
+            self.fields_changed.emit(changed)
+
+
+class PanelField:
+    """One field of a TelemetryPanel.
+
+    ``style`` is the background/border treatment: "fill", "left" (accent bar
+    on the left), "box" (1 px outline), "gradient" (fading fill plus left
+    bar) or "none". Left-aligned fields paint ``caption`` once as static
+    text and only the value changes; centred fields show ``caption + value``
+    as one line.
+    """
+
+    def __init__(self, key, caption, value="--", color="#EAEAEA", style="fill",
+                 font_size=14, align=Qt.AlignLeft, span=1):
+        self.key = key
+        self.caption = caption
+        self.default = value
+        self.color = QColor(color)
+        self.style = style
+        self.font_size = font_size
+        self.align = align
+        self.span = span
+
+        # Set by TelemetryPanel
+        self.font = None
+        self.rect = QRect()
+        self.value_rect = QRect()
+        self.caption_text = None
+        self.value_text = None
+
+
+class TelemetryPanel(QWidget):
+    """Telemetry readouts painted by one widget instead of a QLabel per value.
+
+    Section frames, field backgrounds and captions are painted once into a
+    cached pixmap. Values are QStaticText objects re-laid out only when
+    their text changes, and a change repaints just that field's value
+    rectangle - no style polishing or layout pass per update.
+
+    ``sections`` is a list of ``(title, [PanelField, ...], columns)``.
+    """
+    MARGIN = 4
+    TITLE_HEIGHT = 26
+    SECTION_PADDING = 10
+    SECTION_SPACING = 12
+    FIELD_SPACING = 6
+    FIELD_PADDING = 6
+
+    def __init__(self, sections, model=None, parent=None):
+        super().__init__(parent)
+        self.sections = sections
+        self.model = model or TelemetryModel(self)
+        self.model.fields_changed.connect(self.on_fields_changed)
+        self.fields = {field.key: field for _, fields, _ in sections for field in fields}
+
+        self.title_font = QFont()
+        self.title_font.setPixelSize(16)
+        self.title_font.setBold(True)
+        self.title_font.setLetterSpacing(QFont.AbsoluteSpacing, 1)
+        self.frame_pen = QPen(QColor("#007ACC"), 2)
+        self.frame_brush = QColor("#1e1e1e")
+        self.title_background = QColor("#121212")
+
+        for field in self.fields.values():
+            field.font = QFont()
+            field.font.setPixelSize(field.font_size)
+            field.font.setBold(True)
+            if field.align == Qt.AlignLeft:
+                field.caption_text = self._static_text(field.caption, field.font)
+            self._set_value_text(field, self.model.value(field.key, field.default))
+
+        self.static_layer = CachedLayer(self, self.paint_static)
+        self.content_height = 0
+        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        self.layout_fields(320)
+
+    # ───────────── Values ─────────────
+    def set_values(self, values):
+        """Shortcut for ``panel.model.update(values)``."""
+        self.model.update(values)
+
+    def on_fields_changed(self, keys):
+        for key in keys:
+            field = self.fields.get(key)
+            if field is None:
+                continue
+            self._set_value_text(field, self.model.values[key])
+            self.update(field.value_rect)
+
+    def _set_value_text(self, field, value):
+        text = value if field.align == Qt.AlignLeft else f"{field.caption} {value}"
+        field.value_text = self._static_text(text, field.font)
+
+    @staticmethod
+    def _static_text(text, font):
+        static_text = QStaticText(text)
+        static_text.setTextFormat(Qt.PlainText)
+        static_text.setPerformanceHint(QStaticText.AggressiveCaching)
+        static_text.prepare(QTransform(), font)
+        return static_text
+
+    # ───────────── Layout ─────────────
+    def layout_fields(self, width):
+        y = self.MARGIN
+        for title, fields, columns in self.sections:
+            inner_left = self.MARGIN + self.SECTION_PADDING
+            inner_width = width - 2 * inner_left
+            column_width = (inner_width - (columns - 1) * self.FIELD_SPACING) / columns
+            y += self.TITLE_HEIGHT + 4
+
+            column = 0
+            for field in fields:
+                span = min(field.span, columns)
+                if column + span > columns:
+                    column = 0
+                    y += self._row_height(fields) + self.FIELD_SPACING
+                x = inner_left + column * (column_width + self.FIELD_SPACING)
+                field.rect = QRect(int(x), y, int(column_width * span + (span - 1) * self.FIELD_SPACING),
+                                   self._row_height(fields))
+                self._layout_value_rect(field)
+                column += span
+            y += self._row_height(fields) + self.SECTION_PADDING + self.SECTION_SPACING
+
+        self.content_height = y - self.SECTION_SPACING + self.MARGIN
+        self.setMinimumHeight(self.content_height)
+        self.static_layer.invalidate()
+
+    def _row_height(self, fields):
+        return max(QFontMetrics(f.font).height() for f in fields) + 2 * self.FIELD_PADDING
+
+    def _layout_value_rect(self, field):
+        inner = field.rect.adjusted(self.FIELD_PADDING + self._accent_width(field), 0,
+                                    -self.FIELD_PADDING, 0)
+        if field.align == Qt.AlignLeft:
+            caption_width = int(field.caption_text.size().width()) + 6
+            inner.setLeft(inner.left() + caption_width)
+        field.value_rect = inner
+
+    @staticmethod
+    def _accent_width(field):
+        return {"left": 4, "gradient": 3}.get(field.style, 0)
+
+    def section_frames(self):
+        """(title, frame rect) for every section, in widget coordinates."""
+        frames = []
+        for title, fields, _ in self.sections:
+            top = min(f.rect.top() for f in fields) - self.TITLE_HEIGHT // 2 - 4
+            bottom = max(f.rect.bottom() for f in fields) + self.SECTION_PADDING
+            frames.append((title, QRect(self.MARGIN, top, self.width() - 2 * self.MARGIN, bottom - top)))
+        return frames
+
+    def sizeHint(self):
+        return QSize(320, self.content_height)
+
+    def minimumSizeHint(self):
+        return QSize(200, self.content_height)
+
+    def resizeEvent(self, event):
+        self.layout_fields(self.width())
+        super().resizeEvent(event)
+
+    # ───────────── Painting ─────────────
+    def paint_static(self, painter, rect):
+        for title, frame in self.section_frames():
+            painter.setPen(self.frame_pen)
+            painter.setBrush(self.frame_brush)
+            painter.drawRoundedRect(QRectF(frame).adjusted(1, 1, -1, -1), 10, 10)
+
+            painter.setFont(self.title_font)
+            title_width = QFontMetrics(self.title_font).horizontalAdvance(title) + 16
+            title_rect = QRect(frame.left() + 8, frame.top() - self.TITLE_HEIGHT // 2,
+                               title_width, self.TITLE_HEIGHT)
+            painter.fillRect(title_rect, self.title_background)
+            painter.setPen(Qt.white)
+            painter.drawText(title_rect, Qt.AlignCenter, title)
+
+        for field in self.fields.values():
+            self.paint_field_background(painter, field)
+            if field.caption_text is not None:
+                painter.setFont(field.font)
+                painter.setPen(field.color)
+                x = field.rect.left() + self.FIELD_PADDING + self._accent_width(field)
+                painter.drawStaticText(self._text_origin(field.caption_text, x, field.rect), field.caption_text)
+
+    def paint_field_background(self, painter, field):
+        if field.style == "none":
+            return
+        rect = QRectF(field.rect)
+        fill = QColor(field.color)
+        fill.setAlphaF(0.1)
+        painter.setPen(Qt.NoPen)
+        if field.style == "gradient":
+            gradient = QLinearGradient(rect.topLeft(), rect.topRight())
+            start, end = QColor(field.color), QColor(field.color)
+            start.setAlphaF(0.2)
+            end.setAlphaF(0.05)
+            gradient.setColorAt(0, start)
+            gradient.setColorAt(1, end)
+            painter.setBrush(QBrush(gradient))
+        else:
+            painter.setBrush(fill)
+        if field.style == "box":
+            painter.setPen(QPen(field.color, 1))
+            rect = rect.adjusted(0.5, 0.5, -0.5, -0.5)
+        painter.drawRoundedRect(rect, 5, 5)
+
+        accent = self._accent_width(field)
+        if accent:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(field.color)
+            painter.drawRoundedRect(QRectF(rect.left(), rect.top(), accent, rect.height()), 1.5, 1.5)
+
+    @staticmethod
+    def _text_origin(static_text, x, rect):
+        return QPointF(x, rect.top() + (rect.height() - static_text.size().height()) / 2)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        region = event.region()
+
+        # Static layer for the dirty rectangles only, then the values inside them
+        pixmap = self.static_layer.pixmap()
+        dpr = pixmap.devicePixelRatio()
+        for dirty in region.rects():
+            source = QRectF(dirty.x() * dpr, dirty.y() * dpr, dirty.width() * dpr, dirty.height() * dpr)
+            painter.drawPixmap(QRectF(dirty), pixmap, source)
+
+        for field in self.fields.values():
+            if not region.intersects(field.value_rect):
+                continue
+            text = field.value_text
+            painter.setFont(field.font)
+            painter.setPen(field.color)
+            overflow = text.size().width() > field.value_rect.width()
+            if overflow:
+                painter.save()
+                painter.setClipRect(field.value_rect)
+            if field.align == Qt.AlignLeft:
+                x = field.value_rect.left()
+            else:
+                x = field.value_rect.left() + max(0, (field.value_rect.width() - text.size().width()) / 2)
+            painter.drawStaticText(self._text_origin(text, x, field.value_rect), text)
+            if overflow:
+                painter.restore()
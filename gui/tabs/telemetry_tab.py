@@ -1,10 +1,29 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox, QTextEdit, QGridLayout
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox, QTextEdit
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 from datetime import datetime
+from link_stats import report_parse_error
+from telemetry_bus import TelemetryBus
+from .visibility_gate import VisibilityGate
+from .telemetry_panel import TelemetryPanel, PanelField
+from .link_status_panel import LinkStatusPanel
 
 class TelemetryTab(QWidget):
+    LOG_HISTORY = 500  # log lines kept while the tab is hidden
+    LABEL_RATE_HZ = 10  # overview readouts: nobody reads numbers faster than this
+    LABEL_KINDS = ("ATTITUDE", "BARO", "GPS", "MODE")  # GPS: fix lines may carry the only ALT
+
+    # Connection state (SerialReader.connection_state_changed) -> label text, colour
+    CONNECTION_STATES = {
+        "connected": ("Connected", "#00E676"),
+        "no_data": ("No Data", "#FFCA28"),
+        "connecting": ("Connecting...", "#FFCA28"),
+        "reconnecting": ("Reconnecting...", "#FF7043"),
+        "searching": ("Searching for device...", "#F44336"),
+        "disconnected": ("Disconnected", "#F44336"),
+    }
+
     def __init__(self, serial_reader=None):
         super().__init__()
         self.reader = serial_reader
@@ -14,30 +33,21 @@ class TelemetryTab(QWidget):
         self.setLayout(main_layout)
 
         # ───────────── Telemetry Overview ─────────────
-        overview_group = QGroupBox("Telemetry Overview")
-        overview_layout = QGridLayout()
-        overview_group.setLayout(overview_layout)
-
-        # Labels for telemetry data
-        self.roll_label = self._create_label("Roll: --°", "#EF5350")     # Red
-        self.pitch_label = self._create_label("Pitch: --°", "#5C6BC0")   # Blue
-        self.yaw_label = self._create_label("Yaw: --°", "#FFCA28")       # Yellow
-        self.mode_label = self._create_label("Mode: Unknown", "#00E676") # Green
-
-        self.alt_label = self._create_label("Altitude: -- m", "#66BB6A") # Green
-        self.temp_label = self._create_label("Temp: -- °C", "#FF7043")   # Orange
-        self.press_label = self._create_label("Pressure: -- hPa", "#26C6DA") # Cyan
-
-        # Place labels in a 2x3 grid
-        overview_layout.addWidget(self.roll_label, 0, 0)
-        overview_layout.addWidget(self.pitch_label, 0, 1)
-        overview_layout.addWidget(self.yaw_label, 0, 2)
-        overview_layout.addWidget(self.alt_label, 1, 0)
-        overview_layout.addWidget(self.temp_label, 1, 1)
-        overview_layout.addWidget(self.press_label, 1, 2)
-        overview_layout.addWidget(self.mode_label, 2, 0, 1, 3)
-
-        main_layout.addWidget(overview_group)
+        # All readouts are painted by one TelemetryPanel (2x3 grid plus the mode row)
+        def field(key, caption, value, color, span=1):
+            return PanelField(key, caption, value, color, style="none",
+                              font_size=16, align=Qt.AlignCenter, span=span)
+
+        self.overview_panel = TelemetryPanel([("Telemetry Overview", [
+            field("roll", "Roll:", "--°", "#EF5350"),                # Red
+            field("pitch", "Pitch:", "--°", "#5C6BC0"),              # Blue
+            field("yaw", "Yaw:", "--°", "#FFCA28"),                  # Yellow
+            field("alt", "Altitude:", "-- m", "#66BB6A"),            # Green
+            field("temp", "Temp:", "-- °C", "#FF7043"),              # Orange
+            field("press", "Pressure:", "-- hPa", "#26C6DA"),        # Cyan
+            field("mode", "Mode:", "Unknown", "#00E676", span=3),    # Green
+        ], 3)])
+        main_layout.addWidget(self.overview_panel)
 
         # ───────────── Connection Status ─────────────
         status_group = QGroupBox("Telemetry Status")
@@ -51,6 +61,10 @@ class TelemetryTab(QWidget):
 
         main_layout.addWidget(status_group)
 
+        # Rates, loss and error counts of the link, sampled once a second while shown
+        self.link_status_panel = LinkStatusPanel(self.reader)
+        main_layout.addWidget(self.link_status_panel)
+
         # ───────────── Live Log Console ─────────────
         log_group = QGroupBox("Live Telemetry Log")
         log_layout = QVBoxLayout()
@@ -66,66 +80,74 @@ class TelemetryTab(QWidget):
         main_layout.addWidget(log_group)
 
         # ───────────── Connect to Serial Reader ─────────────
-        self.last_update_time = None
+        # The log gets every line; while hidden it keeps the last LOG_HISTORY
+        # and catches up once when shown. The labels get the newest line of
+        # their kinds LABEL_RATE_HZ times a second, and nothing while hidden.
+        self.display_gate = VisibilityGate(self, self.update_display,
+                                           history=self.LOG_HISTORY, resume=self.catch_up)
         if self.reader:
             self.reader.data_received.connect(self.handle_serial_data)
-
-        # Check connection health every 1 second
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_connection_status)
-        self.timer.start(1000)
-
-    # ───────────── Helper to Create Styled Labels ─────────────
-    def _create_label(self, text, color):
-        label = QLabel(text)
-        label.setAlignment(Qt.AlignCenter)
-        label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {color};")
-        return label
+            bus = TelemetryBus.of(self.reader)
+            for kind in self.LABEL_KINDS:
+                bus.subscribe(kind, self.update_labels, max_rate_hz=self.LABEL_RATE_HZ, widget=self)
+            # The reader reports connection changes; nothing to poll
+            self.reader.connection_state_changed.connect(self.update_connection_status)
+            if getattr(self.reader, "state", None):
+                self.update_connection_status(self.reader.state, self.reader.state_detail)
 
     # ───────────── Handle Serial Data ─────────────
     def handle_serial_data(self, line):
         line = line.strip()
         if not line:
             return
+        self.display_gate.feed(line)
 
+    def update_display(self, line):
         # Log the line to the console with timestamp
         timestamp = datetime.now().strftime("%H:%M:%S")
         self.log_console.append(f"[{timestamp}] {line}")
 
-        # Update status timestamp
-        self.last_update_time = datetime.now()
-
+    def catch_up(self, latest, history):
+        """Shown again: append the buffered log in one go (the labels catch up through the bus)."""
+        lines = []
+        if self.display_gate.history_skipped:
+            lines.append(f"... {self.display_gate.history_skipped} lines not shown while hidden")
+        for arrival, line in history:
+            timestamp = datetime.fromtimestamp(arrival).strftime("%H:%M:%S")
+            lines.append(f"[{timestamp}] {line}")
+        if lines:
+            self.log_console.append("\n".join(lines))
+
+    def update_labels(self, line):
         # Parse telemetry data
         try:
+            values = {}
             parts = [p.strip() for p in line.split("|")]
             for part in parts:
                 if part.upper().startswith("ROLL"):
-                    self.roll_label.setText(f"Roll: {part.split(':')[1].strip()}°")
+                    values["roll"] = f"{part.split(':')[1].strip()}°"
                 elif part.upper().startswith("PITCH"):
-                    self.pitch_label.setText(f"Pitch: {part.split(':')[1].strip()}°")
+                    values["pitch"] = f"{part.split(':')[1].strip()}°"
                 elif part.upper().startswith("YAW"):
-                    self.yaw_label.setText(f"Yaw: {part.split(':')[1].strip()}°")
+                    values["yaw"] = f"{part.split(':')[1].strip()}°"
                 elif part.upper().startswith("ALT"):
-                    self.alt_label.setText(f"Altitude: {part.split(':')[1].strip()}")
+                    values["alt"] = part.split(':')[1].strip()
                 elif part.upper().startswith("TEMP"):
-                    self.temp_label.setText(f"Temp: {part.split(':')[1].strip()}")
+                    values["temp"] = part.split(':')[1].strip()
                 elif part.upper().startswith("PRESS"):
-                    self.press_label.setText(f"Pressure: {part.split(':')[1].strip()}")
+                    values["press"] = part.split(':')[1].strip()
                 elif part.upper().startswith("MODE"):
-                    self.mode_label.setText(f"Mode: {part.split(':')[1].strip()}")
+                    values["mode"] = part.split(':')[1].strip()
+            if values:
+                self.overview_panel.set_values(values)
         except Exception as e:
             print(f"[TelemetryTab] Parse error: {line} — {e}")
+            report_parse_error(self.reader, "Telemetry")
 
     # ───────────── Connection Status ─────────────
-    def update_connection_status(self):
-        if self.last_update_time:
-            delta = (datetime.now() - self.last_update_time).total_seconds()
-            if delta < 2:  # received data in last 2 seconds
-                self.status_label.setText("Connected")
-                self.status_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #00E676;")
-            else:
-                self.status_label.setText("No Data")
-                self.status_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #FFCA28;")
-        else:
-            self.status_label.setText("Disconnected")
-            self.status_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #F44336;")
+    def update_connection_status(self, state, detail=""):
+        text, color = self.CONNECTION_STATES.get(state, (state, "#F44336"))
+        if detail and state != "connected":
+            text = f"{text} ({detail})"
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {color};")
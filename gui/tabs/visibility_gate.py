@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, QEvent
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from telemetry import message_kind
+
+
+class VisibilityGate(QObject):
+    """Hands telemetry lines to a tab's display handler only while the tab is on screen.
+
+    While the widget is hidden (another tab is selected) only the newest line
+    of each message kind is kept (of each first field name for RC lines,
+    which come as CH1: PPM and RC1: lines, and OTHER lines, which share no
+    layout), plus the last ``history`` lines with their
+    arrival time for tabs that show a scrollback. When the widget is shown
+    again the snapshot is replayed once: through ``resume(latest, history)``
+    if given, otherwise by passing each latest line to ``handler``.
+    """
+
+    def __init__(self, widget, handler, history=0, resume=None):
+        super().__init__(widget)
+        self.widget = widget
+        self.handler = handler
+        self.resume = resume
+        self.snapshot = {}  # kind (or RC/OTHER and field name) -> newest line, in order of arrival
+        self.history = deque(maxlen=history) if history else None  # (time.time(), line)
+        self.hidden_lines = 0
+        widget.installEventFilter(self)
+
+    @property
+    def history_skipped(self):
+        """Lines received while hidden that fell out of the history buffer."""
+        kept = len(self.history) if self.history is not None else 0
+        return self.hidden_lines - kept
+
+    def feed(self, line):
+        if self.widget.isVisible():
+            self.handler(line)
+            return
+
+        self.hidden_lines += 1
+        kind = message_kind(line)
+        if kind in ("RC", "OTHER"):
+            kind = (kind, line.split(":", 1)[0].strip() if ":" in line else "")
+        self.snapshot.pop(kind, None)  # re-insert so replay keeps arrival order
+        self.snapshot[kind] = line
+        if self.history is not None:
+            self.history.append((time.time(), line))
+
+    def flush(self):
+        """Replay what arrived while hidden (called when the widget is shown)."""
+        if not self.hidden_lines:
+            return
+        latest = list(self.snapshot.values())
+        history = list(self.history) if self.history is not None else []
+        if self.resume:
+            self.resume(latest, history)
+        else:
+            for line in latest:
+                self.handler(line)
+
+        self.snapshot.clear()
+        if self.history is not None:
+            self.history.clear()
+        self.hidden_lines = 0
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget and event.type() == QEvent.Show:
+            self.flush()
+        return False
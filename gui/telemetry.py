@@ -0,0 +1,102 @@
+"""Shared helpers for decoding the STM32 telemetry lines.
+
+The flight controller sends pipe-separated ``KEY: value`` lines, e.g.
+``LAT: 12.935100 | LON: 77.536000 | GPS: 3D Fix``.
+"""
+import re
+import threading
+
+_NUMBER = re.compile(r"[-+]?\d+(?:\.\d+)?")
+
+
+def parse_fields(line):
+    """Split a ``KEY: value | KEY: value`` line into an upper-case keyed dict of strings."""
+    fields = {}
+    for part in line.split("|"):
+        if ":" not in part:
+            continue
+        key, value = part.split(":", 1)
+        fields[key.strip().upper()] = value.strip()
+    return fields
+
+
+def parse_number(text):
+    """First number found in ``text`` (units and symbols are ignored), or None."""
+    match = _NUMBER.search(text)
+    return float(match.group()) if match else None
+
+
+def parse_coordinate(text):
+    """Parse a latitude/longitude value such as ``-12.93``, ``12.93° S`` or ``77.53 E``."""
+    value = parse_number(text)
+    if value is None:
+        return None
+    hemisphere = text.strip()[-1:].upper()
+    if hemisphere in ("S", "W") and value > 0:
+        value = -value
+    return value
+
+
+def decode_gps(line):
+    """Return ``(lat, lon, status)`` for a GPS line, or None if it is not a valid fix."""
+    if "LAT" not in line or "LON" not in line:
+        return None
+
+    fields = parse_fields(line)
+    lat = parse_coordinate(fields.get("LAT", ""))
+    lon = parse_coordinate(fields.get("LON", ""))
+    if lat is None or lon is None:
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    # 0,0 is what most receivers report before the first fix
+    if lat == 0 and lon == 0:
+        return None
+    return lat, lon, fields.get("GPS", "")
+
+
+# Message kinds, checked in order; a line belongs to the first kind with a matching key.
+# GPS comes before BARO: a fix line may carry the GPS altitude (ALT) as well
+MESSAGE_KINDS = (
+    ("RC", ("CH1", "RC1", "PPM", "RC", "CHANNELS", "PWM")),
+    ("ATTITUDE", ("ROLL", "PITCH", "YAW")),
+    ("IMU", ("ACC", "GYRO", "MAG")),
+    ("GPS", ("LAT", "LON")),
+    ("BARO", ("TEMP", "PRESS", "ALT")),
+    ("MODE", ("MODE",)),
+)
+
+
+def message_kind(line):
+    """Classify a telemetry line (``"ATTITUDE"``, ``"GPS"``, ...), or ``"OTHER"``."""
+    return decode(line)[0]
+
+
+def fields_kind(keys):
+    """``message_kind`` of a line already split with ``parse_fields``."""
+    for kind, kind_keys in MESSAGE_KINDS:
+        if any(key in keys for key in kind_keys):
+            return kind
+    return "OTHER"
+
+
+# ───────────── Lines Decoded Elsewhere ─────────────
+# The acquisition process (acquisition.py) decodes lines before they reach the
+# GUI process. While the GUI process hands such a line out, decode() returns the
+# child's decoding instead of parsing the line again - per thread, and only for
+# a line equal to the one being handed out.
+_handing_out = threading.local()
+
+
+def handing_out(line, kind=None, fields=None):
+    """Until the next call, ``decode(line)`` in this thread returns ``(kind, fields)``."""
+    _handing_out.line = line
+    _handing_out.decoded = (kind, fields)
+
+
+def decode(line):
+    """``(message kind, parse_fields dict)`` of a line; treat the dict as read-only."""
+    if getattr(_handing_out, "line", None) == line:
+        return _handing_out.decoded
+    fields = parse_fields(line)
+    return fields_kind(fields), fields
@@ -0,0 +1,254 @@
+"""Telemetry subscriptions, each with its own message kind and rate.
+
+Tabs used to connect to ``data_received`` and see every line of every
+kind, each parsing it only to find out whether it cared. A
+``TelemetryBus`` splits each line once and hands it only to the
+subscriptions for its kind (telemetry.MESSAGE_KINDS), at the rate each
+one asked for:
+
+    bus = TelemetryBus.of(reader)
+    bus.subscribe("ATTITUDE", viewer.post, direct=True)           # every sample, at once
+    bus.subscribe("BARO", panel.show, max_rate_hz=10, widget=tab)  # newest line, 10 times a second
+    bus.subscribe("IMU", plot.add, max_rate_hz=20, policy=MINMAX)  # per-window minimum and maximum
+    bus.subscribe(ANY_KIND, log.write)                             # everything
+
+A rate-limited subscription collects the lines of a window - ``1 /
+max_rate_hz`` seconds or ``every`` lines - and delivers, per kind:
+
+* ``LATEST``: the newest line
+* ``AVERAGE``: one line with each numeric field averaged
+* ``MINMAX``: two lines, the minimum and then the maximum of each numeric
+  field, so that peaks survive decimation
+
+Averaged lines keep the layout of the newest line (units, number of
+decimals), so handlers parse them like any other line. The first line
+after a quiet period goes out at once; the rest of a burst waits for the
+end of its window. With ``widget`` nothing is delivered while the widget
+is hidden, and the window is delivered once when it is shown again.
+Handlers run on the GUI thread, except ``direct`` ones, which run in the
+thread that emitted the line: the reader thread of a plain SerialReader,
+or, for a source with a ``direct_data_received`` signal, whatever thread
+emits that (vehicle_links.VehicleFocus: the link's reader thread).
+"""
+import re
+import time
+from PyQt5.QtCore import QObject, QEvent, QTimer, Qt
+from telemetry import MESSAGE_KINDS, decode
+
+ANY_KIND = "*"
+LATEST = "latest"
+AVERAGE = "average"
+MINMAX = "minmax"
+POLICIES = (LATEST, AVERAGE, MINMAX)
+KINDS = [kind for kind, _ in MESSAGE_KINDS] + ["OTHER"]
+
+_NUMBER = re.compile(r"[-+]?\d+(?:\.\d+)?")
+
+
+def _fill(template, values):
+    """``template`` with its numbers replaced by ``values``, at the template's precision."""
+    values = iter(values)
+
+    def replace(match):
+        text = match.group()
+        decimals = len(text) - text.index(".") - 1 if "." in text else 0
+        return f"{next(values):.{decimals}f}"
+    return _NUMBER.sub(replace, template)
+
+
+class Subscription(QObject):
+    """One consumer of a TelemetryBus; ``cancel()`` ends it."""
+
+    def __init__(self, bus, kind, callback, max_rate_hz=None, every=None, policy=LATEST,
+                 widget=None, direct=False):
+        super().__init__(bus)
+        self.bus = bus
+        self.kind = kind
+        self.callback = callback
+        self.policy = policy
+        self.every = every
+        self.interval = 1.0 / max_rate_hz if max_rate_hz else 0.0
+        self.rate_limited = bool(max_rate_hz or every)
+        self.needs_numbers = self.rate_limited and policy != LATEST
+        self.widget = widget
+        self.direct = direct
+        self.received = 0
+        self.delivered = 0
+
+        # Current window
+        self.window = 0
+        self.latest = {}    # kind -> newest line (LATEST, or anything while hidden)
+        self.numbers = {}   # kind -> field -> [template, count, values, maxima] (AVERAGE, MINMAX)
+        self.last_delivery = float("-inf")
+
+        self.timer = None
+        if self.interval:
+            self.timer = QTimer(self)
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.flush)
+        if widget is not None:
+            widget.installEventFilter(self)
+
+    def cancel(self):
+        if self.timer:
+            self.timer.stop()
+        if self.widget is not None:
+            self.widget.removeEventFilter(self)
+        self.bus.remove(self)
+
+    def visible(self):
+        return self.widget is None or self.widget.isVisible()
+
+    # ───────────── Window ─────────────
+    def offer(self, line, kind, fields):
+        self.received += 1
+        if not self.rate_limited and self.visible():
+            self.deliver([line])
+            return
+
+        self.window += 1
+        if self.needs_numbers:
+            self.accumulate(kind, fields)
+        else:
+            self.latest.pop(kind, None)  # re-insert so delivery keeps arrival order
+            self.latest[kind] = line
+        if not self.visible():
+            return
+        if self.every and self.window >= self.every:
+            self.flush()
+        elif self.interval and not self.timer.isActive():
+            wait = self.last_delivery + self.interval - time.monotonic()
+            if wait <= 0:
+                self.flush()
+            else:
+                self.timer.start(int(wait * 1000) + 1)
+
+    def accumulate(self, kind, fields):
+        numbers = self.numbers.setdefault(kind, {})
+        for key, text in fields.items():
+            values = [float(number) for number in _NUMBER.findall(text)]
+            entry = numbers.get(key)
+            if entry is None or len(entry[2]) != len(values):
+                numbers[key] = [text, 1, values, list(values)]
+                continue
+            entry[0] = text
+            entry[1] += 1
+            if self.policy == AVERAGE:
+                entry[2] = [total + value for total, value in zip(entry[2], values)]
+            else:
+                entry[2] = [min(low, value) for low, value in zip(entry[2], values)]
+                entry[3] = [max(high, value) for high, value in zip(entry[3], values)]
+
+    def aggregate(self):
+        lines = []
+        for fields in self.numbers.values():
+            if self.policy == AVERAGE:
+                lines.append(" | ".join(f"{key}: {_fill(template, [total / count for total in totals])}"
+                                        for key, (template, count, totals, _) in fields.items()))
+            else:
+                lines.append(" | ".join(f"{key}: {_fill(template, lows)}"
+                                        for key, (template, _, lows, _) in fields.items()))
+                lines.append(" | ".join(f"{key}: {_fill(template, highs)}"
+                                        for key, (template, _, _, highs) in fields.items()))
+        return lines
+
+    def flush(self):
+        """Deliver the current window (timer, ``every`` lines, or the widget being shown)."""
+        if self.timer:
+            self.timer.stop()
+        if not self.window or not self.visible():
+            return
+        lines = self.aggregate() if self.needs_numbers else list(self.latest.values())
+        self.window = 0
+        self.latest.clear()
+        self.numbers.clear()
+        self.last_delivery = time.monotonic()
+        self.deliver(lines)
+
+    def deliver(self, lines):
+        self.delivered += len(lines)
+        for line in lines:
+            try:
+                self.callback(line)
+            except Exception as e:  # one broken consumer must not starve the others
+                print(f"[TelemetryBus] {self.kind} subscriber failed on '{line}': {e}")
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget and event.type() == QEvent.Show:
+            self.flush()
+        return False
+
+
+class TelemetryBus(QObject):
+    """Routes the lines of ``source.data_received`` to per-kind, rate-limited subscriptions."""
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.subscriptions = []
+        self.routes = {}         # kind -> subscriptions on the GUI thread
+        self.direct_routes = {}  # kind -> subscriptions called in the emitting thread
+        self.connected = False
+        self.direct_connected = False
+
+    @classmethod
+    def of(cls, source):
+        """The bus of ``source`` (created on first use for a reader that has none)."""
+        bus = getattr(source, "bus", None)
+        if bus is None:
+            bus = source.bus = cls(source)
+        return bus
+
+    def subscribe(self, kind, callback, max_rate_hz=None, every=None, policy=LATEST,
+                  widget=None, direct=False):
+        """Call ``callback(line)`` for lines of ``kind`` (or ``ANY_KIND``); see the module docstring."""
+        if kind != ANY_KIND and kind not in KINDS:
+            raise ValueError(f"unknown message kind {kind}")
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy}")
+        if direct and (max_rate_hz or every or widget is not None):
+            raise ValueError("direct subscriptions get every line: no rate, no widget")
+        subscription = Subscription(self, kind, callback, max_rate_hz, every, policy, widget, direct)
+        self.subscriptions.append(subscription)
+        self.update_routes()
+        if direct and not self.direct_connected:
+            signal = getattr(self.source, "direct_data_received", self.source.data_received)
+            signal.connect(self.publish_direct, Qt.DirectConnection)
+            self.direct_connected = True
+        elif not direct and not self.connected:
+            self.source.data_received.connect(self.publish)
+            self.connected = True
+        return subscription
+
+    def remove(self, subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+            self.update_routes()
+
+    def update_routes(self):
+        # Rebuilt whole and swapped in, so the reader thread never sees a half-updated table
+        routes, direct_routes = {}, {}
+        for kind in KINDS:
+            matching = [s for s in self.subscriptions if s.kind in (kind, ANY_KIND)]
+            routes[kind] = [s for s in matching if not s.direct]
+            direct_routes[kind] = [s for s in matching if s.direct]
+        self.routes, self.direct_routes = routes, direct_routes
+
+    def publish(self, line):
+        self.dispatch(line, self.routes)
+
+    def publish_direct(self, line):
+        self.dispatch(line, self.direct_routes)
+
+    def dispatch(self, line, routes):
+        line = line.strip()
+        if not line:
+            return
+        kind, fields = decode(line)  # no parsing when the acquisition process decoded it
+        for subscription in routes[kind]:
+            subscription.offer(line, kind, fields)
+
+    def stats(self):
+        """Lines received and delivered per subscription."""
+        return [{"kind": s.kind, "policy": s.policy if s.rate_limited else "all",
+                 "received": s.received, "delivered": s.delivered} for s in self.subscriptions]
@@ -0,0 +1,260 @@
+"""Decoded telemetry in shared memory, for analysis processes on the same machine.
+
+The GCS decodes every line it receives into a fixed-size record
+(``RECORD_DTYPE``) and appends it to a ring buffer in
+``multiprocessing.shared_memory``. Any number of other processes - a
+script, a Jupyter kernel - attach with ``RingReader`` and see the ring as
+NumPy arrays, without copying and without the GCS ever waiting for them:
+readers never lock and never write to the segment.
+
+    from telemetry_ring import RingReader
+    ring = RingReader()                  # default name DEFAULT_NAME
+    ring.records["roll"]                 # zero-copy view of the whole ring
+    batch, lost = ring.read_new()        # consistent copy of what arrived since the last call
+    batch["roll"].mean()
+
+Layout: a header of uint64s (``HEADER_FIELDS``), then ``capacity``
+records; record ``n`` lives in slot ``n % capacity``. The writer bumps
+``write_begin`` before it fills a slot and ``write_end`` after, like a
+seqlock. A reader copies records below ``write_end``, then reads
+``write_begin`` again and throws away the records the writer may have
+overwritten during the copy - a reader that falls more than a ring
+behind loses records, it never sees torn ones. (Relies on stores
+becoming visible in program order, as they do on x86-64.) The zero-copy
+views have no such check: the slot being written may be half-updated.
+
+Fields missing from a line are NaN (0 for ``rc``, -1 for ``seq``);
+``kind`` is an index into ``KINDS``.
+
+Several processes may write: links read in an acquisition process
+(acquisition.py) decode and publish their records from there, with
+``TelemetryRing.attach``. Writers share one process-shared lock, and the
+record count lives in the header.
+"""
+import math
+import multiprocessing
+import struct
+import sys
+import time
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+from telemetry import MESSAGE_KINDS, decode, parse_number, parse_coordinate
+
+DEFAULT_NAME = "stm_fc_telemetry"
+DEFAULT_CAPACITY = 65536  # records; about 5 minutes at 200 lines/s
+MAGIC = 0x53544D46435247  # "STMFCRG"
+VERSION = 2  # 2: GPS before BARO in KINDS
+HEADER_FIELDS = ("magic", "version", "capacity", "record_size", "write_begin", "write_end")
+HEADER_SIZE = 64  # bytes, keeps the records 8-byte aligned
+KINDS = [kind for kind, _ in MESSAGE_KINDS] + ["OTHER"]
+RC_CHANNELS = 8
+
+RECORD_DTYPE = np.dtype([
+    ("time", "f8"),          # arrival, Unix seconds
+    ("vehicle", "u2"),       # order in which the GCS opened the link, from 0
+    ("kind", "u1"),          # KINDS index
+    ("mode", "S13"),         # MODE text, cut to 13 bytes
+    ("seq", "i4"),           # SEQ field of the flight controller (link_stats.py)
+    ("roll", "f4"), ("pitch", "f4"), ("yaw", "f4"),
+    ("acc", "f4", (3,)), ("gyro", "f4", (3,)), ("mag", "f4", (3,)),
+    ("alt", "f4"), ("temp", "f4"), ("press", "f4"),
+    ("lat", "f8"), ("lon", "f8"),
+    ("rc", "u2", (RC_CHANNELS,)),
+])
+
+# The same layouts as structs, for the writer: packing is far cheaper than
+# assigning through NumPy
+_RECORD = struct.Struct("<dHB13si3f3f3f3f3f2d8H")
+_EMPTY_VALUES = [0.0, 0, 0, b"", -1] + [math.nan] * 17 + [0] * RC_CHANNELS
+_HEADER = {name: index for index, name in enumerate(HEADER_FIELDS)}
+_COUNTER = struct.Struct("<Q")
+_WRITE_BEGIN = _HEADER["write_begin"] * _COUNTER.size
+_WRITE_END = _HEADER["write_end"] * _COUNTER.size
+_KIND_INDEX = {kind: index for index, kind in enumerate(KINDS)}
+# Line key -> index of its first value in _EMPTY_VALUES
+_SCALARS = {"ROLL": 5, "PITCH": 6, "YAW": 7, "ALT": 17, "TEMP": 18, "PRESS": 19}
+_VECTORS = {"ACC": 8, "GYRO": 11, "MAG": 14}
+_COORDINATES = {"LAT": 20, "LON": 21}
+_RC = 22
+_MODE_SIZE = 13
+
+
+def _views(buf, capacity):
+    header = np.ndarray((len(HEADER_FIELDS),), np.uint64, buf)
+    records = np.ndarray((capacity,), RECORD_DTYPE, buf, offset=HEADER_SIZE)
+    return header, records
+
+
+def _attach(name):
+    """Open an existing segment without letting this process's resource tracker unlink it at exit."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 every attach registers the segment, and the tracker unlinks
+    # it when the reader exits - under the GCS's feet
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class TelemetryRing:
+    """The writing end, owned by the GCS. ``publish()`` may be called from any thread,
+    and from acquisition processes through ``attach()``."""
+
+    def __init__(self, name=DEFAULT_NAME, capacity=DEFAULT_CAPACITY):
+        size = HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            print(f"[TelemetryRing] Replacing stale segment {name}")  # left by a GCS that crashed
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = name
+        self.capacity = capacity
+        header, _ = _views(self.shm.buf, capacity)
+        header[:] = [MAGIC, VERSION, capacity, RECORD_DTYPE.itemsize, 0, 0]
+        self.buf = self.shm.buf
+        # Reader threads and acquisition processes publish; one of them writes at a time
+        self.lock = multiprocessing.get_context("spawn").Lock()
+        self.vehicles = {}  # vehicle id -> index stored in the records
+        self.owner = True
+        print(f"[TelemetryRing] {name}: {capacity} records of {RECORD_DTYPE.itemsize} bytes")
+
+    @classmethod
+    def attach(cls, name, lock):
+        """A writer on the ring ``name`` of the GCS, in another process; ``lock`` is the GCS ring's."""
+        ring = cls.__new__(cls)
+        ring.shm = _attach(name)
+        header, _ = _views(ring.shm.buf, 0)
+        ring.name = name
+        ring.capacity = int(header[_HEADER["capacity"]])
+        ring.buf = ring.shm.buf
+        ring.lock = lock
+        ring.vehicles = {}
+        ring.owner = False
+        return ring
+
+    @property
+    def written(self):
+        """Records written since the GCS created the ring, by any writer."""
+        return _COUNTER.unpack_from(self.buf, _WRITE_END)[0]
+
+    def vehicle_index(self, vehicle_id):
+        """Index stored in the records of ``vehicle_id`` (assigned on first use)."""
+        return self.vehicles.setdefault(vehicle_id, len(self.vehicles))
+
+    def publish(self, line, vehicle_id=""):
+        """Decode ``line`` and append it to the ring."""
+        kind, fields = decode(line)
+        self.publish_fields(kind, fields, self.vehicle_index(vehicle_id))
+
+    def publish_fields(self, kind, fields, vehicle):
+        """Append a line already decoded with ``telemetry.decode``; ``vehicle`` is its index."""
+        if not fields:
+            return
+        values = list(_EMPTY_VALUES)
+        values[0] = time.time()
+        values[1] = vehicle
+        values[2] = _KIND_INDEX[kind]
+        for key, text in fields.items():
+            try:
+                self.decode_field(values, key, text)
+            except (ValueError, IndexError):
+                pass  # the tabs count parse errors; the ring just leaves the field empty
+
+        with self.lock:
+            n = _COUNTER.unpack_from(self.buf, _WRITE_END)[0]
+            _COUNTER.pack_into(self.buf, _WRITE_BEGIN, n + 1)
+            _RECORD.pack_into(self.buf, HEADER_SIZE + n % self.capacity * _RECORD.size, *values)
+            _COUNTER.pack_into(self.buf, _WRITE_END, n + 1)
+
+    @staticmethod
+    def decode_field(values, key, text):
+        if key in _SCALARS:
+            value = parse_number(text)
+            if value is not None:
+                values[_SCALARS[key]] = value
+        elif key in _VECTORS:
+            first = _VECTORS[key]
+            for offset, value in enumerate(text.split(",")[:3]):
+                values[first + offset] = float(value)
+        elif key in _COORDINATES:
+            value = parse_coordinate(text)
+            if value is not None:
+                values[_COORDINATES[key]] = value
+        elif key.startswith("CH") and key[2:].isdigit():
+            channel = int(key[2:]) - 1
+            if 0 <= channel < RC_CHANNELS:
+                values[_RC + channel] = min(int(parse_number(text) or 0), 65535)
+        elif key == "MODE":
+            values[3] = text.encode()[:_MODE_SIZE]
+        elif key == "SEQ":
+            values[4] = int(text)
+
+    def close(self):
+        """Remove the segment (the GCS's ring); attached readers keep their mapping until they close it."""
+        self.buf = None  # no views may be left when the mapping is released
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingReader:
+    """The reading end, for analysis processes. Never locks and never writes."""
+
+    def __init__(self, name=DEFAULT_NAME, from_start=False):
+        self.shm = _attach(name)
+        header = np.ndarray((len(HEADER_FIELDS),), np.uint64, self.shm.buf)
+        if header[_HEADER["magic"]] != MAGIC or header[_HEADER["version"]] != VERSION:
+            raise ValueError(f"{name} is not a version {VERSION} telemetry ring")
+        if header[_HEADER["record_size"]] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{name} has {header[_HEADER['record_size']]}-byte records, "
+                             f"expected {RECORD_DTYPE.itemsize}")
+        self.capacity = int(header[_HEADER["capacity"]])
+        self.header, self.records = _views(self.shm.buf, self.capacity)
+        self.position = max(0, self.written - self.capacity) if from_start else self.written
+        self.lost = 0
+
+    @property
+    def written(self):
+        """Records written since the GCS created the ring."""
+        return int(self.header[_HEADER["write_end"]])
+
+    def read_new(self, max_records=None):
+        """``(records, lost)``: a copy of the records since the last call, oldest first.
+
+        ``lost`` counts records overwritten before they could be read.
+        """
+        end = self.written
+        first = max(self.position, end - self.capacity)
+        if max_records is not None:
+            end = min(end, first + max_records)
+        batch, first = self.copy(first, end)
+        lost = first - self.position
+        self.position = end
+        self.lost += lost
+        return batch, lost
+
+    def latest(self, count):
+        """A copy of the newest ``count`` records (fewer if the writer laps the copy)."""
+        end = self.written
+        batch, _ = self.copy(max(0, end - count, end - self.capacity), end)
+        return batch
+
+    def copy(self, first, end):
+        """Copy records ``first`` to ``end``; returns the ones still intact and the first of those."""
+        slots = np.arange(first, end) % self.capacity
+        batch = self.records[slots]  # fancy indexing copies
+        oldest_intact = int(self.header[_HEADER["write_begin"]]) - self.capacity
+        if oldest_intact > first:
+            batch = batch[min(oldest_intact, end) - first:]
+            first = min(oldest_intact, end)
+        return batch, first
+
+    def close(self):
+        self.header = self.records = None
+        self.shm.close()
@@ -0,0 +1,426 @@
+"""Re-broadcast telemetry to secondary ground stations.
+
+Only one process can own the serial port, so the GCS republishes every
+line it receives to any number of network clients:
+
+* TCP: newline-delimited lines (``nc gcs-laptop 5760``)
+* UDP: send any datagram (e.g. ``SUBSCRIBE``) to the port to subscribe;
+  lines come back batched into datagrams every ``UDP_BATCH_INTERVAL``. Re-send it at least every
+  ``UDP_TIMEOUT`` seconds to stay subscribed, ``UNSUBSCRIBE`` to leave.
+* WebSocket: one text message per line, for browser dashboards.
+
+Clients start in "raw" format (the line exactly as the flight controller
+sent it); WebSocket clients start in "json". TCP/WebSocket clients, and
+UDP subscribers in their subscribe datagram, can send commands:
+
+    FORMAT raw|json        json: {"t", "vehicle", "kind", "line", "fields"}
+    VEHICLE <id>|*         only one vehicle's lines (default: all)
+
+The server runs its own asyncio loop in a background thread. ``publish()``
+may be called from any thread (the serial reader threads call it
+directly) and only appends to a list, which the loop collects every few
+milliseconds. Each client has a bounded queue, and a slow client loses
+its oldest lines instead of holding up anyone else.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from telemetry import message_kind, parse_fields
+
+DISPATCH_INTERVAL = 0.005     # seconds between hand-overs of published lines to the clients
+UDP_TIMEOUT = 30.0        # seconds without a datagram before a UDP subscriber is dropped
+UDP_MAX_DATAGRAM = 1200   # bytes; stays under a typical path MTU
+UDP_BUFFER_LIMIT = 64 * 1024  # bytes waiting in the UDP transport before lines are dropped
+UDP_BATCH_INTERVAL = 0.01     # seconds of lines packed into each datagram
+STREAM_BUFFER = 32 * 1024     # bytes of kernel send buffer and of transport buffer per stream client
+LISTEN_BACKLOG = 512
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class _Frame:
+    """One published line, encoded at most once per format."""
+    __slots__ = ("timestamp", "vehicle_id", "line", "_raw", "_json")
+
+    def __init__(self, timestamp, vehicle_id, line):
+        self.timestamp = timestamp
+        self.vehicle_id = vehicle_id
+        self.line = line
+        self._raw = None
+        self._json = None
+
+    def encoded(self, fmt):
+        if fmt == "json":
+            if self._json is None:
+                self._json = json.dumps({
+                    "t": round(self.timestamp, 6),
+                    "vehicle": self.vehicle_id,
+                    "kind": message_kind(self.line),
+                    "line": self.line,
+                    "fields": parse_fields(self.line),
+                }).encode() + b"\n"
+            return self._json
+        if self._raw is None:
+            self._raw = self.line.encode() + b"\n"
+        return self._raw
+
+
+class _Subscriber:
+    """Per-client settings shared by all transports."""
+
+    def __init__(self, fmt="raw"):
+        self.format = fmt
+        self.vehicle_id = "*"
+        self.sent = 0
+        self.dropped = 0
+
+    def wants(self, frame):
+        return self.vehicle_id == "*" or self.vehicle_id == frame.vehicle_id
+
+    def handle_command(self, text):
+        parts = text.strip().split()
+        if len(parts) != 2:
+            return
+        command, value = parts[0].upper(), parts[1]
+        if command == "FORMAT" and value.lower() in ("raw", "json"):
+            self.format = value.lower()
+        elif command == "VEHICLE":
+            self.vehicle_id = value
+
+
+class _StreamClient(_Subscriber):
+    """A TCP or WebSocket client: bounded queue drained by its own writer task."""
+
+    def __init__(self, writer, queue_size, fmt="raw", websocket=False):
+        super().__init__(fmt)
+        self.writer = writer
+        self.websocket = websocket
+        self.queue = deque(maxlen=queue_size)
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.peer = writer.get_extra_info("peername")
+
+    def push(self, frame):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1  # deque drops the oldest line
+        self.queue.append(frame)
+        self.ready.set()
+
+    async def write_loop(self):
+        try:
+            while not self.closed:
+                await self.ready.wait()
+                self.ready.clear()
+                batch = [frame.encoded(self.format) for frame in self.queue]
+                self.queue.clear()
+                if self.websocket:
+                    batch = [_ws_frame(data.rstrip(b"\n")) for data in batch]
+                self.writer.write(b"".join(batch))
+                self.sent += len(batch)
+                await self.writer.drain()  # only this client waits on its socket
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.server._udp_datagram(data, addr)
+
+
+def _limit_buffers(writer):
+    """Keep little unsent data per client, so a slow client's lines are dropped
+    in its queue instead of arriving seconds late from a kernel buffer."""
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, STREAM_BUFFER)
+    writer.transport.set_write_buffer_limits(high=STREAM_BUFFER)
+
+
+# ───────────── WebSocket (RFC 6455, server side, text frames only) ─────────────
+def _ws_frame(payload, opcode=0x1):
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 65536:
+        header += bytes([126]) + struct.pack("!H", length)
+    else:
+        header += bytes([127]) + struct.pack("!Q", length)
+    return header + payload
+
+
+async def _ws_handshake(reader, writer):
+    request = await reader.readuntil(b"\r\n\r\n")
+    key = None
+    for line in request.decode(errors="ignore").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "sec-websocket-key":
+            key = value.strip()
+    if not key:
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+        return False
+    accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+    writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+    return True
+
+
+async def _ws_read_message(reader):
+    """Next (opcode, payload) from a client; client frames are always masked."""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if second & 0x80 else b"\x00" * 4
+    payload = bytearray(await reader.readexactly(length))
+    for i in range(length):
+        payload[i] ^= mask[i % 4]
+    return first & 0x0F, bytes(payload)
+
+
+# ───────────── Server ─────────────
+class TelemetryServer:
+    """Fan-out of telemetry lines to TCP, UDP and WebSocket clients.
+
+    Ports left as None are not opened; port 0 picks a free port (see
+    ``ports`` after ``start()``).
+    """
+
+    def __init__(self, host="0.0.0.0", tcp_port=None, udp_port=None, ws_port=None, queue_size=256):
+        self.host = host
+        self.requested_ports = {"tcp": tcp_port, "udp": udp_port, "ws": ws_port}
+        self.ports = {}
+        self.queue_size = queue_size
+
+        self.loop = None
+        self.thread = None
+        self._servers = []
+        self._udp_transport = None
+        self._started = threading.Event()
+        self._start_error = None
+
+        # Filled by publish() on any thread, emptied by _dispatch() on the loop
+        self._pending = []
+        self._pending_lock = threading.Lock()
+
+        self.clients = set()      # _StreamClient
+        self.udp_clients = {}     # addr -> [_Subscriber, last seen]
+        self._udp_pending = []
+        self.published = 0
+        self.dropped_closed = 0   # dropped counts of clients that have disconnected
+
+    def start(self):
+        """Open the listening sockets on a background thread. Raises OSError if a port is taken."""
+        self.thread = threading.Thread(target=self._run, daemon=True, name="TelemetryServer")
+        self.thread.start()
+        self._started.wait()
+        if self._start_error:
+            raise self._start_error
+        listening = ", ".join(f"{kind} {port}" for kind, port in self.ports.items())
+        print(f"[TelemetryServer] Serving on {self.host}: {listening}")
+
+    def stop(self):
+        if not self.loop or not self.thread.is_alive():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2.0)
+        print("[TelemetryServer] Stopped")
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._open())
+        except OSError as e:
+            self._start_error = e
+            self._started.set()
+            self.loop.close()
+            return
+        self._started.set()
+        self.loop.call_later(UDP_TIMEOUT, self._expire_udp)
+        self.loop.call_soon(self._dispatch)
+        try:
+            self.loop.run_forever()
+        finally:
+            for client in list(self.clients):
+                client.writer.close()
+            for server in self._servers:
+                server.close()
+            if self._udp_transport:
+                self._udp_transport.close()
+            self.loop.run_until_complete(asyncio.sleep(0))
+            self.loop.close()
+
+    async def _open(self):
+        ports = self.requested_ports
+        if ports["tcp"] is not None:
+            server = await asyncio.start_server(self._handle_tcp, self.host, ports["tcp"],
+                                                backlog=LISTEN_BACKLOG)
+            self._servers.append(server)
+            self.ports["tcp"] = server.sockets[0].getsockname()[1]
+        if ports["ws"] is not None:
+            server = await asyncio.start_server(self._handle_ws, self.host, ports["ws"],
+                                                backlog=LISTEN_BACKLOG)
+            self._servers.append(server)
+            self.ports["ws"] = server.sockets[0].getsockname()[1]
+        if ports["udp"] is not None:
+            transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: _UdpProtocol(self), local_addr=(self.host, ports["udp"]))
+            self._udp_transport = transport
+            self.ports["udp"] = transport.get_extra_info("sockname")[1]
+
+    # ───────────── Publishing ─────────────
+    def publish(self, line, vehicle_id=""):
+        """Queue a line for every client. Thread-safe and never blocks on a client.
+
+        No system call here: waking the loop from the reader thread would
+        give up the GIL and wait to get it back. The loop collects the
+        pending lines every ``DISPATCH_INTERVAL`` instead.
+        """
+        if self.loop is None:
+            return
+        frame = _Frame(time.time(), vehicle_id, line)
+        with self._pending_lock:
+            self._pending.append(frame)
+
+    def _dispatch(self):
+        self.loop.call_later(DISPATCH_INTERVAL, self._dispatch)
+        with self._pending_lock:
+            frames, self._pending = self._pending, []
+        if not frames:
+            return
+        self.published += len(frames)
+
+        for client in list(self.clients):
+            for frame in frames:
+                if client.wants(frame):
+                    client.push(frame)
+
+        if self.udp_clients:
+            if not self._udp_pending:
+                self.loop.call_later(UDP_BATCH_INTERVAL, self._send_udp)
+            self._udp_pending.extend(frames)
+
+    def _send_udp(self):
+        frames, self._udp_pending = self._udp_pending, []
+        transport = self._udp_transport
+        for addr, (subscriber, _) in list(self.udp_clients.items()):
+            if transport.get_write_buffer_size() > UDP_BUFFER_LIMIT:
+                subscriber.dropped += sum(1 for f in frames if subscriber.wants(f))
+                continue
+            datagram = b""
+            for frame in frames:
+                if not subscriber.wants(frame):
+                    continue
+                data = frame.encoded(subscriber.format)
+                if datagram and len(datagram) + len(data) > UDP_MAX_DATAGRAM:
+                    transport.sendto(datagram, addr)
+                    datagram = b""
+                datagram += data
+                subscriber.sent += 1
+            if datagram:
+                transport.sendto(datagram, addr)
+
+    # ───────────── Clients ─────────────
+    async def _serve_stream(self, client, reader, read_command):
+        self.clients.add(client)
+        print(f"[TelemetryServer] Client connected: {client.peer}")
+        writer_task = asyncio.ensure_future(client.write_loop())
+        try:
+            while not client.closed:
+                command = await read_command(reader)
+                if command is None:
+                    break
+                client.handle_command(command)
+        except (asyncio.IncompleteReadError, ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            client.closed = True
+            client.ready.set()
+            self.clients.discard(client)
+            self.dropped_closed += client.dropped
+            writer_task.cancel()
+            client.writer.close()
+            print(f"[TelemetryServer] Client disconnected: {client.peer} "
+                  f"(sent {client.sent}, dropped {client.dropped})")
+
+    async def _handle_tcp(self, reader, writer):
+        async def read_command(reader):
+            line = await reader.readline()
+            return line.decode(errors="ignore") if line else None
+
+        _limit_buffers(writer)
+        client = _StreamClient(writer, self.queue_size)
+        await self._serve_stream(client, reader, read_command)
+
+    async def _handle_ws(self, reader, writer):
+        try:
+            if not await _ws_handshake(reader, writer):
+                writer.close()
+                return
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        async def read_command(reader):
+            while True:
+                opcode, payload = await _ws_read_message(reader)
+                if opcode == 0x8:  # close
+                    return None
+                if opcode == 0x9:  # ping
+                    writer.write(_ws_frame(payload, opcode=0xA))
+                elif opcode == 0x1:
+                    return payload.decode(errors="ignore")
+
+        _limit_buffers(writer)
+        client = _StreamClient(writer, self.queue_size, fmt="json", websocket=True)
+        await self._serve_stream(client, reader, read_command)
+
+    def _udp_datagram(self, data, addr):
+        text = data.decode(errors="ignore").strip()
+        if text.upper().startswith("UNSUBSCRIBE"):
+            self.udp_clients.pop(addr, None)
+            return
+        entry = self.udp_clients.get(addr)
+        if entry is None:
+            entry = self.udp_clients[addr] = [_Subscriber(), 0.0]
+            print(f"[TelemetryServer] UDP subscriber: {addr}")
+        entry[1] = time.monotonic()
+        for command in text.splitlines():
+            entry[0].handle_command(command)
+
+    def _expire_udp(self):
+        cutoff = time.monotonic() - UDP_TIMEOUT
+        for addr, (_, last_seen) in list(self.udp_clients.items()):
+            if last_seen < cutoff:
+                del self.udp_clients[addr]
+                print(f"[TelemetryServer] UDP subscriber timed out: {addr}")
+        self.loop.call_later(UDP_TIMEOUT / 3, self._expire_udp)
+
+    def stats(self):
+        """Client counts and line totals (read from any thread; approximate while running)."""
+        clients = list(self.clients)
+        udp_clients = [entry[0] for entry in list(self.udp_clients.values())]
+        return {
+            "published": self.published,
+            "stream_clients": len(clients),
+            "udp_clients": len(udp_clients),
+            "sent": sum(c.sent for c in clients + udp_clients),
+            "dropped": self.dropped_closed + sum(c.dropped for c in clients + udp_clients),
+        }
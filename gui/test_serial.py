@@ -1,8 +1,9 @@
+import sys
 import serial
 import time
 
-port = "COM12"
-baudrate = 115200
+port = sys.argv[1] if len(sys.argv) > 1 else "COM12"
+baudrate = int(sys.argv[2]) if len(sys.argv) > 2 else 115200
 
 try:
     ser = serial.Serial(port, baudrate, timeout=0.5)
@@ -0,0 +1,345 @@
+"""Where SerialReader gets its bytes from, chosen by a connection string.
+
+    COM12, /dev/ttyACM0                      serial port (baud rate from the reader)
+    serial:///dev/ttyACM0?baud=921600        serial port with its own baud rate
+    udp://:14550                             listen for datagrams (radio bridge, SITL)
+    tcp://192.168.4.1:5760                   connect to a TCP server (SITL, another GCS)
+    file://flight.log?rate=100&loop=1        replay a recorded log (lines/s, 0 = no pacing)
+
+Every transport has the same non-blocking interface: ``read(timeout)``
+waits at most ``timeout`` seconds for data and returns whatever bytes are
+available (``b""`` if none), so the reader thread sleeps in select or the
+serial driver instead of spinning. Splitting into lines is left to the
+reader, identical for every transport.
+"""
+import os
+import select
+import socket
+import time
+from urllib.parse import parse_qsl
+
+
+class TransportError(Exception):
+    """The link failed or was closed by the other side."""
+
+
+class EndOfStream(TransportError):
+    """A finite source (replayed file) has no more data."""
+
+
+class Transport:
+    """Base class: ``open()``, ``read(timeout)``, ``write(data)``, ``close()``."""
+    scheme = None
+    starts_on_line_boundary = False  # True when the first bytes read are never mid-line
+
+    def __init__(self, target, options):
+        self.target = target
+        self.options = options
+
+    @property
+    def description(self):
+        return f"{self.scheme}://{self.target}"
+
+    @property
+    def is_open(self):
+        raise NotImplementedError
+
+    def open(self):
+        raise NotImplementedError
+
+    def read(self, timeout):
+        raise NotImplementedError
+
+    def write(self, data):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+# ───────────── Serial ─────────────
+HIGH_BAUD = 460800       # from here on reads are batched into chunks
+CHUNK_PERIOD = 0.005     # seconds of line time gathered per read at high baud
+RX_BUFFER_PERIOD = 0.25  # seconds of line time the OS receive buffer holds (where settable)
+
+
+class SerialTransport(Transport):
+    """Serial port, 8N1. At ``HIGH_BAUD`` and above a read waits up to
+    ``CHUNK_PERIOD`` for a chunk sized to the baud rate to build up, so a
+    fast link costs a few hundred wake-ups per second instead of one per
+    USB packet."""
+    scheme = "serial"
+
+    def __init__(self, target, options, baudrate=115200):
+        super().__init__(target, options)
+        self.baudrate = int(options.get("baud", baudrate))
+        self.bytes_per_second = self.baudrate / 10  # start + 8 data + stop bits
+        self.chunk_size = int(min(65536, max(64, self.bytes_per_second * CHUNK_PERIOD)))
+        self.rx_buffer_size = int(max(4096, self.bytes_per_second * RX_BUFFER_PERIOD))
+        self.ser = None
+
+    @property
+    def description(self):
+        return f"{self.target} at {self.baudrate} baud"
+
+    @property
+    def is_open(self):
+        return self.ser is not None and self.ser.is_open
+
+    def open(self):
+        import serial
+        try:
+            # The read timeout is where the reader thread waits for data (select inside pyserial)
+            self.ser = serial.Serial(self.target, self.baudrate, timeout=0.05)
+            if hasattr(self.ser, "set_buffer_size"):  # Windows only; Linux/macOS buffers are fixed
+                self.ser.set_buffer_size(rx_size=self.rx_buffer_size, tx_size=4096)
+        except (serial.SerialException, ValueError) as e:
+            raise TransportError(str(e)) from e
+
+    def read(self, timeout):
+        import serial
+        if self.ser.timeout != timeout:
+            self.ser.timeout = timeout
+        try:
+            data = self.ser.read(self.ser.in_waiting or 1)
+            if not data:
+                return data
+            waiting = self.ser.in_waiting
+            if self.baudrate >= HIGH_BAUD and waiting + len(data) < self.chunk_size:
+                time.sleep(CHUNK_PERIOD)
+                waiting = self.ser.in_waiting
+            if waiting:
+                data += self.ser.read(waiting)
+            return data
+        except (serial.SerialException, OSError) as e:
+            raise TransportError(str(e)) from e
+
+    def write(self, data):
+        import serial
+        try:
+            self.ser.write(data)
+        except (serial.SerialException, OSError) as e:
+            raise TransportError(str(e)) from e
+
+    def close(self):
+        if self.ser and self.ser.is_open:
+            self.ser.close()
+
+
+# ───────────── Network ─────────────
+class _SocketTransport(Transport):
+    """Non-blocking socket read through select()."""
+
+    def __init__(self, target, options):
+        super().__init__(target, options)
+        host, _, port = target.rpartition(":")
+        if not port.isdigit():
+            raise ValueError(f"{self.scheme} connection string needs a port: {target!r}")
+        self.host = host.strip("[]")
+        self.port = int(port)
+        self.sock = None
+
+    @property
+    def is_open(self):
+        return self.sock is not None
+
+    def _wait_readable(self, timeout):
+        try:
+            readable, _, _ = select.select([self.sock], [], [], timeout)
+        except (OSError, ValueError) as e:
+            raise TransportError(str(e)) from e
+        return bool(readable)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class UdpTransport(_SocketTransport):
+    """Listens on a local port; commands written go back to the last sender."""
+    scheme = "udp"
+    starts_on_line_boundary = True
+
+    def __init__(self, target, options):
+        super().__init__(target, options)
+        self.peer = None
+
+    def open(self):
+        try:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.sock.bind((self.host or "0.0.0.0", self.port))
+            self.sock.setblocking(False)
+        except OSError as e:
+            self.close()
+            raise TransportError(str(e)) from e
+
+    def read(self, timeout):
+        if not self._wait_readable(timeout):
+            return b""
+        chunks = []
+        while True:
+            try:
+                datagram, self.peer = self.sock.recvfrom(65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                raise TransportError(str(e)) from e
+            # Senders often put one line per datagram without the newline
+            chunks.append(datagram if datagram.endswith(b"\n") else datagram + b"\n")
+        return b"".join(chunks)
+
+    def write(self, data):
+        if self.peer is None:
+            raise TransportError("no UDP peer has sent anything yet")
+        try:
+            self.sock.sendto(data, self.peer)
+        except OSError as e:
+            raise TransportError(str(e)) from e
+
+
+class TcpTransport(_SocketTransport):
+    """Client connection to a TCP server."""
+    scheme = "tcp"
+    CONNECT_TIMEOUT = 5.0
+
+    def open(self):
+        try:
+            self.sock = socket.create_connection((self.host or "127.0.0.1", self.port),
+                                                 timeout=self.CONNECT_TIMEOUT)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.sock.setblocking(False)
+        except OSError as e:
+            self.close()
+            raise TransportError(str(e)) from e
+
+    def read(self, timeout):
+        if not self._wait_readable(timeout):
+            return b""
+        try:
+            data = self.sock.recv(65536)
+        except BlockingIOError:
+            return b""
+        except OSError as e:
+            raise TransportError(str(e)) from e
+        if not data:
+            raise TransportError("connection closed by server")
+        return data
+
+    def write(self, data, timeout=1.0):
+        view = memoryview(data)
+        deadline = time.monotonic() + timeout
+        while view:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TransportError("write timed out")
+            try:
+                _, writable, _ = select.select([], [self.sock], [], remaining)
+                if writable:
+                    view = view[self.sock.send(view):]
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                raise TransportError(str(e)) from e
+
+
+# ───────────── Replay ─────────────
+class FileReplayTransport(Transport):
+    """Plays back a recorded log, ``rate`` lines per second (0 = as fast as read)."""
+    scheme = "file"
+    starts_on_line_boundary = True
+
+    def __init__(self, target, options):
+        super().__init__(target, options)
+        self.rate = float(options.get("rate", 100))
+        self.loop = options.get("loop", "0").lower() in ("1", "true", "yes")
+        self.file = None
+        self.next_time = 0.0
+
+    @property
+    def is_open(self):
+        return self.file is not None
+
+    def open(self):
+        try:
+            self.file = open(self.target, "rb")
+        except OSError as e:
+            raise TransportError(str(e)) from e
+        self.next_time = time.perf_counter()
+
+    def read(self, timeout):
+        if self.rate <= 0:
+            return self._read_lines(1024)
+
+        # Lines due by now, or wait (at most ``timeout``) for the next one
+        now = time.perf_counter()
+        if self.next_time > now:
+            time.sleep(min(timeout, self.next_time - now))
+            now = time.perf_counter()
+            if self.next_time > now:
+                return b""
+        if now - self.next_time > 1.0:
+            self.next_time = now  # fell far behind - do not burst to catch up
+        interval = 1.0 / self.rate
+        due = int((now - self.next_time) / interval) + 1
+        self.next_time += due * interval
+        return self._read_lines(due)
+
+    def _read_lines(self, count):
+        lines = []
+        while len(lines) < count:
+            line = self.file.readline()
+            if not line:
+                if not self.loop:
+                    if lines:
+                        break
+                    raise EndOfStream(f"end of {self.target}")
+                self.file.seek(0)
+                if not self.file.readline():
+                    raise EndOfStream(f"{self.target} is empty")
+                self.file.seek(0)
+                continue
+            lines.append(line if line.endswith(b"\n") else line + b"\n")
+        return b"".join(lines)
+
+    def write(self, data):
+        pass  # nothing listens to a recording
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+# ───────────── Connection Strings ─────────────
+TRANSPORTS = {
+    "serial": SerialTransport,
+    "udp": UdpTransport,
+    "tcp": TcpTransport,
+    "file": FileReplayTransport,
+}
+
+
+def parse_connection_string(text):
+    """Split a connection string into ``(scheme, target, options)``.
+
+    Anything without ``scheme://`` is a serial device name.
+    """
+    if "://" not in text:
+        return "serial", text, {}
+    scheme, rest = text.split("://", 1)
+    target, _, query = rest.partition("?")
+    return scheme.lower(), target, dict(parse_qsl(query))
+
+
+def open_transport(text, baudrate=115200):
+    """Transport (not yet opened) for a connection string. Raises ValueError if unknown."""
+    scheme, target, options = parse_connection_string(text)
+    if scheme not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {scheme!r} in {text!r} (use {', '.join(TRANSPORTS)})")
+    if scheme == "serial":
+        return SerialTransport(target, options, baudrate)
+    if scheme == "file":
+        target = os.path.expanduser(target)
+    return TRANSPORTS[scheme](target, options)
@@ -0,0 +1,335 @@
+"""Several telemetry links (vehicles) open at once.
+
+``LinkManager`` owns one ``SerialReader`` and reader thread per link and
+tags every line with the vehicle it came from. ``ActiveVehicleStream``
+looks like a single ``SerialReader`` to the tabs (it has a
+``data_received(str)`` signal) and forwards the lines of the selected
+vehicle - or of all vehicles when aggregating. Views that can show only
+one vehicle (3D attitude, GPS track) use its ``focus`` instead, which
+stays on one vehicle while aggregating. Each link also has a
+``CommandLink`` uplink; ``ActiveVehicleStream.send_command`` sends to the
+selected vehicle only. The link's ``ParameterManager`` downloads the
+parameters whenever the link (re)connects - one round trip when its
+cache is current.
+"""
+from PyQt5.QtCore import QObject, QThread, Qt, pyqtSignal, pyqtSlot
+from acquisition import ProcessReader
+from command_link import CommandLink, NORMAL
+from link_stats import LinkStats, combine
+from parameters import ParameterManager
+from serial_reader import SerialReader, CONNECTED, DISCONNECTED
+from telemetry import message_kind, handing_out
+from telemetry_bus import TelemetryBus
+
+ALL_VEHICLES = "*"  # pseudo vehicle id: pass every vehicle's lines through
+
+
+class VehicleLink(QObject):
+    """One link: its reader and thread, command uplink, plus the newest line of each message kind."""
+    line_received = pyqtSignal(str, str)  # vehicle id, line
+    state_changed = pyqtSignal(str, str, str)  # vehicle id, connection state, detail
+    command_status = pyqtSignal(str, int, str, str, str)  # vehicle id, seq, command, status, detail
+    parameter_changed = pyqtSignal(str, str, float)  # vehicle id, parameter, value
+
+    def __init__(self, vehicle_id, port=None, baudrate=115200, name=None, separate_process=False,
+                 ring=None, parent=None):
+        super().__init__(parent)
+        self.vehicle_id = vehicle_id
+        self.name = name or vehicle_id
+        self.lines = 0
+        self.latest = {}  # message kind -> newest line, used to catch up on vehicle switch
+        self.state = DISCONNECTED
+        self.state_detail = ""
+
+        # Same threading as the single-reader setup: the reader lives in its own QThread.
+        # With separate_process its read loop runs in a child process (acquisition.py),
+        # quiet: printing every line there would cost the time the process is meant to save
+        if separate_process:
+            self.reader = ProcessReader(port, baudrate, quiet=True, ring=ring, vehicle_id=vehicle_id)
+        else:
+            self.reader = SerialReader(port, baudrate)
+        if ring is not None and not separate_process:
+            # Decoded in the reader thread; readers of the ring never hold it up.
+            # (The acquisition process publishes its records itself.)
+            ring.vehicle_index(vehicle_id)  # in the order the links were opened
+            self.reader.data_received.connect(lambda line: ring.publish(line, vehicle_id), Qt.DirectConnection)
+        self.port = self.reader.port
+        self.thread = QThread()
+        self.reader.moveToThread(self.thread)
+        self.thread.started.connect(self.reader.start_reading)
+        if separate_process:
+            self.reader.records_received.connect(self.on_records)  # one queued call per frame
+        else:
+            self.reader.data_received.connect(self.on_line)  # queued onto the GUI thread
+        self.reader.connection_state_changed.connect(self.on_state)
+
+        # Commands are written by their own thread; results are queued onto the GUI thread
+        self.commands = CommandLink(self.reader)
+        self.commands.command_status.connect(self.on_command_status)
+        self.parameters = ParameterManager(self.commands)
+        self.parameters.parameter_changed.connect(self.on_parameter_changed)
+
+    def start(self):
+        self.thread.start()
+        self.commands.start()
+
+    def stop(self):
+        self.commands.stop()
+        self.reader.stop()
+        self.thread.quit()
+        self.thread.wait()
+
+    @pyqtSlot(str)
+    def on_line(self, line):
+        self.lines += 1
+        self.latest[message_kind(line)] = line
+        self.line_received.emit(self.vehicle_id, line)
+
+    @pyqtSlot(list)
+    def on_records(self, records):
+        """A frame of the acquisition process: lines with the decoding done there."""
+        for line, kind, fields in records:
+            handing_out(line, kind, fields)
+            self.on_line(line)
+        handing_out(None)
+
+    @pyqtSlot(str, str)
+    def on_state(self, state, detail):
+        if state == CONNECTED and self.state != CONNECTED:
+            self.parameters.download()
+        self.state, self.state_detail = state, detail
+        if self.reader.port:
+            self.port = self.reader.port  # the port auto-detect found
+        self.state_changed.emit(self.vehicle_id, state, detail)
+
+    @pyqtSlot(int, str, str, str)
+    def on_command_status(self, seq, name, status, detail):
+        self.command_status.emit(self.vehicle_id, seq, name, status, detail)
+
+    @pyqtSlot(str, float)
+    def on_parameter_changed(self, name, value):
+        self.parameter_changed.emit(self.vehicle_id, name, value)
+
+
+class LinkManager(QObject):
+    """Opens, tracks and closes the links of every connected vehicle."""
+    link_added = pyqtSignal(str)
+    link_removed = pyqtSignal(str)
+    vehicle_data = pyqtSignal(str, str)  # vehicle id, line
+    link_state_changed = pyqtSignal(str, str, str)  # vehicle id, connection state, detail
+    command_status = pyqtSignal(str, int, str, str, str)  # vehicle id, seq, command, status, detail
+    parameter_changed = pyqtSignal(str, str, float)  # vehicle id, parameter, value
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.links = {}
+        self._next_index = 1
+        self.telemetry_ring = None  # TelemetryRing every link publishes to (telemetry_ring.py)
+
+    def add_link(self, port=None, baudrate=115200, name=None, separate_process=False):
+        """Open a link and start its reader.
+
+        ``port`` is a connection string (see transports.py); None auto-detects a single board.
+        ``separate_process`` reads it in a child process (acquisition.py).
+        """
+        vehicle_id = f"vehicle{self._next_index}"
+        self._next_index += 1
+        link = VehicleLink(vehicle_id, port, baudrate, name or f"Vehicle {len(self.links) + 1}",
+                           separate_process, self.telemetry_ring, self)
+        link.line_received.connect(self.vehicle_data)
+        link.state_changed.connect(self.link_state_changed)
+        link.command_status.connect(self.command_status)
+        link.parameter_changed.connect(self.parameter_changed)
+        self.links[vehicle_id] = link
+        link.start()
+        print(f"[LinkManager] {link.name} on {link.port or 'auto-detected port'}")
+        self.link_added.emit(vehicle_id)
+        return link
+
+    def remove_link(self, vehicle_id):
+        link = self.links.pop(vehicle_id, None)
+        if link is None:
+            return
+        link.stop()
+        self.link_removed.emit(vehicle_id)
+
+    def stop_all(self):
+        for vehicle_id in list(self.links):
+            self.remove_link(vehicle_id)
+
+    def link(self, vehicle_id):
+        return self.links.get(vehicle_id)
+
+
+class VehicleFocus(QObject):
+    """The lines of one vehicle, for views that cannot mix vehicles (3D attitude, GPS track).
+
+    Follows the selected vehicle; when aggregating, stays on the vehicle
+    selected last. ``direct_data_received`` carries the same lines in the
+    link's reader thread, where TelemetryBus runs direct subscriptions.
+    """
+    data_received = pyqtSignal(str)
+    direct_data_received = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.vehicle_id = None
+        self.bus = TelemetryBus(self, self)
+
+
+class ActiveVehicleStream(QObject):
+    """Stand-in for a SerialReader that follows the vehicle selected in the GUI.
+
+    Tabs connect to ``data_received`` exactly as they did to the single
+    reader, and may emit derived lines into it (the Flight Data tab sends
+    its PPM lines to the Radio tab this way). ``vehicle_data_received``
+    carries every line tagged with its vehicle for views that show all
+    vehicles at once. ``bus`` hands the lines out per message kind, at the
+    rate each subscriber asked for (telemetry_bus.py); ``focus`` has the
+    lines of a single vehicle even when aggregating.
+    """
+    data_received = pyqtSignal(str)
+    vehicle_data_received = pyqtSignal(str, str)
+    active_vehicle_changed = pyqtSignal(object)  # vehicle id, ALL_VEHICLES or None
+    connection_state_changed = pyqtSignal(str, str)  # of the active vehicle (best link when aggregating)
+    command_status = pyqtSignal(int, str, str, str)  # seq, command, status, detail - active vehicle only
+    parameter_changed = pyqtSignal(str, float)  # parameter, value - active vehicle only
+
+    def __init__(self, link_manager, parent=None):
+        super().__init__(parent)
+        self.link_manager = link_manager
+        self.active_vehicle = None
+        self.aggregate = False
+        self.state = DISCONNECTED
+        self.state_detail = ""
+        self.aggregate_stats = LinkStats()  # parse errors that cannot be pinned on one vehicle
+        self.bus = TelemetryBus(self, self)
+        self.focus = VehicleFocus(self)
+        link_manager.vehicle_data.connect(self.on_vehicle_data)
+        link_manager.link_added.connect(self.on_link_added)
+        link_manager.link_removed.connect(self.on_link_removed)
+        link_manager.link_state_changed.connect(self.on_link_state_changed)
+        link_manager.command_status.connect(self.on_command_status)
+        link_manager.parameter_changed.connect(self.on_parameter_changed)
+
+    def set_active_vehicle(self, vehicle_id):
+        """Follow one vehicle, or ``ALL_VEHICLES`` to pass every vehicle's lines through."""
+        if vehicle_id == self.active_vehicle:
+            return
+        self.aggregate = vehicle_id == ALL_VEHICLES
+        self.active_vehicle = vehicle_id
+        if not self.aggregate:
+            self.set_focus(vehicle_id)
+        elif self.focus.vehicle_id is None:
+            self.set_focus(next(iter(self.link_manager.links), None))
+        self.active_vehicle_changed.emit(vehicle_id)
+
+        # Bring the tabs up to date with the newly selected vehicle straight away
+        self.emit_connection_state()
+        link = self.link_manager.link(vehicle_id)
+        if link:
+            for line in list(link.latest.values()):
+                self.data_received.emit(line)
+            for name, value in list(link.parameters.values.items()):
+                self.parameter_changed.emit(name, value)
+
+    def set_focus(self, vehicle_id):
+        if vehicle_id == self.focus.vehicle_id:
+            return
+        self.focus.vehicle_id = vehicle_id
+        link = self.link_manager.link(vehicle_id)
+        if link:
+            # Catch-up lines come from the GUI thread, direct subscribers included
+            for line in list(link.latest.values()):
+                self.focus.direct_data_received.emit(line)
+                self.focus.data_received.emit(line)
+
+    @property
+    def parameters(self):
+        """ParameterManager of the selected vehicle (None when aggregating or with no vehicle)."""
+        link = None if self.aggregate else self.link_manager.link(self.active_vehicle)
+        return link.parameters if link else None
+
+    def emit_connection_state(self):
+        links = list(self.link_manager.links.values())
+        if not self.aggregate:
+            link = self.link_manager.link(self.active_vehicle)
+            links = [link] if link else []
+        if links:
+            link = next((l for l in links if l.state == CONNECTED), links[0])
+            self.state, self.state_detail = link.state, link.state_detail
+        else:
+            self.state, self.state_detail = DISCONNECTED, ""
+        self.connection_state_changed.emit(self.state, self.state_detail)
+
+    def on_link_state_changed(self, vehicle_id, state, detail):
+        if self.aggregate or vehicle_id == self.active_vehicle:
+            self.emit_connection_state()
+
+    def send_command(self, name, args="", priority=NORMAL, coalesce=None, ack=True):
+        """Queue a command for the selected vehicle (see CommandLink.send).
+
+        Never broadcast: returns None, sending nothing, when aggregating or with no vehicle.
+        """
+        link = None if self.aggregate else self.link_manager.link(self.active_vehicle)
+        if link is None:
+            print(f"[ActiveVehicleStream] {name} not sent: select a single vehicle")
+            return None
+        return link.commands.send(name, args, priority, coalesce, ack)
+
+    def link_stats_snapshot(self):
+        """Link-quality counters of the selected vehicle (summed over all when aggregating)."""
+        if self.aggregate:
+            snapshots = [link.reader.link_stats_snapshot() for link in self.link_manager.links.values()]
+            snapshot = combine(snapshots + [self.aggregate_stats.snapshot()])
+        else:
+            link = self.link_manager.link(self.active_vehicle)
+            if link is None:
+                return None
+            snapshot = link.reader.link_stats_snapshot()
+        snapshot["source"] = self.active_vehicle  # rates are only meaningful between samples of one source
+        return snapshot
+
+    def report_parse_error(self, source):
+        """A tab could not use a line: counted against the selected vehicle."""
+        link = None if self.aggregate else self.link_manager.link(self.active_vehicle)
+        if link:
+            link.reader.report_parse_error(source)
+        else:
+            self.aggregate_stats.record_parse_error(source)
+
+    def on_command_status(self, vehicle_id, seq, name, status, detail):
+        if vehicle_id == self.active_vehicle:
+            self.command_status.emit(seq, name, status, detail)
+
+    def on_parameter_changed(self, vehicle_id, name, value):
+        if vehicle_id == self.active_vehicle:
+            self.parameter_changed.emit(name, value)
+
+    def on_vehicle_data(self, vehicle_id, line):
+        self.vehicle_data_received.emit(vehicle_id, line)
+        if self.aggregate or vehicle_id == self.active_vehicle:
+            self.data_received.emit(line)
+        if vehicle_id == self.focus.vehicle_id:
+            self.focus.data_received.emit(line)
+
+    def on_reader_line(self, vehicle_id, line):
+        """Reader thread of ``vehicle_id``: hand the focused vehicle's lines to direct subscribers."""
+        if vehicle_id == self.focus.vehicle_id:
+            self.focus.direct_data_received.emit(line)
+
+    def on_link_added(self, vehicle_id):
+        link = self.link_manager.link(vehicle_id)
+        link.reader.data_received.connect(
+            lambda line, vehicle_id=vehicle_id: self.on_reader_line(vehicle_id, line), Qt.DirectConnection)
+        if self.active_vehicle is None:
+            self.set_active_vehicle(vehicle_id)
+        elif self.focus.vehicle_id is None:
+            self.set_focus(vehicle_id)  # aggregating with no vehicle before
+
+    def on_link_removed(self, vehicle_id):
+        remaining = list(self.link_manager.links)
+        if vehicle_id == self.active_vehicle:
+            self.set_active_vehicle(remaining[0] if remaining else None)
+        if vehicle_id == self.focus.vehicle_id:
+            self.set_focus(remaining[0] if remaining else None)